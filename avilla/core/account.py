@@ -7,6 +7,7 @@ from statv import Stats, Statv
 
 from avilla.core.ryanvk.staff import Staff
 from avilla.core.selector import Selector
+from avilla.core.utilles.singleflight import SingleFlight
 
 if TYPE_CHECKING:
     from avilla.core.application import Avilla
@@ -30,13 +31,21 @@ class BaseAccount:
     route: Selector
     avilla: Avilla
 
+    _staff: Staff | None = field(default=None, init=False, repr=False, compare=False)
+    pull_flight: SingleFlight[tuple[Any, Selector]] = field(
+        default_factory=SingleFlight, init=False, repr=False, compare=False
+    )
+
     @property
     def info(self) -> AccountInfo:
         return self.avilla.accounts[self.route]
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     @property
     def available(self) -> bool:
@@ -9,24 +9,28 @@ from graia.amnesia.builtins.memcache import MemcacheService
 from graia.broadcast import Broadcast
 from launart import Launart
 from launart.service import Service
-from loguru import logger
 
 from avilla.core._runtime import get_current_avilla
 from avilla.core.account import AccountInfo, BaseAccount
+from avilla.core.capture import EventCapture
 from avilla.core.dispatchers import AvillaBuiltinDispatcher
 from avilla.core.event import MetadataModified
+from avilla.core.metrics import FnCallMetrics, MetricsRegistry
+from avilla.core.pipeline import EventPipeline
 from avilla.core.protocol import BaseProtocol
+from avilla.core.recorder import EventRecorder
 from avilla.core.ryanvk.staff import Staff
-from avilla.core.selector import Selector
+from avilla.core.selector import FollowsPattern, Selector
 from avilla.core.service import AvillaService
+from avilla.core.tracing import Tracer
 from avilla.core.utilles import identity
-from avilla.standard.core.activity import ActivityEvent
-from avilla.standard.core.request import RequestEvent
+from avilla.core.watchdog import LoopWatchdog
 
 if TYPE_CHECKING:
     from graia.broadcast import Decorator, Dispatchable, Namespace, T_Dispatcher
 
     from avilla.core.event import AvillaEvent
+    from avilla.core.utilles.message_store import MessageStore
     from avilla.standard.core.application import AvillaLifecycleEvent
 
     from .resource import Resource
@@ -43,6 +47,13 @@ class Avilla:
     accounts: dict[Selector, AccountInfo]
     service: AvillaService
     global_artifacts: dict[Any, Any]
+    event_pipeline: EventPipeline
+    event_recorder: EventRecorder
+    event_capture: EventCapture | None
+    metrics: MetricsRegistry
+    call_metrics: FnCallMetrics | None
+    tracer: Tracer
+    watchdog: LoopWatchdog
 
     def __init__(
         self,
@@ -50,6 +61,18 @@ class Avilla:
         broadcast: Broadcast | None = None,
         launch_manager: Launart | None = None,
         message_cache_size: int = 300,
+        message_cache_bytes: int = 64 * 1024 * 1024,
+        message_store: MessageStore | None = None,
+        metadata_cache_size: int = 0,
+        metadata_cache_ttl: float = 300,
+        metadata_cache_ttls: dict[Any, float] | None = None,
+        event_pipeline: EventPipeline | None = None,
+        event_recorder: EventRecorder | None = None,
+        event_capture: EventCapture | None = None,
+        metrics: MetricsRegistry | None = None,
+        instrument_calls: bool = False,
+        tracer: Tracer | None = None,
+        watchdog: LoopWatchdog | None = None,
         record_send: bool = True,
     ):
         self.broadcast = broadcast or it(Broadcast)
@@ -58,12 +81,30 @@ class Avilla:
         self._protocol_map = {}
         self.accounts = {}
 
-        self.service = AvillaService(self, message_cache_size)
+        self.service = AvillaService(
+            self,
+            message_cache_size,
+            metadata_cache_size,
+            metadata_cache_ttl,
+            metadata_cache_ttls,
+            message_cache_bytes,
+            message_store,
+        )
         self.global_artifacts = {}
+        self.event_pipeline = event_pipeline or EventPipeline()
+        self.event_recorder = event_recorder or EventRecorder()
+        self.event_capture = event_capture
+        self.metrics = metrics or MetricsRegistry()
+        self.call_metrics = FnCallMetrics(self.metrics).install() if instrument_calls else None
+        self.tracer = tracer or Tracer()
+        self.watchdog = watchdog or LoopWatchdog()
+        self._staff = None
 
         self.launch_manager.add_component(MemcacheService())
         self.launch_manager.add_component(self.service)
         self.broadcast.finale_dispatchers.append(AvillaBuiltinDispatcher(self))
+        if tracer is not None:
+            tracer.install(self.broadcast)
 
         self.__init_isolate__()
 
@@ -77,6 +118,8 @@ class Avilla:
             async def message_cacher(context: Context, message: Message):
                 if context.account.info.enabled_message_cache:
                     self.service.message_cache[context.account.route].push(message)
+                    if self.service.message_store is not None:
+                        self.service.message_store.put(context.account.route, message)
 
             @self.broadcast.receiver(AccountUnregistered)
             async def clear_cache(event: AccountUnregistered):
@@ -86,6 +129,23 @@ class Avilla:
             message_cacher.__annotations__ = {"context": Context, "message": Message}
             clear_cache.__annotations__ = {"event": AccountUnregistered}
 
+        if self.service.enabled_cache_metadata:
+            from avilla.standard.core.account import AccountUnregistered
+
+            @self.broadcast.receiver(MetadataModified)
+            async def metadata_invalidator(event: MetadataModified):
+                cache = self.service.metadata_cache[event.context.account.route]
+                cache.invalidate(event.endpoint, event.route)
+                # 产生事件时一同收集的新值仍然有效.
+                cache.update(event.endpoint, event.context.cache["meta"].get(event.endpoint, {}))
+
+            @self.broadcast.receiver(AccountUnregistered)
+            async def clear_metadata_cache(event: AccountUnregistered):
+                self.service.metadata_cache.pop(event.account.route, None)
+
+            metadata_invalidator.__annotations__ = {"event": MetadataModified}
+            clear_metadata_cache.__annotations__ = {"event": AccountUnregistered}
+
         if record_send:
             from avilla.core.context import Context
             from avilla.core.message import Message
@@ -93,87 +153,14 @@ class Avilla:
 
             @self.broadcast.receiver(MessageSent)
             async def message_sender(context: Context, message: Message):
-                scene = f"{'.'.join(f'{k}({v})' for k, v in context.scene.items())}"
-                logger.info(
-                    f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                    f"{context.account.route['account']}]: "
-                    f"{scene} <- {str(message.content)!r}"
-                )
+                self.event_recorder.record_sent(context, message)
 
             message_sender.__annotations__ = {"context": Context, "message": Message}
 
-        self.custom_event_recorder: dict[type[AvillaEvent], Callable[[AvillaEvent], None]] = {}
+        self.custom_event_recorder: dict[type[AvillaEvent], Callable[[AvillaEvent], None]] = self.event_recorder.custom
 
     def event_record(self, event: AvillaEvent | AvillaLifecycleEvent):
-        from avilla.standard.core.account.event import AccountStatusChanged
-        from avilla.standard.core.application import AvillaLifecycleEvent
-        from avilla.standard.core.message import (
-            MessageEdited,
-            MessageReceived,
-            MessageSent,
-        )
-
-        if isinstance(event, AccountStatusChanged):
-            logger.debug(
-                f"[{event.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{event.account.route['account']}]: "
-                f"{event.__class__.__name__}"
-            )
-            return
-        if isinstance(event, AvillaLifecycleEvent):
-            logger.debug(event.__class__.__name__)
-            return
-        context = event.context
-        client = context.client.display
-        scene = context.scene.display
-        endpoint = context.endpoint.display
-
-        if isinstance(event, MessageSent):
-            return
-
-        if type(event) in self.custom_event_recorder:
-            self.custom_event_recorder[type(event)](event)
-
-        elif isinstance(event, RequestEvent):
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"Request {event.request.request_type or event.request.id}"
-                f"{f' with {event.request.message}' if event.request.message else ''} "
-                f"from {client} in {scene}"
-            )
-        elif isinstance(event, ActivityEvent):
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"Activity {event.id}: {event.activity}"
-                f"from {client} in {scene}"
-            )
-        elif isinstance(event, MetadataModified):
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"Metadata {event.route} Modified: {event.details}"
-                f"from {client} in {scene}"
-            )
-        elif isinstance(event, MessageReceived):
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"{scene} -> {str(event.message.content)!r}"
-            )
-        elif isinstance(event, MessageEdited):
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"{scene} => {str(event.past)!r} -> {str(event.current)!r}"
-            )
-        else:
-            logger.info(
-                f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
-                f"{context.account.route['account']}]: "
-                f"{event.__class__.__name__} from {client} to {endpoint} in {scene}"
-            )
+        self.event_recorder.record(event)
 
     @overload
     def add_event_recorder(self, event_type: type[TE]) -> Callable[[Callable[[TE], None]], Callable[[TE], None]]:
@@ -214,8 +201,15 @@ class Avilla:
     def current(cls):
         return get_current_avilla()
 
+    @property
+    def staff(self):
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
+
     async def fetch_resource(self, resource: Resource[T]) -> T:
-        return await Staff(self.get_staff_artifacts(), self.get_staff_components()).fetch_resource(resource)
+        return await self.staff.fetch_resource(resource)
 
     def get_account(self, target: Selector) -> AccountInfo:
         return self.accounts[target]
@@ -225,7 +219,7 @@ class Avilla:
         ...
 
     @overload
-    def get_accounts(self, *, pattern: str) -> list[AccountInfo]:
+    def get_accounts(self, *, pattern: str | FollowsPattern) -> list[AccountInfo]:
         ...
 
     @overload
@@ -240,14 +234,15 @@ class Avilla:
         self,
         *,
         land: str | None = None,
-        pattern: str | None = None,
+        pattern: str | FollowsPattern | None = None,
         protocol_type: type[BaseProtocol] | tuple[type[BaseProtocol], ...] | None = None,
         account_type: type[BaseAccount] | tuple[type[BaseAccount], ...] | None = None,
     ) -> list[AccountInfo]:
         if land:
             return [account for account in self.accounts.values() if account.platform.land.name == land]
         if pattern:
-            return [account for selector, account in self.accounts.items() if selector.follows(pattern)]
+            compiled = FollowsPattern.compile(pattern)
+            return [account for selector, account in self.accounts.items() if compiled.matches(selector)]
         if protocol_type:
             return [account for account in self.accounts.values() if isinstance(account.protocol, protocol_type)]
         if account_type:
@@ -37,6 +37,16 @@ class CoreCapability(Capability):
     async def pull(self, target: Selector, route: type[M] | MetadataRoute[Unpack[tuple[Any, ...]], M]) -> Any:
         ...
 
+    @Fn.complex({TargetOverload(): ["target"], MetadataOverload(): ["route"]})
+    async def pull_many(
+        self, target: Selector, route: type[M] | MetadataRoute[Unpack[tuple[Any, ...]], M], targets: list[Selector]
+    ) -> dict[Selector, Any]:
+        """批量拉取 targets 的 metadata, 可以只返回其中一部分.
+
+        targets 只在最后一段上有所不同, target 是其中任意一个, 仅用于选择实现.
+        """
+        ...
+
     @Fn.complex({TypeOverload(): ["resource"]})
     async def fetch(self, resource: Resource[T]) -> T:
         ...
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import gzip
+import time
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+from loguru import logger
+
+from avilla.core.codec import dumpb, loads
+
+
+class CapturedEvent(NamedTuple):
+    time: float
+    protocol: str
+    account: str | None
+    args: list[Any]
+
+
+class EventCapture:
+    """把协议收到的原始事件追加写入 gzip 压缩的 JSONL 文件, 供 `read_capture` 与回放使用.
+
+    每满 batch_size 条 (以及 flush/close 时) 写入一个独立的 gzip member, 因此进程中途退出也只会丢失未写入的部分.
+    """
+
+    path: Path
+
+    def __init__(self, path: str | Path, *, batch_size: int = 256, compresslevel: int = 1) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.compresslevel = compresslevel
+        self.written = 0
+        self._buffer: list[bytes] = []
+
+    def write(self, protocol: str, *args: Any, account: str | None = None):
+        try:
+            line = dumpb({"t": time.time(), "p": protocol, "s": account, "a": args})
+        except TypeError as e:
+            logger.debug(f"event of {protocol} is not captured: {e!r}")
+            return
+        self._buffer.append(line)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            f.write(gzip.compress(b"\n".join(batch) + b"\n", self.compresslevel))
+        self.written += len(batch)
+
+    def close(self):
+        self.flush()
+
+
+def read_capture(path: str | Path) -> Iterator[CapturedEvent]:
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                record = loads(line)
+                yield CapturedEvent(record["t"], record["p"], record.get("s"), record["a"])
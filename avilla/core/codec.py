@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, NamedTuple
+
+from loguru import logger
+
+JSON_ENV = "AVILLA_JSON"
+
+
+class JSONCodec(NamedTuple):
+    name: str
+    loads: Callable[[str | bytes | bytearray | memoryview], Any]
+    """接受 str 与 bytes; bytes 无需先解码为 str."""
+    dumps: Callable[[Any], str]
+    dumpb: Callable[[Any], bytes]
+
+
+def _stdlib() -> JSONCodec:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return JSONCodec(
+        "json",
+        json.loads,
+        encoder.encode,
+        lambda obj: encoder.encode(obj).encode("utf-8"),
+    )
+
+
+def _orjson() -> JSONCodec:
+    import orjson
+
+    def dumpb(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return JSONCodec("orjson", orjson.loads, lambda obj: dumpb(obj).decode("utf-8"), dumpb)
+
+
+def _msgspec() -> JSONCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return JSONCodec("msgspec", decoder.decode, lambda obj: encoder.encode(obj).decode("utf-8"), encoder.encode)
+
+
+BACKENDS: dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+
+def load_codec(name: str | None = None) -> JSONCodec:
+    """按名称加载 codec; 不指定时依次尝试 orjson, msgspec, 最后回退到标准库."""
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown json backend {name!r}, expected one of {', '.join(BACKENDS)}")
+        return BACKENDS[name]()
+    for factory in BACKENDS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    raise RuntimeError("unreachable: stdlib json is always available")
+
+
+codec = load_codec(os.environ.get(JSON_ENV) or None)
+
+
+def use_codec(name: str | JSONCodec):
+    """切换全局 codec; 各传输层通过 loads/dumps 间接调用, 因此切换对已建立的连接同样生效."""
+    global codec
+    codec = name if isinstance(name, JSONCodec) else load_codec(name)
+    logger.debug(f"using json codec {codec.name}")
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    return codec.loads(data)
+
+
+def loads_body(body: bytes) -> Any:
+    """解析 HTTP 响应体; 与 aiohttp 的 `ClientResponse.json` 相同, 空的响应体返回 None."""
+    return codec.loads(body) if body.strip() else None
+
+
+def dumps(obj: Any) -> str:
+    return codec.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    return codec.dumpb(obj)
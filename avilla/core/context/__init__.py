@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Any, TypedDict, TypeVar, cast, overload
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, TypedDict, TypeVar, cast, overload
 
 from typing_extensions import ParamSpec, Unpack
 
@@ -25,6 +25,9 @@ from ._roles import (
 )
 from ._selector import ContextSelector
 
+if TYPE_CHECKING:
+    from avilla.core.tracing import Trace
+
 P = ParamSpec("P")
 R = TypeVar("R", covariant=True)
 _T = TypeVar("_T")
@@ -45,6 +48,8 @@ class Context:
     mediums: list[ContextMedium]
 
     cache: ContextCache | dict[str, Any]
+    trace: Trace | None = None
+    """产生该 Context 的事件被抽样追踪时, 对应的 trace."""
 
     def __init__(
         self,
@@ -72,6 +77,9 @@ class Context:
         self.mediums = [ContextMedium(ContextSelector.from_selector(self, medium)) for medium in mediums or []]
 
         self.cache = {"meta": prelude_metadatas or {}}
+        if prelude_metadatas and (store := self.metadata_cache) is not None:
+            for target, metadatas in prelude_metadatas.items():
+                store.update(target, metadatas)
         self.staff = Staff(self.get_staff_artifacts(), self.get_staff_components())
 
     @property
@@ -94,9 +102,16 @@ class Context:
     def is_resource(self) -> bool:
         return any(isinstance(i, Resource) for i in self.cache["meta"].get(self.endpoint, {}).values())
 
+    @property
+    def metadata_cache(self):
+        return self.account.avilla.service.get_metadata_cache(self.account.route)
+
     def _collect_metadatas(self, target: Selector | Selectable, *metadatas: Metadata):
-        scope = self.cache["meta"].setdefault(target.to_selector(), {})
-        scope.update({type(i): i for i in metadatas})
+        target = target.to_selector()
+        collected = {type(i): i for i in metadatas}
+        self.cache["meta"].setdefault(target, {}).update(collected)
+        if (store := self.metadata_cache) is not None:
+            store.update(target, collected)
 
     @classproperty
     @classmethod
@@ -138,7 +153,61 @@ class Context:
             if not route.has_params():
                 return cast("_MetadataT", meta)
 
-        return await self.staff.pull_metadata(target, route)
+        store = None if route.has_params() else self.metadata_cache
+        if store is not None:
+            if flush:
+                store.invalidate(target, route)
+            elif (meta := store.get(target, route)) is not None:
+                return cast("_MetadataT", meta)
+
+        async def pull() -> _MetadataT:
+            result = await self.staff.pull_metadata(target, route)
+            if store is not None:
+                store.set(target, route, result)
+            return result
+
+        if route.has_params():
+            # 参数存放在 ContextVar 中, 不属于 route 的相等性, 不能与其他拉取合并.
+            return await pull()
+
+        # 同一账号对同一目标的相同 route 的并发拉取只会发出一次请求.
+        key = target if type(target) is Selector else Selector(target.pattern)
+        return await self.account.pull_flight.do((route, key), pull)
+
+    async def pull_many(
+        self,
+        route: type[_MetadataT] | MetadataRoute[Unpack[tuple[Any, ...]], _MetadataT],
+        targets: Iterable[Selector | Selectable],
+        *,
+        flush: bool = False,
+    ) -> dict[Selector, _MetadataT]:
+        selectors = [i.to_selector() if isinstance(i, Selectable) else i for i in targets]
+        store = None if route.has_params() else self.metadata_cache
+        results: dict[Selector, Any] = {}
+        pending: list[Selector] = []
+
+        for target in selectors:
+            if not flush and not route.has_params():
+                cached = self.cache["meta"].get(target)
+                if cached is not None and route in cached:
+                    results[target] = cached[route]
+                    continue
+            if store is not None:
+                if flush:
+                    store.invalidate(target, route)
+                elif (meta := store.get(target, route)) is not None:
+                    results[target] = meta
+                    continue
+            pending.append(target)
+
+        if pending:
+            pulled = await self.staff.pull_metadata_many(route, pending)
+            if store is not None:
+                for target, meta in pulled.items():
+                    store.set(target, route, meta)
+            results.update(pulled)
+
+        return {target: results[target] for target in selectors}
 
     @overload
     def __getitem__(self, closure: Selector) -> ContextSelector:
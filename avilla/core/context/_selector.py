@@ -34,6 +34,9 @@ class ContextSelector(Selector):
         data = {**self.pattern}
         return self.__class__(copy(self.context), deepcopy(data, memo))
 
+    def __reduce__(self):
+        raise TypeError(f"cannot pickle {self.__class__.__name__}, convert it to a plain Selector first")
+
     @classmethod
     def from_selector(cls, cx: Context, selector: Selector) -> Self:
         return cls(cx, selector.pattern)
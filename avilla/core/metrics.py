@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Union
+
+from graia.ryanvk import _runtime
+from graia.ryanvk._runtime import set_call_observer
+
+if TYPE_CHECKING:
+    from graia.ryanvk import BaseCollector, Fn, Staff
+
+Labels = tuple[str, ...]
+Sample = Union[float, dict[Labels, float]]
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    type: str = "untyped"
+
+    name: str
+    help: str
+    labelnames: Labels
+
+    def __init__(self, name: str, help: str = "", labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def snapshot(self) -> Any:
+        raise NotImplementedError
+
+    def export(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+
+class _Scalar(Metric):
+    def __init__(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Iterable[str] = (),
+        collect: Callable[[], Sample] | None = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels: Labels = ()) -> float:
+        return self.snapshot().get(labels, 0)
+
+    def snapshot(self) -> dict[Labels, float]:
+        if self.collect is None:
+            return dict(self._values)
+        value = self.collect()
+        if isinstance(value, dict):
+            return dict(value)
+        return {(): value}
+
+    def export(self):
+        for labels, value in self.snapshot().items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def reset(self):
+        self._values.clear()
+
+
+class Counter(_Scalar):
+    """只增不减的计数; 给出 collect 时, 每次 snapshot/export 改为读取其返回的当前值 (适合已有的统计对象)."""
+
+    type = "counter"
+
+
+class Gauge(_Scalar):
+    """可直接 set 的数值; 也可以给出 collect, 在每次 snapshot/export 时读取当前值."""
+
+    type = "gauge"
+
+    def set(self, value: float, labels: Labels = ()):
+        self._values[labels] = value
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """固定分桶的直方图; 分位数由桶内线性插值估算."""
+
+    type = "histogram"
+
+    buckets: tuple[float, ...]
+
+    def __init__(
+        self, name: str, help: str = "", labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = (*sorted(buckets), float("inf"))
+        self._values: dict[Labels, _HistogramValue] = {}
+
+    def observe(self, value: float, labels: Labels = ()):
+        if (entry := self._values.get(labels)) is None:
+            entry = self._values[labels] = _HistogramValue(len(self.buckets))
+        entry.counts[bisect_left(self.buckets, value)] += 1
+        entry.sum += value
+        entry.count += 1
+
+    def quantile(self, q: float, labels: Labels = ()) -> float | None:
+        entry = self._values.get(labels)
+        if entry is None or not entry.count:
+            return
+        rank = q * entry.count
+        seen = 0
+        for index, count in enumerate(entry.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-2]
+
+    def snapshot(self) -> dict[Labels, dict[str, float | None]]:
+        return {
+            labels: {
+                "count": entry.count,
+                "sum": entry.sum,
+                "p50": self.quantile(0.5, labels),
+                "p90": self.quantile(0.9, labels),
+                "p99": self.quantile(0.99, labels),
+            }
+            for labels, entry in self._values.items()
+        }
+
+    def export(self):
+        for labels, entry in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry.counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {entry.sum!r}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {entry.count}"
+
+    def reset(self):
+        self._values.clear()
+
+
+class MetricsRegistry:
+    """进程内的指标注册表.
+
+    同名指标只会创建一次, 重复获取时返回已有的实例; `snapshot` 返回便于程序处理的字典,
+    `export` 返回 Prometheus 文本格式.
+    """
+
+    metrics: dict[str, Metric]
+
+    def __init__(self, namespace: str = "avilla") -> None:
+        self.namespace = namespace
+        self.metrics = {}
+
+    def _get(self, cls: type[Metric], name: str, *args, **kwargs) -> Any:
+        if self.namespace:
+            name = f"{self.namespace}_{name}"
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise TypeError(f"metric {name} is already registered as {metric.type}")
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Iterable[str] = (),
+        collect: Callable[[], Sample] | None = None,
+    ) -> Counter:
+        return self._get(Counter, name, help, labelnames, collect)
+
+    def gauge(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Iterable[str] = (),
+        collect: Callable[[], Sample] | None = None,
+    ) -> Gauge:
+        return self._get(Gauge, name, help, labelnames, collect)
+
+    def histogram(
+        self, name: str, help: str = "", labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def export(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.export())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+def protocol_label(protocol: Any) -> str:
+    if protocol is None:
+        return ""
+    if not isinstance(protocol, type):
+        protocol = protocol.__class__
+    return protocol.__name__.replace("Protocol", "")
+
+
+def count_reconnect(registry: MetricsRegistry, protocol: str):
+    registry.counter("ws_reconnects_total", "websocket reconnect attempts", ("protocol",)).inc((protocol,))
+
+
+class FnCallMetrics:
+    """记录每次 capability 调用 (`Staff.call_fn`) 的解析耗时, 执行耗时 (含等待协程的时间) 与异常次数.
+
+    标签为 fn (`Owner.name`), perform (最终选中的 perform 类) 与 protocol. 需要 `install` 后才会生效;
+    未安装时 `Staff.call_fn` 只多一次全局变量的判断.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        labelnames = ("fn", "perform", "protocol")
+        self.calls = registry.counter("fn_calls_total", "capability calls", labelnames)
+        self.errors = registry.counter("fn_errors_total", "capability calls that raised", (*labelnames, "error"))
+        self.resolve_time = registry.histogram("fn_resolve_seconds", "time spent resolving the perform", labelnames)
+        self.execute_time = registry.histogram("fn_execute_seconds", "time spent executing the perform", labelnames)
+        self._fn_labels: dict[Fn, str] = {}
+
+    def install(self):
+        set_call_observer(self)
+        return self
+
+    def uninstall(self):
+        if _runtime.call_observer is self:
+            set_call_observer(None)
+
+    def observe_call(
+        self,
+        staff: Staff,
+        fn: Fn,
+        collector: BaseCollector | None,
+        resolve_time: float,
+        execute_time: float,
+        error: BaseException | None,
+    ):
+        if (fn_label := self._fn_labels.get(fn)) is None:
+            owner = getattr(fn, "owner", None)
+            fn_label = self._fn_labels[fn] = f"{owner.__name__}.{fn.name}" if owner is not None else repr(fn)
+        perform = getattr(collector, "cls", None)
+        labels = (
+            fn_label,
+            perform.__qualname__ if perform is not None else "",
+            protocol_label(staff.components.get("protocol")),
+        )
+        self.calls.inc(labels)
+        self.resolve_time.observe(resolve_time, labels)
+        if collector is not None:
+            self.execute_time.observe(execute_time, labels)
+        if error is not None:
+            self.errors.inc((*labels, error.__class__.__name__))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from launart import Launart, Service
+from loguru import logger
+
+from avilla.core.metrics import FnCallMetrics, protocol_label
+
+if TYPE_CHECKING:
+    from avilla.core.application import Avilla
+
+EXPOSITION_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsService(Service):
+    """以 Prometheus 文本格式在 `http://host:port/path` 上提供 `Avilla.metrics` 中的指标.
+
+    除了 registry 中已有的指标, 还会登记事件的接收/分发/丢弃计数, 事件队列深度, 事件排队/解析/监听器耗时,
+    消息缓存与 metadata 缓存的大小以及 metadata 拉取的合并情况; 事件循环的延迟与阻塞由 `LoopWatchdog` 记录.
+    instrument_calls 为 True 时同时记录所有 capability 调用 (见 `FnCallMetrics`).
+
+        avilla.launch_manager.add_component(MetricsService(avilla, port=9464))
+    """
+
+    id = "avilla.metrics"
+    required: set[str] = set()
+    stages: set[str] = {"preparing", "blocking", "cleanup"}
+
+    def __init__(
+        self,
+        avilla: Avilla,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        path: str = "/metrics",
+        *,
+        instrument_calls: bool = True,
+    ) -> None:
+        super().__init__()
+        self.avilla = avilla
+        self.host = host
+        self.port = port
+        self.path = path
+        self.runner: web.AppRunner | None = None
+
+        if instrument_calls and avilla.call_metrics is None:
+            avilla.call_metrics = FnCallMetrics(avilla.metrics).install()
+        self.register()
+
+    def register(self):
+        registry = self.avilla.metrics
+        pipeline = self.avilla.event_pipeline
+        service = self.avilla.service
+        stats = pipeline.stats
+        pipeline.bind_metrics(registry)
+
+        registry.counter(
+            "events_received_total",
+            "raw events received",
+            ("protocol", "kind"),
+            lambda: {(source or "", kind or ""): count for (source, kind), count in stats.received.items()},
+        )
+        registry.counter(
+            "events_dispatched_total",
+            "parsed events dispatched to broadcast",
+            ("protocol", "event"),
+            lambda: {
+                (protocol_label(protocol), event.__name__): count
+                for (protocol, event), count in stats.dispatched.items()
+            },
+        )
+        registry.counter(
+            "events_dropped_total",
+            "raw events dropped by the pipeline",
+            ("kind",),
+            lambda: {(kind or "",): count for kind, count in stats.dropped.items()},
+        )
+        registry.counter("events_failed_total", "raw events whose parsing raised", (), lambda: stats.failed)
+        registry.gauge("event_queue_depth", "raw events waiting in the pipeline", (), lambda: pipeline.depth)
+        registry.gauge("event_ordered_keys", "keys with pending ordered dispatches", (), lambda: len(pipeline.ordered))
+
+        if service.enabled_cache_message:
+            cache = service.message_cache
+            registry.gauge("message_cache_messages", "messages held by the message cache", (), lambda: len(cache))
+            registry.gauge("message_cache_bytes", "estimated size of the message cache", (), lambda: cache.total_bytes)
+
+        metadata_cache = service.metadata_cache
+        registry.gauge(
+            "metadata_cache_entries",
+            "entries held by the metadata cache",
+            ("account",),
+            lambda: {(route.display,): len(cache) for route, cache in metadata_cache.items()},
+        )
+        registry.counter(
+            "metadata_cache_hits_total",
+            "metadata cache hits",
+            ("account",),
+            lambda: {(route.display,): cache.hits for route, cache in metadata_cache.items()},
+        )
+        registry.counter(
+            "metadata_cache_misses_total",
+            "metadata cache misses",
+            ("account",),
+            lambda: {(route.display,): cache.misses for route, cache in metadata_cache.items()},
+        )
+        registry.counter(
+            "metadata_pulls_total",
+            "metadata pulls, by whether they joined an in-flight pull",
+            ("account", "coalesced"),
+            self._collect_pulls,
+        )
+
+    def _collect_pulls(self):
+        result = {}
+        for route, info in self.avilla.accounts.items():
+            flight = info.account.pull_flight
+            result[route.display, "true"] = flight.hits
+            result[route.display, "false"] = flight.misses
+        return result
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = self.avilla.metrics.export().encode()
+        return web.Response(body=body, headers={"Content-Type": EXPOSITION_CONTENT_TYPE})
+
+    async def launch(self, manager: Launart):
+        async with self.stage("preparing"):
+            app = web.Application()
+            app.router.add_get(self.path, self.handle)
+            self.runner = web.AppRunner(app, access_log=None)
+            await self.runner.setup()
+            await web.TCPSite(self.runner, self.host, self.port).start()
+            logger.info(f"serving metrics on http://{self.host}:{self.port}{self.path}")
+
+        async with self.stage("blocking"):
+            await manager.status.wait_for_sigexit()
+
+        async with self.stage("cleanup"):
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from contextvars import ContextVar, copy_context
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Collection, Hashable, Literal, Union
+
+from loguru import logger
+
+from avilla.core.tracing import Trace, current_trace, detach_trace, reset_trace, use_trace
+
+if TYPE_CHECKING:
+    from avilla.core.event import AvillaEvent
+    from avilla.core.metrics import Histogram, MetricsRegistry
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_by_type"]
+OrderingKey = Callable[["AvillaEvent"], Union[Hashable, None]]
+
+
+def scene_ordering_key(event: AvillaEvent) -> Hashable | None:
+    context = getattr(event, "context", None)
+    if context is not None:
+        return context.account.route, context.scene
+
+
+class _Job:
+    __slots__ = ("handler", "args", "kind", "enqueued", "seq", "outbox", "trace")
+
+    def __init__(
+        self, handler: Callable[..., Awaitable[Any]], args: tuple[Any, ...], kind: str | None, trace: Trace | None
+    ) -> None:
+        self.handler = handler
+        self.args = args
+        self.kind = kind
+        self.enqueued = perf_counter()
+        self.seq = -1
+        self.outbox: list[tuple[Hashable, Callable[[], Awaitable[Any]]]] = []
+        self.trace = trace
+
+    def drop(self):
+        if self.trace is not None:
+            self.trace.attributes["dropped"] = True
+            self.trace.release()
+
+
+_current_job: ContextVar[_Job | None] = ContextVar("_current_job", default=None)
+
+
+class _KeyQueue:
+    __slots__ = ("items", "wakeup", "task")
+
+    def __init__(self) -> None:
+        self.items: deque[Callable[[], Awaitable[Any]]] = deque()
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class KeyedExecutor:
+    """同一 key 的任务严格按提交顺序依次执行, 不同 key 的任务并发执行, 同时执行的任务至多 concurrency 个.
+
+    某个 key 空闲超过 idle_timeout 秒后, 其队列会被回收.
+    """
+
+    def __init__(self, concurrency: int = 64, idle_timeout: float = 60) -> None:
+        self.concurrency = concurrency
+        self.idle_timeout = idle_timeout
+        self._queues: dict[Hashable, _KeyQueue] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+    def submit(self, key: Hashable, func: Callable[[], Awaitable[Any]]):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = _KeyQueue()
+        queue.items.append(func)
+        queue.wakeup.set()
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._drain(key, queue))
+
+    async def _drain(self, key: Hashable, queue: _KeyQueue):
+        semaphore = self._semaphore
+        assert semaphore is not None
+        try:
+            while True:
+                while queue.items:
+                    func = queue.items.popleft()
+                    async with semaphore:
+                        try:
+                            await func()
+                        except Exception:
+                            logger.exception(f"failed to dispatch ordered event of {key!r}")
+                if self._closing:
+                    return
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if not queue.items:
+                        return
+        finally:
+            if self._queues.get(key) is queue:
+                del self._queues[key]
+
+    async def join(self, timeout: float | None = None):
+        """执行完已提交的任务后回收所有队列."""
+        self._closing = True
+        tasks = []
+        for queue in self._queues.values():
+            queue.wakeup.set()
+            if queue.task is not None:
+                tasks.append(queue.task)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._closing = False
+
+
+class PipelineStats:
+    received: Counter[tuple[str | None, str | None]]
+    dispatched: Counter[tuple[type | None, type]]
+    submitted: int
+    processed: int
+    failed: int
+    dropped: Counter[str | None]
+    max_depth: int
+    wait_total: float
+    wait_max: float
+    run_total: float
+    run_max: float
+
+    def __init__(self) -> None:
+        self.received = Counter()
+        self.dispatched = Counter()
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = Counter()
+        self.max_depth = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.processed if self.processed else 0.0
+
+    @property
+    def run_avg(self) -> float:
+        return self.run_total / self.processed if self.processed else 0.0
+
+
+class EventPipeline:
+    """协议接收到的事件经由此处交给固定数量的 worker 处理, 而不是为每个事件创建一个 Task.
+
+    队列满时的处理方式由 overflow 决定:
+
+    - `block`: 等待队列出现空位, 从而让接收循环停止读取; 等待超过 block_timeout 秒后丢弃该事件.
+      接收循环停止读取时, 同一连接上 action 的响应也无法被读取: 若 worker 正在解析中等待这样的响应,
+      worker 与接收循环会互相等待, 直到 block_timeout 到期丢弃事件后才能继续.
+      因此不要将 block_timeout 设为 None; 解析中需要调用 action 时, 应增加 workers 或使用 drop_* 策略;
+    - `drop_oldest`: 丢弃队列中最早的事件;
+    - `drop_by_type`: 丢弃 kind 属于 droppable 的事件 (优先丢弃新事件, 其次是队列中最早的可丢弃事件),
+      其他事件则等待空位.
+
+    指定 ordering 后 (为 True 时按账号与 `context.scene` 区分), 事件的解析仍然并发进行,
+    但解析得到的 AvillaEvent 会按接收顺序交给 KeyedExecutor: key 相同的事件依次分发, 前一个事件的所有监听器执行完毕后
+    才会分发下一个; key 为 None 的事件不受约束. 此时 `BaseProtocol.post_event` 返回的 Future 不再代表监听器的执行.
+    """
+
+    workers: int
+    queue_size: int
+    overflow: OverflowPolicy
+    droppable: frozenset[str]
+    stats: PipelineStats
+    active: dict[asyncio.Task, _Job]
+
+    def __init__(
+        self,
+        workers: int = 16,
+        queue_size: int = 4096,
+        overflow: OverflowPolicy = "block",
+        droppable: Collection[str] = (),
+        block_timeout: float | None = 5.0,
+        ordering: OrderingKey | bool = False,
+        ordered_concurrency: int = 64,
+        ordered_idle_timeout: float = 60,
+    ) -> None:
+        if workers <= 0 or queue_size <= 0:
+            raise ValueError("workers and queue_size must be positive")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.droppable = frozenset(droppable)
+        self.block_timeout = block_timeout
+        self.stats = PipelineStats()
+        self.ordering = scene_ordering_key if ordering is True else ordering or None
+        self.ordered = KeyedExecutor(ordered_concurrency, ordered_idle_timeout)
+
+        self._seq = 0
+        self._flushed = 0
+        self._finished: set[int] = set()
+        self._turns: dict[int, asyncio.Future[None]] = {}
+
+        self._queue: deque[_Job] = deque()
+        self._not_empty: asyncio.Condition | None = None
+        self._not_full: asyncio.Condition | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+        self.active = {}
+
+        self._wait_time: Histogram | None = None
+        self._run_time: Histogram | None = None
+        self._handle_time: Histogram | None = None
+
+    def bind_metrics(self, registry: MetricsRegistry):
+        """在 registry 中记录事件的排队耗时, 解析耗时与监听器的执行耗时."""
+        self._wait_time = registry.histogram("event_wait_seconds", "time raw events spend queued", ("kind",))
+        self._run_time = registry.histogram("event_parse_seconds", "time spent parsing raw events", ("kind",))
+        self._handle_time = registry.histogram(
+            "event_handle_seconds", "time until all listeners of an event finished", ("event",)
+        )
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def _ensure_started(self):
+        if self._not_empty is None:
+            lock = asyncio.Lock()
+            self._not_empty = asyncio.Condition(lock)
+            self._not_full = asyncio.Condition(lock)
+        if not self._tasks:
+            self._closing = False
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def put(
+        self, handler: Callable[..., Awaitable[Any]], *args: Any, kind: str | None = None, source: str | None = None
+    ) -> bool:
+        """提交一个事件; 返回 False 表示事件因队列已满而被丢弃. source 为事件来自的协议, 仅用于统计."""
+        self.stats.received[source, kind] += 1
+        self._ensure_started()
+        not_empty, not_full = self._not_empty, self._not_full
+        assert not_empty is not None and not_full is not None
+        job = _Job(handler, args, kind, detach_trace())
+
+        async with not_full:
+            if len(self._queue) >= self.queue_size and not self._make_room(job):
+                self.stats.dropped[kind] += 1
+                job.drop()
+                return False
+            if len(self._queue) >= self.queue_size:
+                try:
+                    await asyncio.wait_for(
+                        not_full.wait_for(lambda: len(self._queue) < self.queue_size), self.block_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.stats.dropped[kind] += 1
+                    job.drop()
+                    logger.warning(f"event pipeline is full, dropped {kind or 'event'}")
+                    return False
+
+            job.seq = self._seq
+            self._seq += 1
+            self._queue.append(job)
+            self.stats.submitted += 1
+            self.stats.max_depth = max(self.stats.max_depth, len(self._queue))
+            not_empty.notify()
+        return True
+
+    def _make_room(self, job: _Job) -> bool:
+        if self.overflow == "drop_oldest":
+            dropped = self._queue.popleft()
+            self.stats.dropped[dropped.kind] += 1
+            self._finish_turn(dropped.seq)
+            dropped.drop()
+        elif self.overflow == "drop_by_type":
+            if job.kind in self.droppable:
+                return False
+            for index, queued in enumerate(self._queue):
+                if queued.kind in self.droppable:
+                    del self._queue[index]
+                    self.stats.dropped[queued.kind] += 1
+                    self._finish_turn(queued.seq)
+                    queued.drop()
+                    break
+        return True
+
+    async def _worker(self):
+        not_empty, not_full = self._not_empty, self._not_full
+        assert not_empty is not None and not_full is not None
+        task = asyncio.current_task()
+        assert task is not None
+        while True:
+            async with not_empty:
+                while not self._queue:
+                    if self._closing:
+                        return
+                    await not_empty.wait()
+                job = self._queue.popleft()
+                not_full.notify()
+
+            started = perf_counter()
+            wait = started - job.enqueued
+            token = _current_job.set(job)
+            self.active[task] = job
+            if (trace := job.trace) is not None:
+                trace.add_span("queue", job.enqueued, started)
+            trace_token = use_trace(trace)
+            try:
+                if trace is not None:
+                    with trace.span("parse", kind=job.kind):
+                        await job.handler(*job.args)
+                else:
+                    await job.handler(*job.args)
+            except Exception:
+                self.stats.failed += 1
+                logger.exception(f"failed to handle {job.kind or 'event'}")
+            finally:
+                reset_trace(trace_token)
+                _current_job.reset(token)
+                del self.active[task]
+            elapsed = perf_counter() - started
+
+            if self.ordering is not None:
+                await self._flush(job)
+            if trace is not None:
+                trace.release()
+
+            stats = self.stats
+            stats.processed += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            stats.run_total += elapsed
+            stats.run_max = max(stats.run_max, elapsed)
+            if self._wait_time is not None and self._run_time is not None:
+                labels = (job.kind or "",)
+                self._wait_time.observe(wait, labels)
+                self._run_time.observe(elapsed, labels)
+
+    def dispatch(self, event: AvillaEvent, post: Callable[[AvillaEvent], Awaitable[Any]]) -> Awaitable[Any]:
+        """分发解析得到的事件; 未启用 ordering 时等价于 `post(event)`."""
+        context = getattr(event, "context", None)
+        self.stats.dispatched[context.protocol.__class__ if context is not None else None, event.__class__] += 1
+        if self._handle_time is not None:
+            post = self._timed(post)
+        if (trace := current_trace()) is not None:
+            post = trace.traced_post(event, post)
+
+        if self.ordering is None or (key := self.ordering(event)) is None:
+            return post(event)
+
+        context = copy_context()
+        thunk = lambda: context.run(post, event)  # noqa: E731
+        if (job := _current_job.get()) is not None:
+            job.outbox.append((key, thunk))
+        else:
+            self.ordered.submit(key, thunk)
+
+        done = asyncio.get_running_loop().create_future()
+        done.set_result(None)
+        return done
+
+    def _timed(self, post: Callable[[AvillaEvent], Awaitable[Any]]) -> Callable[[AvillaEvent], Awaitable[Any]]:
+        histogram = self._handle_time
+        assert histogram is not None
+
+        def wrapper(event: AvillaEvent):
+            started = perf_counter()
+            result = post(event)
+            if isinstance(result, asyncio.Future):
+                labels = (event.__class__.__name__,)
+                result.add_done_callback(lambda _: histogram.observe(perf_counter() - started, labels))
+            return result
+
+        return wrapper
+
+    async def _flush(self, job: _Job):
+        if job.seq != self._flushed:
+            turn = self._turns[job.seq] = asyncio.get_running_loop().create_future()
+            await turn
+        for key, thunk in job.outbox:
+            self.ordered.submit(key, thunk)
+        job.outbox.clear()
+        self._finish_turn(job.seq)
+
+    def _finish_turn(self, seq: int):
+        if self.ordering is None:
+            return
+        self._finished.add(seq)
+        while self._flushed in self._finished:
+            self._finished.discard(self._flushed)
+            self._flushed += 1
+        if (turn := self._turns.pop(self._flushed, None)) is not None:
+            turn.set_result(None)
+
+    async def stop(self, timeout: float | None = 10):
+        """处理完已经入队的事件后停止 worker; 超过 timeout 时直接取消."""
+        if not self._tasks or self._not_empty is None:
+            return
+        async with self._not_empty:
+            self._closing = True
+            self._not_empty.notify_all()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"event pipeline stopped with {len(self._queue)} events unprocessed")
+            await asyncio.wait(pending)
+        for job in self._queue:
+            job.drop()
+        self._queue.clear()
+        self._tasks = []
+        await self.ordered.join(timeout)
+
+    def describe(self) -> str:
+        stats = self.stats
+        return (
+            f"depth={self.depth} (max {stats.max_depth}), submitted={stats.submitted}, processed={stats.processed}, "
+            f"failed={stats.failed}, dropped={sum(stats.dropped.values())}, "
+            f"wait avg/max={stats.wait_avg * 1e3:.1f}/{stats.wait_max * 1e3:.1f}ms, "
+            f"run avg/max={stats.run_avg * 1e3:.1f}/{stats.run_max * 1e3:.1f}ms"
+        )
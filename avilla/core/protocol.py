@@ -32,4 +32,4 @@ class BaseProtocol:
             cx_context.use(context) if context is not None else nullcontext()
         ):
             self.avilla.event_record(event)
-            return self.avilla.broadcast.postEvent(event)
+            return self.avilla.event_pipeline.dispatch(event, self.avilla.broadcast.postEvent)
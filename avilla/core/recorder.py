@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Mapping, TypeVar
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from avilla.core.context import Context
+    from avilla.core.message import Message
+
+T = TypeVar("T")
+Formatter = Callable[[Any], str]
+
+
+def account_prefix(context: Context) -> str:
+    return (
+        f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
+        f"{context.account.route['account']}]"
+    )
+
+
+class _Throttle:
+    __slots__ = ("limit", "window", "started", "count", "suppressed")
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.started = 0.0
+        self.count = 0
+        self.suppressed = 0
+
+    def allow(self, event_type: type) -> bool:
+        now = monotonic()
+        if now - self.started >= self.window:
+            if self.suppressed:
+                logger.debug(f"suppressed {self.suppressed} records of {event_type.__name__}")
+            self.started, self.count, self.suppressed = now, 0, 0
+        if self.count < self.limit:
+            self.count += 1
+            return True
+        self.suppressed += 1
+        return False
+
+
+class _Sampler:
+    __slots__ = ("rate", "credit")
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.credit = 1.0 - rate
+
+    def allow(self) -> bool:
+        # 以累积的方式抽样: rate 为 0.1 时恰好记录每 10 个事件中的 1 个.
+        self.credit += self.rate
+        if self.credit >= 1.0:
+            self.credit -= 1.0
+            return True
+        return False
+
+
+class _Rule:
+    __slots__ = ("level", "formatter", "sampler", "throttle")
+
+    def __init__(
+        self, level: str, formatter: Formatter | None, sampler: _Sampler | None, throttle: _Throttle | None
+    ) -> None:
+        self.level = level
+        self.formatter = formatter
+        self.sampler = sampler
+        self.throttle = throttle
+
+
+class EventRecorder:
+    """按事件类型查表记录事件的日志.
+
+    格式化推迟到 loguru 确认存在接受该等级的 sink 之后才进行; sample 与 rate_limit 以事件类型 (及其子类) 为键,
+    分别指定记录的比例与每 window 秒至多记录的条数. enabled 为 False 时不做任何事.
+    """
+
+    enabled: bool
+    custom: dict[type, Callable[[Any], None]]
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        sample: Mapping[type, float] | None = None,
+        rate_limit: Mapping[type, int] | None = None,
+        window: float = 1.0,
+    ) -> None:
+        self.enabled = enabled
+        self.custom = {}
+        self.sample = dict(sample or {})
+        self.rate_limit = dict(rate_limit or {})
+        self.window = window
+        self._formatters: dict[type, tuple[str, Formatter | None]] = {}
+        self._samplers: dict[type, _Sampler] = {}
+        self._throttles: dict[type, _Throttle] = {}
+        self._rules: dict[type, _Rule | None] = {}
+        self._logger = logger.opt(lazy=True, depth=1)
+        self._defaults_installed = False
+
+    def register(self, event_type: type[T], formatter: Callable[[T], str] | None, level: str = "INFO"):
+        """为 event_type 及其子类注册格式化函数; formatter 为 None 表示不记录."""
+        self._formatters[event_type] = (level, formatter)
+        self._rules.clear()
+
+    def _lookup(self, table: Mapping[type, T], event_type: type) -> tuple[type, T] | None:
+        for cls in event_type.__mro__:
+            if cls in table:
+                return cls, table[cls]
+
+    def _resolve(self, event_type: type) -> _Rule | None:
+        if not self._defaults_installed:
+            install_default_formatters(self)
+        found = self._lookup(self._formatters, event_type)
+        if found is None:
+            return
+        level, formatter = found[1]
+
+        sampler = throttle = None
+        if (rate := self._lookup(self.sample, event_type)) is not None:
+            if (sampler := self._samplers.get(rate[0])) is None:
+                sampler = self._samplers[rate[0]] = _Sampler(rate[1])
+        if (limit := self._lookup(self.rate_limit, event_type)) is not None:
+            if (throttle := self._throttles.get(limit[0])) is None:
+                throttle = self._throttles[limit[0]] = _Throttle(limit[1], self.window)
+        return _Rule(level, formatter, sampler, throttle)
+
+    def record(self, event: Any):
+        if not self.enabled:
+            return
+        event_type = type(event)
+        try:
+            rule = self._rules[event_type]
+        except KeyError:
+            rule = self._rules[event_type] = self._resolve(event_type)
+        if rule is None or rule.formatter is None:
+            return
+        if rule.sampler is not None and not rule.sampler.allow():
+            return
+        if rule.throttle is not None and not rule.throttle.allow(event_type):
+            return
+
+        if (custom := self.custom.get(event_type)) is not None:
+            custom(event)
+        else:
+            formatter = rule.formatter
+            self._logger.log(rule.level, "{}", lambda: formatter(event))
+
+    def record_sent(self, context: Context, message: Message):
+        if self.enabled:
+            self._logger.info("{}", lambda: format_message_sent(context, message))
+
+
+def install_default_formatters(recorder: EventRecorder):
+    from avilla.core.event import AvillaEvent, MetadataModified
+    from avilla.standard.core.account.event import AccountStatusChanged
+    from avilla.standard.core.activity import ActivityEvent
+    from avilla.standard.core.application import AvillaLifecycleEvent
+    from avilla.standard.core.message import MessageEdited, MessageReceived, MessageSent
+    from avilla.standard.core.request import RequestEvent
+
+    recorder._defaults_installed = True
+    for event_type, formatter, level in [
+        (AvillaEvent, format_event, "INFO"),
+        (MessageSent, None, "INFO"),
+        (MessageReceived, format_message_received, "INFO"),
+        (MessageEdited, format_message_edited, "INFO"),
+        (RequestEvent, format_request, "INFO"),
+        (ActivityEvent, format_activity, "INFO"),
+        (MetadataModified, format_metadata_modified, "INFO"),
+        (AvillaLifecycleEvent, lambda event: event.__class__.__name__, "DEBUG"),
+        (AccountStatusChanged, format_account_status, "DEBUG"),
+    ]:
+        if event_type not in recorder._formatters:
+            recorder.register(event_type, formatter, level)
+
+
+def format_account_status(event) -> str:
+    return (
+        f"[{event.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
+        f"{event.account.route['account']}]: {event.__class__.__name__}"
+    )
+
+
+def format_event(event) -> str:
+    context = event.context
+    return (
+        f"{account_prefix(context)}: "
+        f"{event.__class__.__name__} from {context.client.display} to {context.endpoint.display} "
+        f"in {context.scene.display}"
+    )
+
+
+def format_message_received(event) -> str:
+    return f"{account_prefix(event.context)}: {event.context.scene.display} -> {str(event.message.content)!r}"
+
+
+def format_message_sent(context: Context, message: Message) -> str:
+    return f"{account_prefix(context)}: {context.scene.display} <- {str(message.content)!r}"
+
+
+def format_message_edited(event) -> str:
+    return (
+        f"{account_prefix(event.context)}: "
+        f"{event.context.scene.display} => {str(event.past)!r} -> {str(event.current)!r}"
+    )
+
+
+def format_request(event) -> str:
+    context, request = event.context, event.request
+    return (
+        f"{account_prefix(context)}: "
+        f"Request {request.request_type or request.id}"
+        f"{f' with {request.message}' if request.message else ''} "
+        f"from {context.client.display} in {context.scene.display}"
+    )
+
+
+def format_activity(event) -> str:
+    context = event.context
+    return (
+        f"{account_prefix(context)}: "
+        f"Activity {event.id}: {event.activity} from {context.client.display} in {context.scene.display}"
+    )
+
+
+def format_metadata_modified(event) -> str:
+    context = event.context
+    return (
+        f"{account_prefix(context)}: "
+        f"Metadata {event.route} Modified: {event.details} from {context.client.display} in {context.scene.display}"
+    )
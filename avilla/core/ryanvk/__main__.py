@@ -0,0 +1,5 @@
+import sys
+
+from .lazy import write_manifests
+
+write_manifests(sys.argv[1:])
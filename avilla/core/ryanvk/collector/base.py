@@ -40,6 +40,16 @@ class AvillaBaseCollector(BaseCollector):
 
         return self.entity(CoreCapability.pull, target=target, route=route)
 
+    def pull_many(
+        self, target: str, route: type[M] | MetadataRoute[Unpack[tuple[Any, ...]], M]
+    ) -> Callable[
+        [Callable[[Any, Selector, type[M], list[Selector]], Awaitable[dict[Selector, M]]]],
+        Callable[[Any, Selector, type[M], list[Selector]], Awaitable[dict[Selector, M]]],
+    ]:
+        from avilla.core.builtins.capability import CoreCapability
+
+        return self.entity(CoreCapability.pull_many, target=target, route=route)
+
     def fetch(self, resource_type: type[T]) -> Wrapper[Callable[[Any, T], Awaitable[Any]]]:
         from avilla.core.builtins.capability import CoreCapability
 
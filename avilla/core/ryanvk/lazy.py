@@ -0,0 +1,184 @@
+"""协议 perform 的延迟加载.
+
+协议通过 `lazy_merge` 声明其 artifacts: 默认行为与 `merge(ref(...), ...)` 相同, 会立即导入全部 perform;
+设置环境变量 `AVILLA_LAZY_PERFORMS=1` 后, 若协议包内存在 perform manifest, 则只导入 manifest 中标记为 eager 的模块,
+其余模块在对应的 Fn 第一次被查找时才导入.
+
+manifest 由 `python -m avilla.core.ryanvk <protocol module> ...` 生成, 修改 perform 后需要重新生成.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from avilla.core.utilles.importtime import ImportRecord, ImportTimer
+from graia.ryanvk import merge
+from graia.ryanvk._runtime import bump_artifact_version
+from graia.ryanvk.collector import BaseCollector
+from graia.ryanvk.sign import FnImplement
+
+LAZY_ENV = "AVILLA_LAZY_PERFORMS"
+MANIFEST_VERSION = 1
+
+
+def lazy_enabled() -> bool:
+    return os.environ.get(LAZY_ENV, "").lower() in {"1", "true", "yes", "on"}
+
+
+def signature_key(signature: Any) -> str | None:
+    if isinstance(signature, FnImplement):
+        fn = signature.fn
+        return f"{fn.owner.__module__}:{fn.owner.__qualname__}.{fn.name}"
+
+
+@dataclass
+class LazyMerge:
+    manifest: Path
+    importer: Callable[[], Any]
+    refs: tuple[dict[Any, Any], ...]
+    artifacts: dict[Any, Any] = field(default_factory=dict)
+    lazy: bool = False
+    signatures: dict[str, list[str]] = field(default_factory=dict)
+    loaded: set[str] = field(default_factory=set)
+    records: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def import_time(self) -> float:
+        return sum(record.cumulative for record in self.records if record.depth == 0)
+
+    def load_eagerly(self):
+        with ImportTimer() as timer:
+            self.importer()
+        self.records.extend(timer.records)
+        self.artifacts.update(merge(*self.refs))
+
+    def load(self, modules: list[str]) -> bool:
+        pending = [module for module in modules if module not in self.loaded]
+        if not pending:
+            return False
+
+        with ImportTimer() as timer:
+            for module in pending:
+                timer.import_module(module)
+                self.loaded.add(module)
+        self.records.extend(timer.records)
+        logger.debug(f"lazily loaded {', '.join(pending)} in {timer.total * 1e3:.1f}ms")
+
+        # merge 不会修改各个 ref, 因此可以在新的 perform 到位后整体重新合并.
+        merged = merge(*self.refs)
+        self.artifacts.clear()
+        self.artifacts.update(merged)
+        bump_artifact_version()
+        return True
+
+
+LAZY_MERGES: list[LazyMerge] = []
+_lazy_artifacts: dict[int, LazyMerge] = {}
+
+
+def _read_manifest(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return
+    except ValueError:
+        logger.warning(f"ignored malformed perform manifest: {path}")
+        return
+    if data.get("version") != MANIFEST_VERSION:
+        logger.warning(f"ignored outdated perform manifest: {path}")
+        return
+    return data
+
+
+def lazy_merge(manifest: str | Path, importer: Callable[[], Any], *refs: dict[Any, Any]) -> dict[Any, Any]:
+    """`merge(*refs)` 的可延迟版本; importer 负责导入全部 perform 模块."""
+    spec = LazyMerge(Path(manifest), importer, refs)
+    LAZY_MERGES.append(spec)
+
+    if not lazy_enabled() or (data := _read_manifest(spec.manifest)) is None:
+        spec.load_eagerly()
+        return spec.artifacts
+
+    spec.lazy = True
+    spec.signatures = data["signatures"]
+    _lazy_artifacts[id(spec.artifacts)] = spec
+    spec.load(data["eager"])
+    return spec.artifacts
+
+
+def get_lazy_merge(artifacts: dict[Any, Any]) -> LazyMerge | None:
+    for spec in LAZY_MERGES:
+        if spec.artifacts is artifacts:
+            return spec
+
+
+def load_missing_artifacts(artifact_collections: list[dict[Any, Any]], signature: Any) -> bool:
+    """为缺失的 signature 加载所需的 perform 模块; 返回是否加载了新的模块."""
+    if not _lazy_artifacts or (key := signature_key(signature)) is None:
+        return False
+
+    loaded = False
+    for artifacts in artifact_collections:
+        spec = _lazy_artifacts.get(id(artifacts))
+        if spec is not None and (modules := spec.signatures.get(key)):
+            loaded = spec.load(modules) or loaded
+    return loaded
+
+
+def _collect_modules(value: Any, modules: set[str], seen: set[int]):
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+
+    if isinstance(value, BaseCollector):
+        if (cls := getattr(value, "cls", None)) is not None:
+            modules.add(cls.__module__)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            _collect_modules(k, modules, seen)
+            _collect_modules(v, modules, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for i in value:
+            _collect_modules(i, modules, seen)
+    elif hasattr(value, "__dict__") and not callable(value):
+        _collect_modules(vars(value), modules, seen)
+
+
+def generate_manifest(spec: LazyMerge) -> dict[str, Any]:
+    signatures: dict[str, set[str]] = {}
+    eager: set[str] = set()
+
+    for ref in spec.refs:
+        for signature, artifact in ref.items():
+            modules = set()
+            _collect_modules(artifact, modules, set())
+            if (key := signature_key(signature)) is None:
+                # 非 Fn 的 artifact (如 QueryRecord) 不经过 Fn 查找, 无法按需加载.
+                eager |= modules
+            else:
+                signatures.setdefault(key, set()).update(modules)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "eager": sorted(eager),
+        "signatures": {key: sorted(modules) for key, modules in sorted(signatures.items())},
+    }
+
+
+def write_manifests(modules: list[str]):
+    os.environ.pop(LAZY_ENV, None)
+    for module in modules:
+        importlib.import_module(module)
+        for spec in LAZY_MERGES:
+            if spec.importer.__module__ != module or spec.lazy:
+                continue
+            spec.manifest.write_text(json.dumps(generate_manifest(spec), indent=2) + "\n", encoding="utf-8")
+            print(f"{module}: {spec.manifest}")
+
@@ -38,6 +38,9 @@ class MetadataOverload(FnOverload):
 
         return sets.pop().intersection(*sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Route]) -> Any:
+        return tuple(args.values())
+
     def merge_scopes(self, *scopes: dict[Any, Any]):
         # layout: {param_name: {route: set()}}
         result = {}
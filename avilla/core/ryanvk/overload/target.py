@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Callable
 from typing_extensions import TypeAlias
 
 from avilla.core.selector import FollowsPredicater, Selector, _parse_follows
+from graia.ryanvk._runtime import artifact_version
 from graia.ryanvk.collector import BaseCollector
 from graia.ryanvk.overload import FnOverload
 
@@ -37,23 +38,107 @@ class TargetOverloadConfig:
 
 
 def _merge_lookup_collection(current: LookupCollection, other: LookupCollection):
-    for key, branches in current.items():
-        if (other_branches := other.pop(key, None)) is None:
-            continue
-
-        for header, branch in branches.items():
-            if (other_branch := other_branches.pop(header, None)) is None:
-                continue
-
+    # 不修改 other: 同一个 ref 可能被多次合并 (例如延迟加载时).
+    for key, other_branches in other.items():
+        branches = current.setdefault(key, {})
+        for header, other_branch in other_branches.items():
+            if (branch := branches.get(header)) is None:
+                branch = branches[header] = LookupBranch(other_branch.metadata, {})
             _merge_lookup_collection(branch.levels, other_branch.levels)
             branch.bind |= other_branch.bind
 
-        branches |= other_branches
 
-    current |= other
+class _CompiledBranch:
+    __slots__ = ("bind", "levels")
+
+    def __init__(self, bind: set[tuple[BaseCollector, Callable]], levels: dict[str, _CompiledBranches]) -> None:
+        self.bind = bind
+        self.levels = levels
+
+
+class _CompiledBranches:
+    __slots__ = ("literals", "predicates", "default", "wildcard")
+
+    def __init__(self) -> None:
+        self.literals: dict[str, _CompiledBranch] = {}
+        self.predicates: list[tuple[FollowsPredicater, _CompiledBranch]] = []
+        self.default: _CompiledBranch | None = None
+        self.wildcard: set[tuple[BaseCollector, Callable]] | None = None
+
+
+class CompiledLookup:
+    """由 LookupCollection 编译得到的查找树: 默认分支的下级已预先合并, 谓词分支按收集顺序排列."""
+
+    __slots__ = ("collection", "version", "root", "discriminators")
+
+    def __init__(self, collection: LookupCollection) -> None:
+        names = set()
+        self.collection = collection
+        self.version = artifact_version()
+        self.root = _compile_collection(collection, names)
+        self.discriminators = frozenset(names)
+
+    def lookup(self, selector: Selector) -> set[tuple[BaseCollector, Callable]]:
+        level = self.root
+        branch = None
+        for key, value in selector.pattern.items():
+            if (branches := level.get(key)) is None:
+                raise NotImplementedError
+
+            if (branch := branches.literals.get(value)) is None:
+                for predicate, candidate in branches.predicates:
+                    if predicate(value):
+                        branch = candidate
+                        break  # hit predicate
+                else:
+                    if branches.default is not None:
+                        branch = branches.default  # hit default
+                    elif branches.wildcard is not None:
+                        return branches.wildcard  # hit wildcard
+                    else:
+                        raise NotImplementedError
+
+            level = branch.levels
+
+        if branch is not None and branch.bind:
+            return branch.bind
+
+        raise NotImplementedError
+
+
+def _compile_collection(collection: LookupCollection, names: set[str]) -> dict[str, _CompiledBranches]:
+    result = {}
+    for key, branches in collection.items():
+        compiled = result[key] = _CompiledBranches()
+        default = branches.get(None)
+        for header, branch in branches.items():
+            levels = branch.levels
+            if header is not None:
+                names.add(key)
+                if default is not None:
+                    levels = default.levels | levels
+            node = _CompiledBranch(branch.bind, _compile_collection(levels, names))
+            if header is None:
+                compiled.default = node
+            elif callable(header):
+                compiled.predicates.append((header, node))
+            else:
+                compiled.literals[header] = node
+        if "*" in branches:
+            compiled.wildcard = branches["*"].bind
+    return result
 
 
 class TargetOverload(FnOverload):
+    def __init__(self) -> None:
+        self._compiled: dict[int, CompiledLookup] = {}
+
+    def compile(self, collection: LookupCollection) -> CompiledLookup:
+        compiled = self._compiled.get(id(collection))
+        if compiled is None or compiled.collection is not collection or compiled.version != artifact_version():
+            compiled = self._compiled[id(collection)] = CompiledLookup(collection)
+        return compiled
+
     def collect_entity(
         self,
         collector: BaseCollector,
@@ -100,42 +185,21 @@ class TargetOverload(FnOverload):
             if arg_name not in scope:
                 raise NotImplementedError
 
-            def get_bind_set():
-                processing_scope: LookupCollection = scope[arg_name]
-                branch = None
-                for key, value in selector.pattern.items():
-                    if (branches := processing_scope.get(key)) is None:
-                        raise NotImplementedError
-
-                    if value in branches:
-                        header = value
-                    else:
-                        for _key, branch in branches.items():
-                            if callable(_key) and _key(value):
-                                header = _key
-                                break  # hit predicate
-                        else:
-                            if None in branches:
-                                header = None  # hit default
-                            elif "*" in branches:
-                                return branches["*"].bind  # hit wildcard
-                            else:
-                                raise NotImplementedError
-
-                    branch = branches[header]
-                    processing_scope = branch.levels
-
-                    if header is not None and None in branches:
-                        processing_scope = branches[None].levels | processing_scope
-                if branch is not None and branch.bind:
-                    # branch has bind
-                    return branch.bind
-
-                raise NotImplementedError
+            bind_sets.append(self.compile(scope[arg_name]).lookup(selector))
 
-            bind_sets.append(get_bind_set())
         return bind_sets.pop().intersection(*bind_sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Selector]) -> Any:
+        keys = []
+        for arg_name, selector in args.items():
+            if not isinstance(selector, Selector) or arg_name not in scope:
+                return
+            discriminators = self.compile(scope[arg_name]).discriminators
+            keys.append(
+                (selector.path, tuple(value for key, value in selector.pattern.items() if key in discriminators))
+            )
+        return tuple(keys)
+
     def merge_scopes(self, *scopes: dict[Any, Any]):
         # scope layout: {
         #   <param_name: str>: LookupCollection
@@ -148,7 +212,7 @@ class TargetOverload(FnOverload):
                 param_collections.setdefault(param, []).append(collection)
 
         for param, collections in param_collections.items():
-            result[param] = current = collections.pop(0)
+            result[param] = current = {}
             for other in collections:
                 _merge_lookup_collection(current, other)
 
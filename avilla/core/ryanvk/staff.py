@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from functools import reduce
-from typing import TYPE_CHECKING, Any, Callable, ChainMap, overload
+from typing import TYPE_CHECKING, Any, Callable, Iterable, overload
 
 from typing_extensions import ParamSpec, TypeVar, Unpack
 
@@ -17,6 +18,7 @@ from graia.ryanvk import BaseCollector
 from graia.ryanvk import Staff as BaseStaff
 
 from .descriptor.query import find_querier_steps, query_depth_generator
+from .lazy import load_missing_artifacts
 
 if TYPE_CHECKING:
     from avilla.core.metadata import Metadata
@@ -33,10 +35,15 @@ P1 = ParamSpec("P1")
 N = TypeVar("N")
 Co = TypeVar("Co", bound="BaseCollector")
 
+PULL_MANY_CONCURRENCY = 8
+
 
 class Staff(BaseStaff):
     """手杖与核心工艺 (Staff & Focus Craft)."""
 
+    def load_missing(self, signature: Any) -> bool:
+        return load_missing_artifacts(self.artifact_collections, signature)
+
     def get_context(self, target: Selector, *, via: Selector | None = None):
         return self.call_fn(CoreCapability.get_context, target, via=via)
 
@@ -66,9 +73,39 @@ class Staff(BaseStaff):
     ):
         return await self.call_fn(CoreCapability.pull, target, route)
 
+    async def pull_metadata_many(
+        self,
+        route: type[M] | MetadataRoute[Unpack[tuple[Any, ...]], M],
+        targets: Iterable[Selector],
+        *,
+        concurrency: int = PULL_MANY_CONCURRENCY,
+    ) -> dict[Selector, M]:
+        """批量拉取 metadata; 优先使用协议提供的 `CoreCapability.pull_many` 实现,
+        其未覆盖的 target 以至多 concurrency 个并发逐个拉取."""
+        ordered = list(dict.fromkeys(targets))
+        groups: dict[tuple[str, ...], list[Selector]] = {}
+        for target in ordered:
+            groups.setdefault((target.path, *list(target.pattern.values())[:-1]), []).append(target)
+
+        results: dict[Selector, M] = {}
+        for members in groups.values():
+            try:
+                results.update(await self.call_fn(CoreCapability.pull_many, members[0], route, members))
+            except NotImplementedError:
+                pass
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def pull(target: Selector):
+            async with semaphore:
+                results[target] = await self.pull_metadata(target, route)
+
+        await asyncio.gather(*(pull(target) for target in ordered if target not in results))
+        return {target: results[target] for target in ordered}
+
     async def query_entities(self, pattern: str, **predicators: FollowsPredicater):
         items = _parse_follows(pattern, **predicators)
-        artifact_map = ChainMap(*self.artifact_collections)
+        artifact_map = self.artifact_map
         steps = find_querier_steps(artifact_map, items)
 
         if steps is None:
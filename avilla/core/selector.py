@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, ItemsView, Iterable, KeysView, Mapping, ValuesView
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import filterfalse
 from types import MappingProxyType
-from typing import Protocol, runtime_checkable
+from typing import Generic, Protocol, TypeVar, runtime_checkable
+from weakref import WeakValueDictionary
 
 from typing_extensions import Self, TypeAlias
 
@@ -17,9 +19,12 @@ ESCAPE = {")": "\\)", "(": "\\(", "]": "\\]", "[": "\\[", "}": "\\}", "{": "\\{"
 
 _follows_pattern = re.compile(r"(?P<name>(\w+?|[*~]))(#(?P<predicate>\w+))?(\((?P<literal>[^#]+?)\))?")
 FollowsPredicater: TypeAlias = "Callable[[str], bool]"
+T = TypeVar("T")
 
+FOLLOWS_CACHE_SIZE = 1024
 
-@dataclass
+
+@dataclass(frozen=True)
 class _FollowItem:
     name: str
     literal: str | None = None
@@ -74,95 +79,275 @@ def _parse_follows(pattern: str, **kwargs: FollowsPredicater) -> list[_FollowIte
     return list(items.values())
 
 
+class FollowsPattern:
+    """预先解析的 follows pattern, 可复用, 可哈希, 可以代替字符串传入 `Selector.follows` 等方法."""
+
+    __slots__ = ("source", "items", "_hash")
+
+    source: str
+    items: tuple[_FollowItem, ...]
+
+    def __init__(self, source: str, items: tuple[_FollowItem, ...]) -> None:
+        self.source = source
+        self.items = items
+        self._hash = hash(("FollowsPattern", items))
+
+    @classmethod
+    def compile(cls, pattern: str | FollowsPattern, **predicates: FollowsPredicater) -> FollowsPattern:
+        if isinstance(pattern, FollowsPattern):
+            if predicates:
+                raise TypeError("predicates cannot be applied to a compiled pattern")
+            return pattern
+        if predicates:
+            # 带有谓词的 pattern 不进入缓存, 否则临时创建的谓词会持续挤占缓存.
+            return cls(pattern, tuple(_parse_follows(pattern, **predicates)))
+        return _compile_follows(pattern)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, FollowsPattern) and o.items == self.items
+
+    def __repr__(self) -> str:
+        return f"FollowsPattern({self.source!r})"
+
+    def __str__(self) -> str:
+        return self.source
+
+    def matches(self, selector: Selector) -> bool:
+        index = 0
+        for index, (item, name, value) in enumerate(zip(self.items, selector._keys, selector._values)):
+            if item.name == "*":
+                return True
+            if item.name != name:
+                return False
+            if item.predicate is not None and not item.predicate(value):
+                return False
+            if item.literal is not None and value != item.literal:
+                return False
+        return index + 1 == len(selector._keys)
+
+
+@lru_cache(maxsize=FOLLOWS_CACHE_SIZE)
+def _compile_follows(pattern: str) -> FollowsPattern:
+    return FollowsPattern(pattern, tuple(_parse_follows(pattern)))
+
+
+class _SelectorPattern(Mapping[str, str]):
+    """`Selector.pattern` 的只读视图, 直接建立在 Selector 的键/值元组之上."""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: tuple[str, ...], values: tuple[str, ...]) -> None:
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self):
+        return _SelectorKeysView(self)
+
+    def values(self):
+        return _SelectorValuesView(self)
+
+    def items(self):
+        return _SelectorItemsView(self)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(zip(self._keys, self._values))!r})"
+
+
+class _SelectorKeysView(KeysView):
+    _mapping: _SelectorPattern
+
+    def __iter__(self):
+        return iter(self._mapping._keys)
+
+    def __reversed__(self):
+        return reversed(self._mapping._keys)
+
+
+class _SelectorValuesView(ValuesView):
+    _mapping: _SelectorPattern
+
+    def __iter__(self):
+        return iter(self._mapping._values)
+
+    def __reversed__(self):
+        return reversed(self._mapping._values)
+
+
+class _SelectorItemsView(ItemsView):
+    _mapping: _SelectorPattern
+
+    def __iter__(self):
+        return zip(self._mapping._keys, self._mapping._values)
+
+    def __reversed__(self):
+        return zip(reversed(self._mapping._keys), reversed(self._mapping._values))
+
+
+_interned_keys: dict[tuple[str, ...], tuple[str, ...]] = {}
+_interned_selectors: WeakValueDictionary[tuple[tuple[str, ...], tuple[str, ...]], Selector] = WeakValueDictionary()
+
+
+def _intern_keys(keys: tuple[str, ...]) -> tuple[str, ...]:
+    # path 的种类极其有限 (land.group.member 之类), 因此所有 Selector 共享同一个键元组.
+    return _interned_keys.setdefault(keys, keys)
+
+
 class Selector:
-    pattern: Mapping[str, str]
+    __slots__ = ("_keys", "_values", "_hash", "_path", "_display", "__weakref__")
+
+    _keys: tuple[str, ...]
+    _values: tuple[str, ...]
 
     def __init__(self, pattern: Mapping[str, str] = EMPTY_MAP) -> None:
-        self.pattern = MappingProxyType({k: str(v) for k, v in pattern.items()})
-        self._hash = hash(("Selector", *self.pattern.items()))
+        if isinstance(pattern, _SelectorPattern):
+            self._keys = pattern._keys
+            self._values = pattern._values
+        else:
+            self._keys = _intern_keys(tuple(pattern))
+            self._values = tuple(map(str, pattern.values()))
+        self._hash = None
+        self._path = None
+        self._display = None
+
+    @property
+    def pattern(self) -> Mapping[str, str]:
+        return _SelectorPattern(self._keys, self._values)
 
     def modify(self, pattern: Mapping[str, str]) -> Self:
         return self.__class__(pattern=pattern)
 
+    def _with(self, key: str, value: str) -> Self:
+        keys = self._keys
+        if key in keys:
+            index = keys.index(key)
+            values = self._values[:index] + (value,) + self._values[index + 1 :]
+        else:
+            keys = _intern_keys(keys + (key,))
+            values = self._values + (value,)
+        return self.modify(_SelectorPattern(keys, values))
+
     def __getattr__(self, name: str) -> Callable[[str], Self]:
         if name.startswith("__"):
             return super().__getattribute__(name)  # type: ignore
 
         def wrapper(content: str) -> Self:
-            return self.modify({**self.pattern, name: str(content)})
+            return self._with(name, str(content))
 
         return wrapper
 
     def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(("Selector", *zip(self._keys, self._values)))
         return self._hash
 
     def __eq__(self, o: object) -> bool:
-        return isinstance(o, self.__class__) and o._hash == self._hash
+        return isinstance(o, self.__class__) and o._keys == self._keys and o._values == self._values
 
     def __contains__(self, key: str) -> bool:
-        return key in self.pattern
+        return key in self._keys
 
     def __getitem__(self, key: str) -> str:
-        return self.pattern[key]
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}().{'.'.join(f'{k}({v})' for k, v in self.pattern.items())}"
+        return f"{self.__class__.__name__}().{self.display}"
 
     def __copy__(self):
-        return self.modify({**self.pattern})
+        return self.modify(self.pattern)
 
     def __deepcopy__(self, memo):
         data = {**self.pattern}
         return self.__class__(deepcopy(data, memo))
 
+    def __reduce__(self):
+        return self.__class__, (dict(zip(self._keys, self._values)),)
+
+    def intern(self) -> Self:
+        """返回与当前 Selector 相等的规范实例, 供长期持有 (如缓存的键) 时复用."""
+        if type(self) is not Selector:
+            return self
+        return _interned_selectors.setdefault((self._keys, self._values), self)
+
     @property
     def empty(self) -> bool:
-        return not self.pattern
+        return not self._keys
 
     @property
     def path(self) -> str:
-        return ".".join(self.pattern)
+        if self._path is None:
+            self._path = ".".join(self._keys)
+        return self._path
 
     @property
     def path_without_land(self) -> str:
-        return ".".join(filterfalse(lambda x: x == "land", self.pattern))
+        return ".".join(filterfalse(lambda x: x == "land", self._keys))
 
     @property
     def display(self) -> str:
-        return ".".join(f"{k}({v})" for k, v in self.pattern.items())
+        if self._display is None:
+            self._display = ".".join(f"{k}({v})" for k, v in zip(self._keys, self._values))
+        return self._display
 
     @property
     def display_without_land(self) -> str:
-        return ".".join(f"{k}({v})" for k, v in self.pattern.items() if k != "land")
+        return ".".join(f"{k}({v})" for k, v in zip(self._keys, self._values) if k != "land")
 
     @property
     def last_key(self) -> str:
-        return next(reversed(self.pattern.keys()))
+        return self._keys[-1]
 
     @property
     def last_value(self) -> str:
-        return next(reversed(self.pattern.values()))
+        return self._values[-1]
 
     def items(self):
         return self.pattern.items()
 
     def appendix(self, key: str, value: str):
-        return self.modify({**self.pattern, key: str(value)})
+        return self._with(key, str(value))
 
     def land(self, land: Land | str):
         if isinstance(land, Land):
             land = land.name
 
-        return self.modify({"land": land, **{k: v for k, v in self.pattern.items() if k != "land"}})
+        if "land" not in self._keys:
+            return self.modify(_SelectorPattern(_intern_keys(("land",) + self._keys), (land,) + self._values))
+        index = self._keys.index("land")
+        keys = ("land",) + self._keys[:index] + self._keys[index + 1 :]
+        values = (land,) + self._values[:index] + self._values[index + 1 :]
+        return self.modify(_SelectorPattern(_intern_keys(keys), values))
 
     def to_selector(self):
         return self
 
     @classmethod
-    def from_follows(cls, pattern: str):
-        items = _parse_follows(pattern)
+    def from_follows(cls, pattern: str | FollowsPattern):
         mapping = {}
-        for i in items:
+        for i in FollowsPattern.compile(pattern).items:
             if i.literal is None:
                 raise ValueError("literal expected")
             mapping[i.name] = i.literal
@@ -170,22 +355,11 @@ class Selector:
 
     from_follows_pattern = from_follows
 
-    def follows(self, pattern: str, **kwargs: FollowsPredicater) -> bool:
-        items = _parse_follows(pattern, **kwargs)
-        index = 0
-        for index, (item, name, value) in enumerate(zip(items, self.pattern.keys(), self.pattern.values())):
-            if item.name == "*":
-                return True
-            if item.name != name:
-                return False
-            if item.predicate is not None and not item.predicate(value):
-                return False
-            if item.literal is not None and value != item.literal:
-                return False
-        return index + 1 == len(self.pattern)
+    def follows(self, pattern: str | FollowsPattern, **kwargs: FollowsPredicater) -> bool:
+        return FollowsPattern.compile(pattern, **kwargs).matches(self)
 
-    def into(self, pattern: str, **kwargs: str) -> Self:
-        items = _parse_follows(pattern)
+    def into(self, pattern: str | FollowsPattern, **kwargs: str) -> Self:
+        items = FollowsPattern.compile(pattern).items
         new_patterns = {}
         iterator = iter(self.pattern)
         if items and items[0].name == "~":
@@ -208,7 +382,7 @@ class Selector:
 
     def expects(
         self,
-        pattern: str,
+        pattern: str | FollowsPattern,
         *,
         exception_type: type[Exception] = ValueError,
         **kwargs: FollowsPredicater,
@@ -219,6 +393,119 @@ class Selector:
         return self
 
 
+class _PatternNode:
+    __slots__ = ("literals", "predicates", "anys", "wildcards", "through")
+
+    def __init__(self) -> None:
+        self.literals: dict[tuple[str, str], _PatternNode] = {}
+        self.predicates: dict[str, list[tuple[FollowsPredicater, _PatternNode]]] = {}
+        self.anys: dict[str, _PatternNode] = {}
+        self.wildcards: set = set()
+        self.through: set = set()
+
+    def step(self, name: str, value: str):
+        if (node := self.literals.get((name, value))) is not None:
+            yield node
+        if (node := self.anys.get(name)) is not None:
+            yield node
+        for predicate, node in self.predicates.get(name, ()):
+            if predicate(value):
+                yield node
+
+
+class SelectorPatternSet(Generic[T]):
+    """将多个 follows pattern 编译为一棵前缀树, 一次遍历 Selector 即可得到所有匹配的 pattern.
+
+    匹配语义与 `Selector.follows` 完全一致.
+    """
+
+    __slots__ = ("_root", "_singles", "_keys")
+
+    def __init__(self, patterns: Iterable[str | FollowsPattern] | Mapping[T, str | FollowsPattern] = ()) -> None:
+        self._root = _PatternNode()
+        self._singles: set = set()
+        self._keys: set = set()
+        if isinstance(patterns, Mapping):
+            for key, pattern in patterns.items():
+                self.add(pattern, key)
+        else:
+            for pattern in patterns:
+                self.add(pattern)
+
+    def add(self, pattern: str | FollowsPattern, key: T | None = None, **predicates: FollowsPredicater) -> T:
+        compiled = FollowsPattern.compile(pattern, **predicates)
+        if key is None:
+            key = pattern  # type: ignore
+        self._keys.add(key)
+        if not compiled.items:
+            # 空 pattern 只匹配长度为 1 的 Selector.
+            self._singles.add(key)
+            return key  # type: ignore
+        node = self._root
+        for item in compiled.items:
+            if item.name == "*":
+                node.wildcards.add(key)
+                break
+            if item.literal is not None:
+                node = node.literals.setdefault((item.name, item.literal), _PatternNode())
+            elif item.predicate is not None:
+                branches = node.predicates.setdefault(item.name, [])
+                for predicate, child in branches:
+                    if predicate is item.predicate:
+                        node = child
+                        break
+                else:
+                    child = _PatternNode()
+                    branches.append((item.predicate, child))
+                    node = child
+            else:
+                node = node.anys.setdefault(item.name, _PatternNode())
+            node.through.add(key)
+        return key  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def matches(self, selector: Selector) -> set[T]:
+        keys, values = selector._keys, selector._values
+        if not keys:
+            return set()
+        result = set(self._singles) if len(keys) == 1 else set()
+        frontier = [self._root]
+        for name, value in zip(keys, values):
+            next_frontier = []
+            for node in frontier:
+                result |= node.wildcards
+                next_frontier.extend(node.step(name, value))
+            if not next_frontier:
+                return result
+            frontier = next_frontier
+        for node in frontier:
+            result |= node.through
+        return result
+
+    def any(self, selector: Selector) -> bool:
+        keys, values = selector._keys, selector._values
+        if not keys:
+            return False
+        if self._singles and len(keys) == 1:
+            return True
+        frontier = [self._root]
+        for name, value in zip(keys, values):
+            next_frontier = []
+            for node in frontier:
+                if node.wildcards:
+                    return True
+                next_frontier.extend(node.step(name, value))
+            if not next_frontier:
+                return False
+            frontier = next_frontier
+        return any(node.through for node in frontier)
+
+
 @runtime_checkable
 class Selectable(Protocol):
     def to_selector(self) -> Selector:
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from launart import Launart, Service
 from loguru import logger
 
-from avilla.core.utilles.message_cache import MessageCacheDeque
+from avilla.core.ryanvk.lazy import get_lazy_merge
+from avilla.core.utilles.importtime import format_import_records
+from avilla.core.utilles.message_cache import MessageCache
+from avilla.core.utilles.message_store import MessageStore
+from avilla.core.utilles.metadata_cache import MetadataCache
 from avilla.standard.core.application import (
     ApplicationClosed,
     ApplicationClosing,
@@ -18,6 +22,7 @@ from .graia import AVILLA_ASCII_LOGO, AVILLA_ASCII_RAW_LOGO, log_telemetry
 
 if TYPE_CHECKING:
     from .application import Avilla
+    from .message import Message
     from .selector import Selector
 
 
@@ -27,15 +32,48 @@ class AvillaService(Service):
 
     avilla: Avilla
     enabled_cache_message: bool
-    message_cache: defaultdict[Selector, MessageCacheDeque]
-
-    def __init__(self, avilla: Avilla, cache_size: int):
+    message_cache: MessageCache
+    metadata_cache: defaultdict[Selector, MetadataCache]
+    message_store: MessageStore | None
+
+    def __init__(
+        self,
+        avilla: Avilla,
+        cache_size: int,
+        metadata_cache_size: int = 0,
+        metadata_cache_ttl: float = 0,
+        metadata_cache_ttls: dict[Any, float] | None = None,
+        message_cache_bytes: int = 64 * 1024 * 1024,
+        message_store: MessageStore | None = None,
+    ):
         self.avilla = avilla
+        self.message_store = message_store
+        self.enabled_cache_message = False
         if cache_size > 0:
             self.enabled_cache_message = True
-            self.message_cache = defaultdict(lambda: MessageCacheDeque(cache_size))
+            self.message_cache = MessageCache(cache_size, message_cache_bytes)
+        self.metadata_cache = defaultdict(
+            lambda: MetadataCache(metadata_cache_size, metadata_cache_ttl, metadata_cache_ttls)
+        )
+        self.enabled_cache_metadata = metadata_cache_size > 0 and (
+            metadata_cache_ttl > 0 or any(ttl > 0 for ttl in (metadata_cache_ttls or {}).values())
+        )
         super().__init__()
 
+    def get_metadata_cache(self, account_route: Selector) -> MetadataCache | None:
+        if self.enabled_cache_metadata:
+            return self.metadata_cache[account_route]
+
+    async def get_message(self, account_route: Selector, message: Selector) -> Message | None:
+        """依次从内存中的消息缓存和持久化的 message_store 中查找消息."""
+        if self.enabled_cache_message:
+            if (result := self.message_cache[account_route].get(message)) is not None:
+                return result
+        if self.message_store is not None and (result := await self.message_store.get(account_route, message)):
+            if self.enabled_cache_message:
+                self.message_cache[account_route].push(result)
+            return result
+
     @property
     def required(self) -> set[str]:
         return set()
@@ -59,6 +97,17 @@ class AvillaService(Service):
                     f"Using platform: {protocol.__class__}",
                     # alt=f"[magenta]Using platform: [/][dark_orange]{protocol.__class__.platform}[/]",
                 )
+                if (spec := get_lazy_merge(protocol.artifacts)) is not None and spec.records:
+                    logger.info(
+                        f"{protocol.__class__.__name__} imported {len(spec.records)} modules for performs "
+                        f"in {spec.import_time * 1e3:.1f}ms ({'lazy' if spec.lazy else 'eager'})"
+                    )
+                    logger.debug(format_import_records(spec.records))
+
+            if self.message_store is not None:
+                await self.message_store.open()
+
+            self.avilla.watchdog.start(self.avilla)
 
         await self.avilla.broadcast.postEvent(ApplicationReady(self.avilla))
 
@@ -68,4 +117,33 @@ class AvillaService(Service):
         async with self.stage("cleanup"):
             await self.avilla.broadcast.postEvent(ApplicationClosing(self.avilla))
 
+            for route, info in self.avilla.accounts.items():
+                flight = info.account.pull_flight
+                if flight.hits or flight.misses:
+                    logger.debug(
+                        f"{route}: {flight.hits} of {flight.hits + flight.misses} metadata pulls coalesced "
+                        f"({flight.hit_rate:.1%})"
+                    )
+
+            await self.avilla.event_pipeline.stop()
+            watchdog = self.avilla.watchdog
+            await watchdog.stop()
+            if watchdog.stalled:
+                logger.debug(f"event loop was blocked for more than {watchdog.threshold}s {watchdog.stalled} times")
+            logger.debug(f"event pipeline: {self.avilla.event_pipeline.describe()}")
+
+            if self.message_store is not None:
+                await self.message_store.close()
+
+            if (capture := self.avilla.event_capture) is not None:
+                capture.close()
+                logger.debug(f"captured {capture.written} events into {capture.path}")
+
+            if self.avilla.call_metrics is not None:
+                self.avilla.call_metrics.uninstall()
+
+            self.avilla.tracer.close()
+            if self.avilla.tracer.exported:
+                logger.debug(f"exported {self.avilla.tracer.exported} traces")
+
         await self.avilla.broadcast.postEvent(ApplicationClosed(self.avilla))
@@ -12,7 +12,7 @@ from typing_extensions import ParamSpec
 from avilla.core.account import BaseAccount
 from avilla.core.context import Context
 from avilla.core.event import MetadataModified
-from avilla.core.selector import Selectable, Selector
+from avilla.core.selector import FollowsPattern, Selectable, Selector, SelectorPatternSet
 from avilla.core.utilles import classproperty
 
 T = TypeVar("T", covariant=True)
@@ -106,8 +106,9 @@ class Filter(BaseDispatcher, Generic[T]):
         funcs = frozenset(funcs)
         return self.assert_true(lambda result: all(func(result) for func in funcs))
 
-    def follows(self: Filter[Selectable], *patterns: str) -> Filter[Selectable]:
-        return self.assert_true(lambda result: any(result.to_selector().follows(pattern) for pattern in patterns))
+    def follows(self: Filter[Selectable], *patterns: str | FollowsPattern) -> Filter[Selectable]:
+        pattern_set = SelectorPatternSet(patterns)
+        return self.assert_true(lambda result: pattern_set.any(result.to_selector()))
 
     @classproperty
     @classmethod
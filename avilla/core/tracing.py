@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import inspect
+import time
+from contextvars import ContextVar, Token
+from functools import wraps
+from itertools import count
+from pathlib import Path
+from random import random
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+
+from loguru import logger
+
+from avilla.core.codec import dumpb
+
+if TYPE_CHECKING:
+    from graia.broadcast import Broadcast
+
+    from avilla.core.event import AvillaEvent
+
+T = TypeVar("T", bound=Callable[..., Awaitable[Any]])
+
+_current_trace: ContextVar[Trace | None] = ContextVar("_current_trace", default=None)
+_current_span: ContextVar[int | None] = ContextVar("_current_span", default=None)
+_trace_ids = count(1)
+
+# perf_counter 是单调时钟, 导出到需要墙上时间的系统时以此换算.
+_WALL_OFFSET = time.time() - perf_counter()
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "parent", "attributes")
+
+    def __init__(
+        self, name: str, start: float, end: float | None, parent: int | None, attributes: dict[str, Any]
+    ) -> None:
+        self.name = name
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else perf_counter()) - self.start
+
+
+class _SpanScope:
+    __slots__ = ("trace", "index", "token")
+
+    def __init__(self, trace: Trace, index: int) -> None:
+        self.trace = trace
+        self.index = index
+
+    def __enter__(self):
+        self.trace.spans[self.index].start = perf_counter()
+        self.token = _current_span.set(self.index)
+        return self.trace.spans[self.index]
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.trace.spans[self.index]
+        span.end = perf_counter()
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self.token)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+NOOP_SCOPE = _NoopScope()
+
+
+class Trace:
+    """一个原始事件从接收到所有监听器执行完毕的记录.
+
+    trace 在所有持有者 (队列中的任务, 尚未执行完的监听器等) 释放后结束, 并交给 tracer 的 exporter.
+    """
+
+    id: str
+    spans: list[Span]
+    attributes: dict[str, Any]
+
+    def __init__(self, tracer: Tracer, source: str) -> None:
+        self.tracer = tracer
+        self.id = f"{next(_trace_ids):x}"
+        self.spans = [Span("receive", perf_counter(), None, None, {"source": source})]
+        self.attributes = {"source": source}
+        self.finished = False
+        self._holders = 1
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def span(self, name: str, /, **attributes: Any) -> _SpanScope | _NoopScope:
+        if self.finished:
+            return NOOP_SCOPE
+        self.spans.append(Span(name, 0.0, None, _current_span.get(0), attributes))
+        return _SpanScope(self, len(self.spans) - 1)
+
+    def add_span(self, name: str, start: float, end: float, /, **attributes: Any):
+        if not self.finished:
+            self.spans.append(Span(name, start, end, _current_span.get(0), attributes))
+
+    def hold(self):
+        self._holders += 1
+
+    def discard(self):
+        """放弃尚未交出的 trace (原始数据不是事件, 如 action 的响应); 不会交给 exporter."""
+        if not self.finished:
+            self.finished = True
+            self.tracer.discarded += 1
+
+    def release(self):
+        self._holders -= 1
+        if self._holders <= 0 and not self.finished:
+            self.finished = True
+            self.root.end = perf_counter()
+            self.tracer.export(self)
+
+    def traced_post(self, event: AvillaEvent, post: Callable[[AvillaEvent], Awaitable[Any]]):
+        """包装 post, 记录事件自交给 broadcast 到所有监听器执行完毕的耗时; trace 会持续到此时才结束."""
+        self.attributes.setdefault("event", event.__class__.__name__)
+        if (context := getattr(event, "context", None)) is not None:
+            context.trace = self
+        self.hold()
+        parent = _current_span.get(0)
+
+        def wrapper(event: AvillaEvent):
+            started = perf_counter()
+            try:
+                result = post(event)
+            except BaseException:
+                self.release()
+                raise
+            if not hasattr(result, "add_done_callback"):
+                self.release()
+                return result
+
+            def done(_):
+                attributes = {"event": event.__class__.__name__}
+                self.spans.append(Span("dispatch", started, perf_counter(), parent, attributes))
+                self.release()
+
+            result.add_done_callback(done)  # type: ignore
+            return result
+
+        return wrapper
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def span(name: str, /, **attributes: Any) -> _SpanScope | _NoopScope:
+    """在当前 trace 中记录一个 span; 当前没有 trace (未被抽样或未启用) 时什么也不做."""
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SCOPE
+    return trace.span(name, **attributes)
+
+
+def traced(name: str, *attribute_names: str) -> Callable[[T], T]:
+    """把异步函数的每次调用记录为当前 trace 中的 span, attribute_names 中的参数会作为 span 的属性."""
+
+    def decorator(func: T) -> T:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return await func(*args, **kwargs)
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            with trace.span(name, **{key: arguments.get(key) for key in attribute_names}):
+                return await func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def use_trace(trace: Trace | None) -> Token[Trace | None]:
+    return _current_trace.set(trace)
+
+
+def reset_trace(token: Token[Trace | None]):
+    _current_trace.reset(token)
+
+
+def discard_trace():
+    """放弃当前 trace; 用于接收到的原始数据不会交给 `EventPipeline.put` 的情况."""
+    trace = _current_trace.get()
+    if trace is not None:
+        _current_trace.set(None)
+        trace.discard()
+
+
+def detach_trace() -> Trace | None:
+    """取出当前 trace 并将其从当前上下文中移除, 由调用方负责之后的 `Trace.release`."""
+    trace = _current_trace.get()
+    if trace is not None:
+        _current_trace.set(None)
+    return trace
+
+
+class TraceExporter:
+    def export(self, trace: Trace):
+        raise NotImplementedError
+
+    def close(self):
+        ...
+
+
+class LogExporter(TraceExporter):
+    def __init__(self, level: str = "DEBUG") -> None:
+        self.level = level
+
+    def export(self, trace: Trace):
+        logger.log(self.level, "{}", format_trace(trace))
+
+
+class JSONLExporter(TraceExporter):
+    """每个 trace 一行 JSON, 时间以秒为单位, span 的 start 为相对于 trace 开始的偏移."""
+
+    def __init__(self, path: str | Path, batch_size: int = 64) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._buffer: list[bytes] = []
+
+    def export(self, trace: Trace):
+        self._buffer.append(dumpb(trace_to_dict(trace)))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            f.write(b"\n".join(batch) + b"\n")
+
+    def close(self):
+        self.flush()
+
+
+class OpenTelemetryExporter(TraceExporter):
+    """通过 opentelemetry-api 重放 span; 需要事先配置好 TracerProvider."""
+
+    def __init__(self, name: str = "avilla") -> None:
+        from opentelemetry import trace as otel_trace
+
+        self._otel = otel_trace
+        self._tracer = otel_trace.get_tracer(name)
+
+    def export(self, trace: Trace):
+        otel_spans = []
+        for item in trace.spans:
+            parent = otel_spans[item.parent] if item.parent is not None else None
+            otel_span = self._tracer.start_span(
+                item.name,
+                context=self._otel.set_span_in_context(parent) if parent is not None else None,
+                attributes={k: str(v) for k, v in (trace.attributes if parent is None else item.attributes).items()},
+                start_time=int((item.start + _WALL_OFFSET) * 1e9),
+            )
+            otel_spans.append(otel_span)
+        for item, otel_span in zip(trace.spans, otel_spans):
+            otel_span.end(end_time=int(((item.end or item.start) + _WALL_OFFSET) * 1e9))
+
+
+def trace_to_dict(trace: Trace) -> dict[str, Any]:
+    origin = trace.root.start
+    return {
+        "id": trace.id,
+        "time": origin + _WALL_OFFSET,
+        "duration": trace.root.duration,
+        "attributes": trace.attributes,
+        "spans": [
+            {
+                "name": item.name,
+                "start": item.start - origin,
+                "duration": item.duration,
+                "parent": item.parent,
+                "attributes": item.attributes,
+            }
+            for item in trace.spans[1:]
+        ],
+    }
+
+
+def format_trace(trace: Trace) -> str:
+    parts = []
+    for item in trace.spans[1:]:
+        label = item.name
+        if item.attributes:
+            label += f"({', '.join(str(v) for v in item.attributes.values())})"
+        parts.append(f"{label} {item.duration * 1e3:.2f}")
+    return (
+        f"[trace {trace.id}] {trace.attributes['source']} {trace.attributes.get('event', '-')} "
+        f"{trace.root.duration * 1e3:.2f}ms | " + " | ".join(parts)
+    )
+
+
+class Tracer:
+    """按 sample 的比例为协议收到的原始事件创建 trace.
+
+    sample 为 0 (默认) 时不会创建任何 trace, 各处的 `span` 只多一次 ContextVar 的读取;
+    未指定 exporter 时使用 `LogExporter`.
+    """
+
+    def __init__(self, exporter: TraceExporter | None = None, *, sample: float = 0.0) -> None:
+        self.exporter = exporter or LogExporter()
+        self.sample = sample
+        self.exported = 0
+        self.discarded = 0
+
+    def start(self, source: str) -> Trace | None:
+        """开始一个 trace 并设为当前 trace; 未被抽样时清除当前 trace 并返回 None.
+
+        当前仍有 trace 时, 说明上一份原始数据没有交给 `EventPipeline.put`, 该 trace 会被放弃.
+        """
+        if not self.sample:
+            return
+        discard_trace()
+        trace = Trace(self, source) if self.sample >= 1 or random() < self.sample else None
+        _current_trace.set(trace)
+        return trace
+
+    def receive(self, source: str) -> _SpanScope | _NoopScope:
+        """用于包裹原始数据的解码: 开始一个 trace, 并把解码记录为其中的 decode span."""
+        trace = self.start(source)
+        if trace is None:
+            return NOOP_SCOPE
+        return trace.span("decode")
+
+    def export(self, trace: Trace):
+        self.exported += 1
+        try:
+            self.exporter.export(trace)
+        except Exception:
+            logger.exception(f"failed to export trace {trace.id}")
+
+    def install(self, broadcast: Broadcast):
+        """为 broadcast 中每个监听器的执行记录 listener span."""
+        from graia.broadcast.entities.listener import Listener
+
+        executor = broadcast.Executor
+
+        async def traced_executor(target, *args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None or kwargs.get("depth") or not isinstance(target, Listener):
+                return await executor(target, *args, **kwargs)
+            with trace.span("listener", target=getattr(target.callable, "__qualname__", repr(target.callable))):
+                return await executor(target, *args, **kwargs)
+
+        broadcast.Executor = traced_executor  # monkey patch
+
+    def close(self):
+        self.exporter.close()
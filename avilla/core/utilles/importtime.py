@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import builtins
+import importlib
+import sys
+from dataclasses import dataclass
+from importlib.util import resolve_name
+from time import perf_counter
+from types import ModuleType
+from typing import Any
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+class ImportTimer:
+    """在 with 块内统计模块导入耗时, 输出与 `python -X importtime` 相同形式的明细.
+
+    只统计真正执行了模块代码的导入; 已在 sys.modules 中的模块直接放行.
+    """
+
+    records: list[ImportRecord]
+
+    def __init__(self) -> None:
+        self.records = []
+        self._children: list[float] = []
+
+    def __enter__(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.__import__ = self._original
+
+    @property
+    def total(self) -> float:
+        return sum(record.cumulative for record in self.records if record.depth == 0)
+
+    def import_module(self, name: str) -> ModuleType:
+        if name in sys.modules:
+            return sys.modules[name]
+        return self._measure([name], importlib.import_module, name)
+
+    def _import(self, name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0):
+        original = self._original
+        try:
+            absolute = resolve_name("." * level + name, (globals or {}).get("__package__")) if level else name
+        except (ImportError, ValueError):
+            return original(name, globals, locals, fromlist, level)
+
+        targets = [] if absolute in sys.modules else [absolute]
+        for item in fromlist or ():
+            if item != "*" and (submodule := f"{absolute}.{item}") not in sys.modules:
+                targets.append(submodule)
+
+        if not targets:
+            return original(name, globals, locals, fromlist, level)
+        return self._measure(targets, original, name, globals, locals, fromlist, level)
+
+    def _measure(self, targets: list[str], func, *args):
+        self._children.append(0.0)
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            if loaded := [target for target in targets if target in sys.modules]:
+                self.records.append(ImportRecord(", ".join(loaded), elapsed - children, elapsed, len(self._children)))
+
+
+def format_import_records(records: list[ImportRecord]) -> str:
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for record in records:
+        lines.append(
+            f"import time: {record.self_time * 1e6:>9.0f} | {record.cumulative * 1e6:>10.0f} | "
+            f"{'  ' * record.depth}{record.module}"
+        )
+    return "\n".join(lines)
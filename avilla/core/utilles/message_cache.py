@@ -1,25 +1,174 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import TYPE_CHECKING
-from weakref import WeakValueDictionary
+import sys
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from avilla.core.message import Message
     from avilla.core.selector import Selector
 
+MESSAGE_OVERHEAD = 512
 
-class MessageCacheDeque:
-    messages: deque[Message]
-    _endpoint: WeakValueDictionary[Selector, Message]
 
-    def __init__(self, cache_size: int) -> None:
-        self.messages = deque(maxlen=cache_size)
-        self._endpoint = WeakValueDictionary()
+def estimate_size(message: Message) -> int:
+    """粗略估计一条消息占用的内存; 只用于控制缓存总量, 不追求精确."""
+    return MESSAGE_OVERHEAD + sys.getsizeof(str(message.content))
+
+
+class _Entry:
+    __slots__ = ("message", "account", "selector", "size", "alive")
+
+    def __init__(self, message: Message, account: Selector, size: int) -> None:
+        self.message = message
+        self.account = account
+        self.selector = message.to_selector()
+        self.size = size
+        self.alive = True
+
+
+class MessageCache:
+    """所有账号共用的消息缓存.
+
+    每个 (账号, 场景) 保留至多 scene_size 条消息, 可按消息 selector, 场景和发送者查找;
+    估计占用超过 max_bytes 时, 整个淘汰最久没有新消息的场景.
+    """
+
+    max_bytes: int
+    scene_size: int
+    total_bytes: int
+
+    def __init__(self, scene_size: int, max_bytes: int) -> None:
+        self.scene_size = scene_size
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._messages: dict[tuple[Selector, Selector], _Entry] = {}
+        self._scenes: OrderedDict[tuple[Selector, Selector], deque[_Entry]] = OrderedDict()
+        self._senders: dict[tuple[Selector, Selector], deque[_Entry]] = {}
+        self._accounts: dict[Selector, AccountMessageCache] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, account: Selector) -> AccountMessageCache:
+        if (view := self._accounts.get(account)) is None:
+            view = self._accounts[account] = AccountMessageCache(self, account)
+        return view
+
+    def __contains__(self, account: Selector) -> bool:
+        return account in self._accounts or any(key[0] == account for key in self._scenes)
+
+    def __delitem__(self, account: Selector):
+        self._accounts.pop(account, None)
+        for key in [key for key in self._scenes if key[0] == account]:
+            self._drop_scene(key)
+
+    def push(self, account: Selector, message: Message):
+        entry = _Entry(message, account, estimate_size(message))
+        if (previous := self._messages.get((account, entry.selector))) is not None:
+            self._discard(previous)
+
+        scene_key = (account, message.scene)
+        scene = self._scenes.get(scene_key)
+        if scene is None:
+            scene = self._scenes[scene_key] = deque()
+        else:
+            self._scenes.move_to_end(scene_key)
+        while scene and len(scene) >= self.scene_size:
+            self._discard(scene.popleft())
+        scene.append(entry)
+
+        sender_key = (account, message.sender)
+        sender = self._senders.get(sender_key)
+        if sender is None:
+            sender = self._senders[sender_key] = deque(maxlen=self.scene_size)
+        sender.append(entry)
+
+        self._messages[(account, entry.selector)] = entry
+        self.total_bytes += entry.size
+        self._shrink(scene_key)
+
+    def get(self, account: Selector, message: Selector) -> Message | None:
+        if (entry := self._messages.get((account, message))) is not None:
+            return entry.message
+
+    def recent(self, account: Selector, scene: Selector, count: int | None = None) -> list[Message]:
+        entries = self._scenes.get((account, scene), ())
+        messages = [entry.message for entry in entries if entry.alive]
+        return messages if count is None else messages[-count:] if count > 0 else []
+
+    def by_sender(self, account: Selector, sender: Selector, count: int | None = None) -> list[Message]:
+        entries = self._senders.get((account, sender), ())
+        messages = [entry.message for entry in entries if entry.alive]
+        return messages if count is None else messages[-count:] if count > 0 else []
+
+    def between(
+        self, account: Selector, scene: Selector, start: datetime | None = None, end: datetime | None = None
+    ) -> list[Message]:
+        return [
+            message
+            for message in self._iter_scene(account, scene)
+            if (start is None or message.time >= start) and (end is None or message.time <= end)
+        ]
+
+    def _iter_scene(self, account: Selector, scene: Selector) -> Iterator[Message]:
+        for entry in self._scenes.get((account, scene), ()):
+            if entry.alive:
+                yield entry.message
+
+    def _discard(self, entry: _Entry):
+        if not entry.alive:
+            return
+        entry.alive = False
+        self.total_bytes -= entry.size
+        if self._messages.get((entry.account, entry.selector)) is entry:
+            del self._messages[(entry.account, entry.selector)]
+
+        sender_key = (entry.account, entry.message.sender)
+        if (sender := self._senders.get(sender_key)) is not None:
+            while sender and not sender[0].alive:
+                sender.popleft()
+            if not sender:
+                del self._senders[sender_key]
+
+    def _drop_scene(self, key: tuple[Selector, Selector]):
+        for entry in self._scenes.pop(key):
+            self._discard(entry)
+
+    def _shrink(self, current: tuple[Selector, Selector]):
+        while self.total_bytes > self.max_bytes and self._scenes:
+            key = next(iter(self._scenes))
+            if key != current:
+                self._drop_scene(key)
+                continue
+            # 只剩下正在写入的场景时, 从它最旧的消息开始淘汰.
+            scene = self._scenes[key]
+            while self.total_bytes > self.max_bytes and len(scene) > 1:
+                self._discard(scene.popleft())
+            break
+
+
+class AccountMessageCache:
+    """MessageCache 中属于某个账号的部分."""
+
+    __slots__ = ("cache", "account")
+
+    def __init__(self, cache: MessageCache, account: Selector) -> None:
+        self.cache = cache
+        self.account = account
 
     def push(self, message: Message):
-        self.messages.append(message)
-        self._endpoint[message.to_selector()] = message
+        self.cache.push(self.account, message)
 
     def get(self, message_selector: Selector):
-        return self._endpoint.get(message_selector)
+        return self.cache.get(self.account, message_selector)
+
+    def recent(self, scene: Selector, count: int | None = None):
+        return self.cache.recent(self.account, scene, count)
+
+    def by_sender(self, sender: Selector, count: int | None = None):
+        return self.cache.by_sender(self.account, sender, count)
+
+    def between(self, scene: Selector, start: datetime | None = None, end: datetime | None = None):
+        return self.cache.between(self.account, scene, start, end)
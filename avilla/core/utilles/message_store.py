@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import pickle
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from loguru import logger
+
+from avilla.core.context import ContextSelector
+from avilla.core.selector import Selector
+
+from .store import get_cache_dir
+
+if TYPE_CHECKING:
+    from avilla.core.message import Message
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    account TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    time REAL NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (account, selector)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS messages_time ON messages (time);
+"""
+
+
+def selector_key(selector: Selector) -> str:
+    return "\x1f".join(f"{k}\x1e{v}" for k, v in selector.pattern.items())
+
+
+class _MessagePickler(pickle.Pickler):
+    # 消息中的 Notice, Reference 等元素可能持有 ContextSelector, 存储时转为普通 Selector.
+    def reducer_override(self, obj):
+        if isinstance(obj, ContextSelector):
+            return Selector, (dict(obj.pattern),)
+        return NotImplemented
+
+
+def dumps_message(message: Message) -> bytes:
+    buffer = io.BytesIO()
+    _MessagePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(message)
+    return buffer.getvalue()
+
+
+def default_store_path() -> Path:
+    return get_cache_dir("avilla") / "messages.sqlite3"
+
+
+class MessageStore:
+    """持久化在 SQLite (WAL) 中的消息缓存, 作为内存中 MessageCache 之下的一层.
+
+    写入先在内存中积攒, 每 flush_interval 秒或满 batch_size 条时在专用线程中批量写入;
+    每 compact_interval 秒删除早于 max_age 秒的消息, 并只保留最新的 max_messages 条.
+    消息以 pickle 存储, 因此只应指向受信任的本地路径.
+    """
+
+    path: Path
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_age: float = 7 * 24 * 3600,
+        max_messages: int = 200_000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        compact_interval: float = 3600,
+    ) -> None:
+        self.path = path or default_store_path()
+        self.max_age = max_age
+        self.max_messages = max_messages
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+
+        self._pending: list[tuple[str, str, float, bytes]] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def opened(self) -> bool:
+        return self._executor is not None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            raise RuntimeError("message store is not opened")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def open(self):
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="avilla-message-store")
+        await self._run(self._connect)
+        await self.compact()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        if self._executor is None:
+            return
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await self._run(self._disconnect)
+        self._executor.shutdown()
+        self._executor = None
+
+    def put(self, account: Selector, message: Message):
+        try:
+            data = dumps_message(message)
+        except Exception as e:
+            logger.warning(f"message {message.to_selector()} is not persisted: {e!r}")
+            return
+        self._pending.append(
+            (selector_key(account), selector_key(message.to_selector()), message.time.timestamp(), data)
+        )
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def get(self, account: Selector, message: Selector) -> Message | None:
+        account_key, message_key = selector_key(account), selector_key(message)
+        for record in reversed(self._pending):
+            if record[0] == account_key and record[1] == message_key:
+                return pickle.loads(record[3])
+        if self._executor is None:
+            return
+        data = await self._run(self._select, account_key, message_key)
+        if data is not None:
+            return pickle.loads(data)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        await self._run(self._insert, batch)
+
+    async def compact(self):
+        removed = await self._run(self._compact, time.time() - self.max_age, self.max_messages)
+        if removed:
+            logger.debug(f"compacted {removed} messages from {self.path}")
+
+    async def _writer(self):
+        assert self._wakeup is not None
+        last_compact = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - last_compact >= self.compact_interval:
+                    await self.compact()
+                    last_compact = time.monotonic()
+            except sqlite3.Error as e:
+                logger.warning(f"failed to write message store {self.path}: {e!r}")
+
+    # 以下方法只在 executor 的线程中执行.
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        self._connection = connection
+
+    def _disconnect(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _insert(self, batch: list[tuple[str, str, float, bytes]]):
+        assert self._connection is not None
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?)", batch)
+
+    def _select(self, account: str, selector: str) -> bytes | None:
+        assert self._connection is not None
+        row = self._connection.execute(
+            "SELECT data FROM messages WHERE account = ? AND selector = ?", (account, selector)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _compact(self, before: float, keep: int) -> int:
+        assert self._connection is not None
+        with self._connection:
+            removed = self._connection.execute("DELETE FROM messages WHERE time < ?", (before,)).rowcount
+            if keep > 0:
+                removed += self._connection.execute(
+                    "DELETE FROM messages WHERE time < (SELECT time FROM messages ORDER BY time DESC LIMIT 1 OFFSET ?)",
+                    (keep - 1,),
+                ).rowcount
+        if removed:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
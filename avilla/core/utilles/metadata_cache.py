@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Mapping
+
+from avilla.core.selector import Selector
+
+if TYPE_CHECKING:
+    from avilla.core.metadata import Metadata, MetadataRoute
+
+    Route = type[Metadata] | MetadataRoute[Any]
+
+
+def _normalize(target: Selector) -> Selector:
+    # ContextSelector 与普通 Selector 互不相等, 作为键时还会让缓存持有整个 Context.
+    return target if type(target) is Selector else Selector(target.pattern)
+
+
+class MetadataCache:
+    """账号级别的 metadata 缓存, 以 (selector, route) 为键; selector 一律按普通 `Selector` 存放.
+
+    条目在 route 对应的 TTL 后过期 (未单独指定时使用 default_ttl, TTL 不大于 0 表示不缓存该 route);
+    条目数超过 maxsize 时淘汰最久未使用的条目.
+    """
+
+    maxsize: int
+    default_ttl: float
+    ttls: dict[Any, float]
+    hits: int
+    misses: int
+    _entries: OrderedDict[tuple[Selector, Any], tuple[float, Metadata]]
+
+    def __init__(self, maxsize: int, default_ttl: float, ttls: Mapping[Any, float] | None = None) -> None:
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple[Selector, Route]) -> bool:
+        entry = self._entries.get((_normalize(key[0]), key[1]))
+        return entry is not None and entry[0] > monotonic()
+
+    def get(self, target: Selector, route: Route) -> Metadata | None:
+        key = (_normalize(target), route)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return
+
+        expires, value = entry
+        if expires <= monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, target: Selector, route: Route, value: Metadata):
+        ttl = self.ttls.get(route, self.default_ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        key = (_normalize(target), route)
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def update(self, target: Selector, metadatas: Mapping[Any, Metadata]):
+        target = _normalize(target)
+        for route, value in metadatas.items():
+            if not route.has_params():
+                self.set(target, route, value)
+
+    def invalidate(self, target: Selector, route: Route | None = None):
+        target = _normalize(target)
+        if route is not None:
+            self._entries.pop((target, route), None)
+            return
+
+        for key in [key for key in self._entries if key[0] == target]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
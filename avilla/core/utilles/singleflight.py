@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K]):
+    """合并同一 key 的并发调用: 进行中的调用完成前, 后到的调用直接等待它的结果.
+
+    调用以独立的 Task 运行, 单个等待者被取消不会影响其他等待者.
+    """
+
+    hits: int
+    misses: int
+    _flights: dict[K, asyncio.Future[Any]]
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._flights = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._flights)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def do(self, key: K, func: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            self.misses += 1
+            flight = self._flights[key] = asyncio.ensure_future(func())
+            flight.add_done_callback(lambda fut: self._finish(key, fut))
+        else:
+            self.hits += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: K, flight: asyncio.Future[Any]):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # 所有等待者都已离开时, 避免 "exception was never retrieved".
+            flight.exception()
+
+    def stats(self) -> dict[str, float]:
+        return {"hits": self.hits, "misses": self.misses, "inflight": self.inflight, "hit_rate": self.hit_rate}
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from avilla.core.application import Avilla
+    from avilla.core.metrics import Counter, Gauge, Histogram
+
+
+@dataclass
+class Stall:
+    """一次事件循环阻塞; event 与 listener 为阻塞时正在处理的事件与监听器 (解析原始事件时 listener 为 `parse`)."""
+
+    time: float
+    lag: float
+    task: str | None = None
+    event: str | None = None
+    listener: str | None = None
+    stack: str = ""
+
+    @property
+    def location(self) -> str:
+        if self.listener is None:
+            return self.task or "a callback"
+        return f"{self.listener} ({self.event})" if self.event else self.listener
+
+
+class LoopWatchdog:
+    """持续测量事件循环的延迟, 并找出阻塞事件循环的代码.
+
+    事件循环中的心跳每 interval 秒记录一次时间; 另有一个线程检查心跳, 心跳停滞超过 threshold 秒时,
+    抓取事件循环所在线程当前的调用栈, 以及正在运行的 Task 对应的事件与监听器.
+    事件循环恢复后, 阻塞的时长, 位置与调用栈会以 warning 输出, 并记入 `Avilla.metrics`,
+    最近的 history 次阻塞保存在 `stalls` 中, 总次数为 `stalled`.
+
+    由 `AvillaService` 在启动时开启; 不需要时可以传入 `LoopWatchdog(enabled=False)`.
+    """
+
+    stalls: deque[Stall]
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        *,
+        stack_limit: int = 16,
+        history: int = 64,
+        enabled: bool = True,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.stack_limit = stack_limit
+        self.enabled = enabled
+        self.stalls = deque(maxlen=history)
+        self.stalled = 0
+
+        self._avilla: Avilla | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._beat = 0.0
+        self._captured_beat = 0.0
+        self._captured: tuple[float, Stall] | None = None
+        self._listeners: dict[asyncio.Task, tuple[str, str]] = {}
+        self._heartbeat_task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+        self._lag: Histogram | None = None
+        self._last_lag: Gauge | None = None
+        self._stall_count: Counter | None = None
+        self._stall_time: Counter | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def start(self, avilla: Avilla):
+        if not self.enabled or self.running:
+            return
+        self._avilla = avilla
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._install(avilla)
+
+        registry = avilla.metrics
+        self._lag = registry.histogram("event_loop_lag_seconds", "delay of scheduled callbacks on the event loop")
+        self._last_lag = registry.gauge("event_loop_lag_last_seconds", "most recent event loop delay")
+        self._stall_count = registry.counter(
+            "event_loop_stalls_total",
+            "times the event loop was blocked longer than the threshold",
+            ("event", "listener"),
+        )
+        self._stall_time = registry.counter(
+            "event_loop_stalled_seconds_total", "time the event loop spent blocked", ("event", "listener")
+        )
+
+        self._beat = perf_counter()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name="avilla-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._heartbeat_task is None:
+            return
+        self._stopped.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+            self._thread = None
+
+    def _install(self, avilla: Avilla):
+        """在 broadcast 中记录每个 Task 正在执行的监听器, 供阻塞时查找."""
+        if getattr(avilla.broadcast, "_avilla_watchdog", None) is self:
+            return
+        from graia.broadcast.entities.listener import Listener
+
+        broadcast = avilla.broadcast
+        executor = broadcast.Executor
+        listeners = self._listeners
+
+        async def watched_executor(target, *args, **kwargs):
+            if kwargs.get("depth") or not isinstance(target, Listener):
+                return await executor(target, *args, **kwargs)
+            task = asyncio.current_task()
+            assert task is not None
+            event = broadcast.event_ctx.get()
+            listeners[task] = (
+                event.__class__.__name__ if event is not None else "",
+                getattr(target.callable, "__qualname__", repr(target.callable)),
+            )
+            try:
+                return await executor(target, *args, **kwargs)
+            finally:
+                listeners.pop(task, None)
+
+        broadcast.Executor = watched_executor  # monkey patch
+        broadcast._avilla_watchdog = self  # type: ignore
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = beat = perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(perf_counter() - beat - self.interval, 0.0)
+            if self._lag is not None and self._last_lag is not None:
+                self._lag.observe(lag)
+                self._last_lag.set(lag)
+            if lag >= self.threshold:
+                self._report(beat, lag)
+
+    def _watch(self):
+        poll = min(self.interval, self.threshold / 2)
+        while not self._stopped.wait(poll):
+            beat = self._beat
+            if beat == self._captured_beat or perf_counter() - beat - self.interval < self.threshold:
+                continue
+            self._captured_beat = beat
+            try:
+                self._captured = (beat, self._capture(beat))
+            except Exception:
+                logger.exception("loop watchdog failed to capture the blocked stack")
+
+    def _capture(self, beat: float) -> Stall:
+        # 在监视线程中执行; 事件循环所在线程此时正被阻塞.
+        stall = Stall(time.time(), perf_counter() - beat - self.interval)
+        frame = sys._current_frames().get(self._loop_thread)  # type: ignore
+        if frame is not None:
+            stall.stack = "".join(traceback.format_stack(frame, self.stack_limit))
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return stall
+        stall.task = task.get_name()
+        if (listener := self._listeners.get(task)) is not None:
+            stall.event, stall.listener = listener
+        elif self._avilla is not None and (job := self._avilla.event_pipeline.active.get(task)) is not None:
+            stall.event, stall.listener = job.kind, "parse"
+        return stall
+
+    def _report(self, beat: float, lag: float):
+        captured, self._captured = self._captured, None
+        if captured is not None and captured[0] == beat:
+            stall = captured[1]
+        else:
+            # 阻塞时间太短, 监视线程没来得及抓取.
+            stall = Stall(time.time(), lag)
+        stall.lag = lag
+        self.stalls.append(stall)
+        self.stalled += 1
+
+        labels = (stall.event or "", stall.listener or "")
+        if self._stall_count is not None and self._stall_time is not None:
+            self._stall_count.inc(labels)
+            self._stall_time.inc(labels, lag)
+        message = f"event loop was blocked for {lag * 1e3:.0f}ms in {stall.location}"
+        if stall.stack:
+            message += f", stack when blocked:\n{stall.stack.rstrip()}"
+        logger.warning(message)
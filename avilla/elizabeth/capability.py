@@ -6,6 +6,7 @@ from graia.amnesia.message import Element, MessageChain
 
 from avilla.core.event import AvillaEvent
 from avilla.core.ryanvk.collector.application import ApplicationCollector
+from avilla.core.tracing import span
 from graia.ryanvk import Fn, PredicateOverload, TypeOverload
 
 if TYPE_CHECKING:
@@ -28,8 +29,9 @@ class ElizabethCapability((m := ApplicationCollector())._):
     async def deserialize_chain(self, chain: list[dict]):
         elements = []
 
-        for raw_element in chain:
-            elements.append(await self.deserialize_element(raw_element))
+        with span("deserialize_chain"):
+            for raw_element in chain:
+                elements.append(await self.deserialize_element(raw_element))
 
         return MessageChain(elements)
 
@@ -42,8 +44,9 @@ class ElizabethCapability((m := ApplicationCollector())._):
         return elements
 
     async def handle_event(self, event: dict):
-        maybe_event = await self.event_callback(event)
+        with span("event_callback"):
+            maybe_event = await self.event_callback(event)
 
         if maybe_event is not None:
             self.avilla.event_record(maybe_event)
-            self.avilla.broadcast.postEvent(maybe_event)
+            self.avilla.event_pipeline.dispatch(maybe_event, self.avilla.broadcast.postEvent)
@@ -10,6 +10,7 @@ from typing_extensions import Self
 from avilla.core.exceptions import InvalidAuthentication
 from avilla.core.ryanvk.staff import Staff
 from avilla.core.selector import Selector
+from avilla.core.tracing import discard_trace, traced
 from avilla.elizabeth.capability import ElizabethCapability
 from avilla.standard.core.account import AccountAvailable
 
@@ -34,6 +35,7 @@ class ElizabethNetworking:
     def __init__(self, protocol: ElizabethProtocol):
         super().__init__()
         self.protocol = protocol
+        self._staff = None
         self.response_waiters = {}
         self.close_signal = asyncio.Event()
 
@@ -45,7 +47,10 @@ class ElizabethNetworking:
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     def message_receive(self) -> AsyncIterator[tuple[Self, dict]]:
         ...
@@ -81,6 +86,7 @@ class ElizabethNetworking:
                 continue
 
             if sync_id in self.response_waiters:
+                discard_trace()
                 self.response_waiters[sync_id].set_result(body)
                 continue
 
@@ -95,12 +101,17 @@ class ElizabethNetworking:
 
                 logger.warning(f"received unsupported event {event_type}: {data}")
 
-            asyncio.create_task(event_parse_task(body))
+            if (capture := self.protocol.avilla.event_capture) is not None:
+                capture.write("elizabeth", body, account=str(self.account_id))
+            await self.protocol.avilla.event_pipeline.put(
+                event_parse_task, body, kind=body["type"], source="elizabeth"
+            )
 
     async def connection_closed(self):
         self.session_key = None
         self.close_signal.set()
 
+    @traced("call", "method", "action")
     async def call(
         self,
         method: CallMethod,
@@ -46,7 +46,7 @@ def validate_response(data: Any, raising: Literal[True] = True) -> Any:
 def validate_response(data: dict, raising: bool = True):
     int_code = data.get("code") if isinstance(data, dict) else data
     if not isinstance(int_code, int) or int_code == 200 or int_code == 0:
-        return data.get("data", data)
+        return data.get("data", data) if isinstance(data, dict) else data
     exc_cls = code_exceptions_mapping.get(int_code)
     exc = exc_cls(exc_cls.__doc__, data) if exc_cls else UnknownError(data)
     if raising:
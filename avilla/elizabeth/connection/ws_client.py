@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from contextlib import suppress
 from typing import TYPE_CHECKING, cast
 
@@ -12,7 +11,10 @@ from launart.utilles import any_completed
 from loguru import logger
 
 from avilla.core.account import AccountInfo
+from avilla.core.codec import dumps, loads, loads_body
+from avilla.core.metrics import count_reconnect
 from avilla.core.selector import Selector
+from avilla.core.tracing import traced
 from avilla.elizabeth.account import ElizabethAccount
 from avilla.elizabeth.connection.base import CallMethod
 from avilla.elizabeth.const import PLATFORM
@@ -50,8 +52,9 @@ class ElizabethWsClientNetworking(ElizabethNetworking, Service):
             if msg.type in {aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED}:
                 self.close_signal.set()
                 break
-            elif msg.type == aiohttp.WSMsgType.TEXT:
-                data: dict = json.loads(cast(str, msg.data))
+            elif msg.type in {aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY}:
+                with self.protocol.avilla.tracer.receive("elizabeth"):
+                    data: dict = loads(msg.data)
                 yield self, data
         else:
             await self.connection_closed()
@@ -60,18 +63,19 @@ class ElizabethWsClientNetworking(ElizabethNetworking, Service):
         if self.connection is None:
             raise RuntimeError("connection is not established")
 
-        await self.connection.send_json(payload)
+        await self.connection.send_str(dumps(payload))
 
+    @traced("call_http", "method", "action")
     async def call_http(self, method: CallMethod, action: str, params: dict | None = None) -> dict:
         action = action.replace("_", "/")
         if method in {"get", "fetch"}:
             async with self.session.get((self.config.base_url / action).with_query(params or {})) as resp:
-                result = await resp.json()
+                result = loads_body(await resp.read())
                 return validate_response(result)
 
         if method in {"post", "update"}:
             async with self.session.post((self.config.base_url / action), json=params or {}) as resp:
-                result = await resp.json()
+                result = loads_body(await resp.read())
                 return validate_response(result)
 
         if method == "multipart":
@@ -85,7 +89,7 @@ class ElizabethWsClientNetworking(ElizabethNetworking, Service):
                     data.add_field(k, v)
 
             async with self.session.post((self.config.base_url / action), data=data) as resp:
-                result = await resp.json()
+                result = loads_body(await resp.read())
                 return validate_response(result)
 
         raise ValueError(f"Unknown method {method}")
@@ -159,12 +163,13 @@ class ElizabethWsClientNetworking(ElizabethNetworking, Service):
                     del self.protocol.service.account_map[self.config.qq]
                     del self.protocol.avilla.accounts[account_route]
                 await asyncio.sleep(5)
+                count_reconnect(self.protocol.avilla.metrics, "elizabeth")
                 logger.info(f"{self} Reconnecting...")
                 continue
 
     async def launch(self, manager: Launart):
         async with self.stage("preparing"):
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(json_serialize=dumps)
 
         async with self.stage("blocking"):
             await self.connection_daemon(manager, self.session)
@@ -192,6 +192,23 @@ class ElizabethGroupMemberActionPerform((m := AccountCollector["ElizabethProtoco
             PRIVILEGE_LEVEL[self_info["permission"]] > PRIVILEGE_LEVEL[target_info["permission"]],
         )
 
+    @m.pull_many("land.group.member", Privilege)
+    async def get_group_member_privileges(
+        self, target: Selector, route: ..., targets: list[Selector]
+    ) -> dict[Selector, Privilege]:
+        result = await self.account.connection.call("fetch", "memberList", {"target": int(target.pattern["group"])})
+        members = {str(i["id"]): i for i in result}
+        privileges = {}
+        for i in targets:
+            if i.pattern["member"] == self.account.route["account"]:
+                privileges[i] = Privilege(True, True)
+            elif (member := members.get(i.pattern["member"])) is not None:
+                privileges[i] = Privilege(
+                    PRIVILEGE_LEVEL[member["permission"]] > 0,
+                    PRIVILEGE_LEVEL[member["group"]["permission"]] > PRIVILEGE_LEVEL[member["permission"]],
+                )
+        return privileges
+
     @m.pull("land.group.member", Privilege >> Summary)
     async def get_group_member_privilege_summary(self, target: Selector, route: ...) -> Summary:
         target_info = await self.account.connection.call(
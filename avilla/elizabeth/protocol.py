@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from yarl import URL
 
 from avilla.core.application import Avilla
 from avilla.core.protocol import BaseProtocol, ProtocolConfig
-from graia.ryanvk import merge, ref
+from avilla.core.ryanvk.lazy import lazy_merge
+from graia.ryanvk import ref
 
 from .connection.ws_client import ElizabethWsClientNetworking
 from .service import ElizabethService
@@ -24,6 +26,9 @@ class ElizabethConfig(ProtocolConfig):
         self.base_url = URL.build(scheme="http", host=self.host, port=self.port)
 
 
+MANIFEST = Path(__file__).with_name("perform_manifest.json")
+
+
 def _import_performs():  # noqa: F401
     from avilla.elizabeth.perform import context, resource_fetch  # noqa: F401
     from avilla.elizabeth.perform.action import contact  # noqa: F401
@@ -48,41 +53,38 @@ def _import_performs():  # noqa: F401
     from avilla.elizabeth.perform.query import announcement, bot, file, friend, group  # noqa
 
 
-_import_performs()
-
-
 class ElizabethProtocol(BaseProtocol):
     service: ElizabethService
 
-    artifacts = {
-        **merge(
-            ref("avilla.protocol/elizabeth::action", "activity"),
-            ref("avilla.protocol/elizabeth::action", "announcement"),
-            ref("avilla.protocol/elizabeth::action", "contact"),
-            ref("avilla.protocol/elizabeth::action", "file"),
-            ref("avilla.protocol/elizabeth::action", "friend"),
-            ref("avilla.protocol/elizabeth::action", "group"),
-            ref("avilla.protocol/elizabeth::action", "member"),
-            ref("avilla.protocol/elizabeth::action", "message"),
-            ref("avilla.protocol/elizabeth::action", "request"),
-            ref("avilla.protocol/elizabeth::event", "activity"),
-            ref("avilla.protocol/elizabeth::event", "friend"),
-            ref("avilla.protocol/elizabeth::event", "group"),
-            ref("avilla.protocol/elizabeth::event", "member"),
-            ref("avilla.protocol/elizabeth::event", "message"),
-            ref("avilla.protocol/elizabeth::event", "relationship"),
-            ref("avilla.protocol/elizabeth::event", "request"),
-            ref("avilla.protocol/elizabeth::message", "deserialize"),
-            ref("avilla.protocol/elizabeth::message", "serialize"),
-            ref("avilla.protocol/elizabeth::query", "announcement"),
-            ref("avilla.protocol/elizabeth::query", "bot"),
-            ref("avilla.protocol/elizabeth::query", "file"),
-            ref("avilla.protocol/elizabeth::query", "friend"),
-            ref("avilla.protocol/elizabeth::query", "group"),
-            ref("avilla.protocol/elizabeth::resource_fetch"),
-            ref("avilla.protocol/elizabeth::context"),
-        )
-    }
+    artifacts = lazy_merge(
+        MANIFEST,
+        _import_performs,
+        ref("avilla.protocol/elizabeth::action", "activity"),
+        ref("avilla.protocol/elizabeth::action", "announcement"),
+        ref("avilla.protocol/elizabeth::action", "contact"),
+        ref("avilla.protocol/elizabeth::action", "file"),
+        ref("avilla.protocol/elizabeth::action", "friend"),
+        ref("avilla.protocol/elizabeth::action", "group"),
+        ref("avilla.protocol/elizabeth::action", "member"),
+        ref("avilla.protocol/elizabeth::action", "message"),
+        ref("avilla.protocol/elizabeth::action", "request"),
+        ref("avilla.protocol/elizabeth::event", "activity"),
+        ref("avilla.protocol/elizabeth::event", "friend"),
+        ref("avilla.protocol/elizabeth::event", "group"),
+        ref("avilla.protocol/elizabeth::event", "member"),
+        ref("avilla.protocol/elizabeth::event", "message"),
+        ref("avilla.protocol/elizabeth::event", "relationship"),
+        ref("avilla.protocol/elizabeth::event", "request"),
+        ref("avilla.protocol/elizabeth::message", "deserialize"),
+        ref("avilla.protocol/elizabeth::message", "serialize"),
+        ref("avilla.protocol/elizabeth::query", "announcement"),
+        ref("avilla.protocol/elizabeth::query", "bot"),
+        ref("avilla.protocol/elizabeth::query", "file"),
+        ref("avilla.protocol/elizabeth::query", "friend"),
+        ref("avilla.protocol/elizabeth::query", "group"),
+        ref("avilla.protocol/elizabeth::resource_fetch"),
+        ref("avilla.protocol/elizabeth::context"),
+    )
 
     def __init__(self):
         self.service = ElizabethService(self)
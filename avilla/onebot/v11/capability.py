@@ -8,6 +8,7 @@ from avilla.core import Selector
 from avilla.core.event import AvillaEvent
 from avilla.core.ryanvk import TargetOverload
 from avilla.core.ryanvk.collector.application import ApplicationCollector
+from avilla.core.tracing import span
 from avilla.standard.core.application import AvillaLifecycleEvent
 from avilla.standard.qq.elements import Forward
 from graia.ryanvk import Fn, PredicateOverload, TypeOverload
@@ -44,8 +45,9 @@ class OneBot11Capability((m := ApplicationCollector())._):
     async def deserialize_chain(self, chain: list[dict]):
         elements = []
 
-        for raw_element in chain:
-            elements.append(await self.deserialize_element(raw_element))
+        with span("deserialize_chain"):
+            for raw_element in chain:
+                elements.append(await self.deserialize_element(raw_element))
 
         return MessageChain(elements)
 
@@ -58,8 +60,9 @@ class OneBot11Capability((m := ApplicationCollector())._):
         return elements
 
     async def handle_event(self, event: dict):
-        maybe_event = await self.event_callback(event)
+        with span("event_callback"):
+            maybe_event = await self.event_callback(event)
 
         if maybe_event is not None:
             self.avilla.event_record(maybe_event)
-            self.avilla.broadcast.postEvent(maybe_event)
+            self.avilla.event_pipeline.dispatch(maybe_event, self.avilla.broadcast.postEvent)
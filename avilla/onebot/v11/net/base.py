@@ -2,32 +2,52 @@ from __future__ import annotations
 
 import asyncio
 from contextlib import suppress
+from itertools import count
+from time import perf_counter
 from typing import TYPE_CHECKING, AsyncIterator
 
 from loguru import logger
 from typing_extensions import Self
 
-from avilla.core.exceptions import ActionFailed
+from avilla.core.exceptions import ActionFailed, NetworkError
 from avilla.core.ryanvk.staff import Staff
+from avilla.core.tracing import discard_trace, traced
 from avilla.onebot.v11.capability import OneBot11Capability
 
 if TYPE_CHECKING:
+    from avilla.core.metrics import MetricsRegistry
     from avilla.onebot.v11.account import OneBot11Account
     from avilla.onebot.v11.protocol import OneBot11Protocol
 
 
+class _ActionMetrics:
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.latency = registry.histogram("onebot11_action_seconds", "time until actions were answered", ("action",))
+        self.errors = registry.counter("onebot11_action_errors_total", "actions that failed", ("action", "error"))
+        self.in_flight = registry.gauge("onebot11_actions_in_flight", "actions waiting for a response")
+        self.queued = registry.gauge("onebot11_actions_queued", "actions waiting for an in-flight slot")
+
+
 class OneBot11Networking:
     protocol: OneBot11Protocol
     accounts: dict[int, OneBot11Account]
     response_waiters: dict[str, asyncio.Future]
     close_signal: asyncio.Event
+    call_timeout: float | None
+    max_in_flight: int
 
-    def __init__(self, protocol: OneBot11Protocol):
+    def __init__(self, protocol: OneBot11Protocol, *, call_timeout: float | None = 30.0, max_in_flight: int = 64):
         super().__init__()
         self.protocol = protocol
+        self._staff = None
         self.accounts = {}
         self.response_waiters = {}
         self.close_signal = asyncio.Event()
+        self.call_timeout = call_timeout
+        self.max_in_flight = max_in_flight
+        self._echo = count(1)
+        self._in_flight: asyncio.Semaphore | None = None
+        self._metrics: _ActionMetrics | None = None
 
     def get_staff_components(self):
         return {"connection": self, "protocol": self.protocol, "avilla": self.protocol.avilla}
@@ -37,7 +57,10 @@ class OneBot11Networking:
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     def message_receive(self) -> AsyncIterator[tuple[Self, dict]]:
         ...
@@ -55,7 +78,8 @@ class OneBot11Networking:
     async def message_handle(self):
         async for connection, data in self.message_receive():
             if echo := data.get("echo"):
-                if future := self.response_waiters.get(echo):
+                discard_trace()
+                if (future := self.response_waiters.get(echo)) is not None and not future.done():
                     future.set_result(data)
                 continue
 
@@ -66,27 +90,78 @@ class OneBot11Networking:
 
                 logger.warning(f"received unsupported event: {data}")
 
-            asyncio.create_task(event_parse_task(data))
+            if (capture := self.protocol.avilla.event_capture) is not None:
+                capture.write("onebot/v11", data)
+            await self.protocol.avilla.event_pipeline.put(
+                event_parse_task, data, kind=data.get("post_type"), source="onebot/v11"
+            )
 
     async def connection_closed(self):
         self.close_signal.set()
+        self.fail_waiters()
+
+    def fail_waiters(self):
+        """让仍在等待响应的调用立即以 NetworkError 失败, 而不是等到超时."""
+        for future in self.response_waiters.values():
+            if not future.done():
+                future.set_exception(NetworkError("connection closed before the action was answered"))
 
-    async def call(self, action: str, params: dict | None = None) -> dict | None:
+    @property
+    def metrics(self) -> _ActionMetrics:
+        if self._metrics is None:
+            self._metrics = _ActionMetrics(self.protocol.avilla.metrics)
+        return self._metrics
+
+    @traced("call", "action")
+    async def call(self, action: str, params: dict | None = None, *, timeout: float | None = None) -> dict | None:
+        """调用 action 并等待响应.
+
+        同时等待响应的调用至多 max_in_flight 个, 其余的调用排队; timeout 为 None 时使用 call_timeout,
+        排队的时间也计算在内. 超时或被取消时, 对应的 echo 会被立即回收.
+        """
         if not self.alive:
             raise RuntimeError("connection is not established")
 
-        future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
-        echo = str(hash(future))
-        self.response_waiters[echo] = future
-
+        metrics = self.metrics
+        timeout = self.call_timeout if timeout is None else timeout
+        started = perf_counter()
         try:
-            await self.wait_for_available()
-            await self.send({"action": action, "params": params or {}, "echo": echo})
-            result = await future
+            result = await asyncio.wait_for(self._request(action, params), timeout)
+        except asyncio.TimeoutError:
+            metrics.errors.inc((action, "TimeoutError"))
+            raise asyncio.TimeoutError(f"action {action} was not answered in {timeout}s") from None
+        except BaseException as e:
+            metrics.errors.inc((action, e.__class__.__name__))
+            raise
         finally:
-            del self.response_waiters[echo]
+            metrics.latency.observe(perf_counter() - started, (action,))
 
         if result["status"] != "ok":
+            metrics.errors.inc((action, "ActionFailed"))
             raise ActionFailed(f"{result['retcode']}: {result}")
 
         return result.get("data")
+
+    async def _request(self, action: str, params: dict | None) -> dict:
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        metrics = self.metrics
+
+        metrics.queued.inc()
+        try:
+            await self._in_flight.acquire()
+        finally:
+            metrics.queued.dec()
+
+        future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
+        echo = str(next(self._echo))
+        self.response_waiters[echo] = future
+        metrics.in_flight.inc()
+        try:
+            await self.wait_for_available()
+            await self.send({"action": action, "params": params or {}, "echo": echo})
+            return await future
+        finally:
+            del self.response_waiters[echo]
+            metrics.in_flight.dec()
+            self._in_flight.release()
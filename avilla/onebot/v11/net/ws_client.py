@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from contextlib import suppress
 from typing import TYPE_CHECKING, cast
 
@@ -11,6 +10,8 @@ from launart.manager import Launart
 from launart.utilles import any_completed
 from loguru import logger
 
+from avilla.core.codec import dumps, loads
+from avilla.core.metrics import count_reconnect
 from avilla.onebot.v11.net.base import OneBot11Networking
 from avilla.standard.core.account import AccountUnregistered
 
@@ -28,7 +29,7 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
     session: aiohttp.ClientSession
 
     def __init__(self, protocol: OneBot11Protocol, config: OneBot11ForwardConfig) -> None:
-        super().__init__(protocol)
+        super().__init__(protocol, call_timeout=config.call_timeout, max_in_flight=config.max_in_flight)
         self.config = config
 
     @property
@@ -43,8 +44,9 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
             if msg.type in {aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED}:
                 self.close_signal.set()
                 break
-            elif msg.type == aiohttp.WSMsgType.TEXT:
-                data: dict = json.loads(cast(str, msg.data))
+            elif msg.type in {aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY}:
+                with self.protocol.avilla.tracer.receive("onebot/v11"):
+                    data: dict = loads(msg.data)
                 yield self, data
         else:
             await self.connection_closed()
@@ -53,7 +55,7 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
         if self.connection is None:
             raise RuntimeError("connection is not established")
 
-        await self.connection.send_json(payload)
+        await self.connection.send_str(dumps(payload))
 
     async def wait_for_available(self):
         await self.status.wait_for_available()
@@ -95,6 +97,7 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
                 logger.info(f"{self} Websocket client exiting...")
                 await self.connection.close()
                 self.close_signal.set()
+                self.fail_waiters()
                 self.connection = None
                 for v in list(avilla.accounts.values()):
                     if v.protocol is self.protocol:
@@ -104,6 +107,7 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
                 return
             if close_task in done:
                 receiver_task.cancel()
+                self.fail_waiters()
                 logger.warning(f"{self} Connection closed by server, will reconnect in 5 seconds...")
                 accounts = {str(i) for i in self.accounts.keys()}
                 for n in list(avilla.accounts.keys()):
@@ -115,12 +119,13 @@ class OneBot11WsClientNetworking(OneBot11Networking, Service):
                         del avilla.accounts[n]
                 self.accounts.clear()
                 await asyncio.sleep(5)
+                count_reconnect(self.protocol.avilla.metrics, "onebot/v11")
                 logger.info(f"{self} Reconnecting...")
                 continue
 
     async def launch(self, manager: Launart):
         async with self.stage("preparing"):
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(json_serialize=dumps)
 
         async with self.stage("blocking"):
             await self.connection_daemon(manager, self.session)
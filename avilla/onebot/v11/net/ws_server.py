@@ -12,6 +12,7 @@ from starlette.routing import WebSocketRoute
 from starlette.websockets import WebSocket
 from yarl import URL
 
+from avilla.core.codec import dumps, loads
 from avilla.onebot.v11.net.base import OneBot11Networking
 from avilla.standard.core.account import AccountUnregistered
 
@@ -23,9 +24,16 @@ if TYPE_CHECKING:
 class OneBot11WsServerConnection(OneBot11Networking):
     connection: WebSocket
 
-    def __init__(self, connection: WebSocket, protocol: OneBot11Protocol):
+    def __init__(
+        self,
+        connection: WebSocket,
+        protocol: OneBot11Protocol,
+        *,
+        call_timeout: float | None = 30.0,
+        max_in_flight: int = 64,
+    ):
         self.connection = connection
-        super().__init__(protocol)
+        super().__init__(protocol, call_timeout=call_timeout, max_in_flight=max_in_flight)
 
     @property
     def id(self):
@@ -36,16 +44,21 @@ class OneBot11WsServerConnection(OneBot11Networking):
         return not self.close_signal.is_set()
 
     async def message_receive(self):
-        async for msg in self.connection.iter_json():
-            yield self, msg
-        else:
-            await self.connection_closed()
+        while True:
+            message = await self.connection.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            with self.protocol.avilla.tracer.receive("onebot/v11"):
+                data = message.get("text")
+                data = loads(data if data is not None else message["bytes"])
+            yield self, data
+        await self.connection_closed()
 
     async def wait_for_available(self):
         return
 
     async def send(self, payload: dict) -> None:
-        return await self.connection.send_json(payload)
+        return await self.connection.send_text(dumps(payload))
 
     async def unregister_account(self):
         avilla = self.protocol.avilla
@@ -83,12 +96,15 @@ class OneBot11WsServerNetworking(Service):
         account_id = ws.headers["X-Self-ID"]
 
         await ws.accept()
-        connection = OneBot11WsServerConnection(ws, self.protocol)
+        connection = OneBot11WsServerConnection(
+            ws, self.protocol, call_timeout=self.config.call_timeout, max_in_flight=self.config.max_in_flight
+        )
         self.connections[account_id] = connection
 
         try:
             await any_completed(connection.message_handle(), connection.close_signal.wait())
         finally:
+            connection.fail_waiters()
             await connection.unregister_account()
             del self.connections[account_id]
 
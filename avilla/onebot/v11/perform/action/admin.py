@@ -54,6 +54,27 @@ class OneBot11PrivilegeActionPerform((m := AccountCollector["OneBot11Protocol",
             PRIVILEGE_LEVEL[self_info["role"]] > PRIVILEGE_LEVEL[target_info["role"]],
         )
 
+    @m.pull_many("land.group.member", Privilege)
+    async def get_group_member_privileges(
+        self, target: Selector, route: ..., targets: list[Selector]
+    ) -> dict[Selector, Privilege]:
+        result = await self.account.connection.call("get_group_member_list", {"group_id": int(target["group"])})
+        if result is None:
+            raise RuntimeError(f"Failed to get members of group {target['group']}")
+        members = {str(i["user_id"]): i for i in result}
+        if (self_info := members.get(self.account.route["account"])) is None:
+            return {}
+        privileges = {}
+        for i in targets:
+            if i["member"] == self.account.route["account"]:
+                privileges[i] = Privilege(True, True)
+            elif (member := members.get(i["member"])) is not None:
+                privileges[i] = Privilege(
+                    PRIVILEGE_LEVEL[member["role"]] > 0,
+                    PRIVILEGE_LEVEL[self_info["role"]] > PRIVILEGE_LEVEL[member["role"]],
+                )
+        return privileges
+
     @m.pull("land.group.member", Privilege >> Summary)
     async def get_group_member_privilege_summary(self, target: Selector, route: ...) -> Summary:
         target_info = await self.account.connection.call(
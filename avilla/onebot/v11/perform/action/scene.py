@@ -62,6 +62,18 @@ class OneBot11BanActionPerform((m := AccountCollector["OneBot11Protocol", "OneBo
             raise RuntimeError(f"Failed to get member {target}")
         return Nick(result.get("card", "") or result["nickname"], result["nickname"], result.get("title"))
 
+    @m.pull_many("land.group.member", Nick)
+    async def get_member_nicks(self, target: Selector, route: ..., targets: list[Selector]) -> dict[Selector, Nick]:
+        result = await self.account.connection.call("get_group_member_list", {"group_id": int(target["group"])})
+        if result is None:
+            raise RuntimeError(f"Failed to get members of group {target['group']}")
+        members = {str(i["user_id"]): i for i in result}
+        return {
+            i: Nick(member.get("card", "") or member["nickname"], member["nickname"], member.get("title"))
+            for i in targets
+            if (member := members.get(i["member"])) is not None
+        }
+
     @m.pull("land.friend", Nick)
     @m.pull("land.stranger", Nick)
     async def get_user_nick(self, target: Selector, route: ...) -> Nick:
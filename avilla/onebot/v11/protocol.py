@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 
 from yarl import URL
 
 from avilla.core.application import Avilla
 from avilla.core.protocol import BaseProtocol
-from graia.ryanvk import merge, ref
+from avilla.core.ryanvk.lazy import lazy_merge
+from graia.ryanvk import ref
 
 from .net.ws_client import OneBot11WsClientNetworking
 from .net.ws_server import OneBot11WsServerNetworking
@@ -17,6 +19,8 @@ from .service import OneBot11Service
 class OneBot11ForwardConfig:
     endpoint: URL
     access_token: str | None = None
+    call_timeout: float | None = 30.0
+    max_in_flight: int = 64
 
 
 @dataclass
@@ -25,6 +29,11 @@ class OneBot11ReverseConfig:
     path: str = "onebot/v11"
     endpoint: str = "ws/universal"
     access_token: str | None = None
+    call_timeout: float | None = 30.0
+    max_in_flight: int = 64
+
+
+MANIFEST = Path(__file__).with_name("perform_manifest.json")
 
 
 def _import_performs():
@@ -46,33 +55,30 @@ def _import_performs():
     from avilla.onebot.v11.perform.query import friend  # noqa: F401
 
 
-_import_performs()
-
-
 class OneBot11Protocol(BaseProtocol):
     service: OneBot11Service
 
-    artifacts = {
-        **merge(
-            ref("avilla.protocol/onebot11::context"),
-            ref("avilla.protocol/onebot11::resource_fetch"),
-            ref("avilla.protocol/onebot11::action", "file"),
-            ref("avilla.protocol/onebot11::action", "admin"),
-            ref("avilla.protocol/onebot11::action", "scene"),
-            ref("avilla.protocol/onebot11::action", "message"),
-            ref("avilla.protocol/onebot11::action", "mute"),
-            ref("avilla.protocol/onebot11::action", "request"),
-            ref("avilla.protocol/onebot11::event", "message"),
-            ref("avilla.protocol/onebot11::event", "lifespan"),
-            ref("avilla.protocol/onebot11::event", "notice"),
-            ref("avilla.protocol/onebot11::event", "request"),
-            ref("avilla.protocol/onebot11::message", "deserialize"),
-            ref("avilla.protocol/onebot11::message", "serialize"),
-            ref("avilla.protocol/onebot11::query", "file"),
-            ref("avilla.protocol/onebot11::query", "group"),
-            ref("avilla.protocol/onebot11::query", "friend"),
-        ),
-    }
+    artifacts = lazy_merge(
+        MANIFEST,
+        _import_performs,
+        ref("avilla.protocol/onebot11::context"),
+        ref("avilla.protocol/onebot11::resource_fetch"),
+        ref("avilla.protocol/onebot11::action", "file"),
+        ref("avilla.protocol/onebot11::action", "admin"),
+        ref("avilla.protocol/onebot11::action", "scene"),
+        ref("avilla.protocol/onebot11::action", "message"),
+        ref("avilla.protocol/onebot11::action", "mute"),
+        ref("avilla.protocol/onebot11::action", "request"),
+        ref("avilla.protocol/onebot11::event", "message"),
+        ref("avilla.protocol/onebot11::event", "lifespan"),
+        ref("avilla.protocol/onebot11::event", "notice"),
+        ref("avilla.protocol/onebot11::event", "request"),
+        ref("avilla.protocol/onebot11::message", "deserialize"),
+        ref("avilla.protocol/onebot11::message", "serialize"),
+        ref("avilla.protocol/onebot11::query", "file"),
+        ref("avilla.protocol/onebot11::query", "group"),
+        ref("avilla.protocol/onebot11::query", "friend"),
+    )
 
     def __init__(self):
         self.service = OneBot11Service(self)
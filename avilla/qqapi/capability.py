@@ -8,6 +8,7 @@ from avilla.core.event import AvillaEvent
 from avilla.core.ryanvk.collector.application import ApplicationCollector
 from avilla.core.ryanvk.overload.target import TargetOverload
 from avilla.core.selector import Selector
+from avilla.core.tracing import span
 from avilla.standard.core.application.event import AvillaLifecycleEvent
 from graia.ryanvk import Fn, PredicateOverload, SimpleOverload, TypeOverload
 
@@ -47,21 +48,22 @@ class QQAPICapability((m := ApplicationCollector())._):
     async def deserialize(self, event: dict):
         elements = []
 
-        if message_reference := event.get("message_reference"):
-            elements.append(await self.deserialize_element({"type": "message_reference", **message_reference}))
-        if event.get("mention_everyone", False):
-            elements.append(await self.deserialize_element({"type": "mention_everyone"}))
-        if "content" in event:
-            for i in handle_text(event["content"]):
-                elements.append(await self.deserialize_element(i))
-        if attachments := event.get("attachments"):
-            for i in attachments:
-                elements.append(await self.deserialize_element({"type": "attachment", **i}))
-        if embeds := event.get("embeds"):
-            for i in embeds:
-                elements.append(await self.deserialize_element({"type": "embed", **i}))
-        if ark := event.get("ark"):
-            elements.append(await self.deserialize_element({"type": "ark", **ark}))
+        with span("deserialize_chain"):
+            if message_reference := event.get("message_reference"):
+                elements.append(await self.deserialize_element({"type": "message_reference", **message_reference}))
+            if event.get("mention_everyone", False):
+                elements.append(await self.deserialize_element({"type": "mention_everyone"}))
+            if "content" in event:
+                for i in handle_text(event["content"]):
+                    elements.append(await self.deserialize_element(i))
+            if attachments := event.get("attachments"):
+                for i in attachments:
+                    elements.append(await self.deserialize_element({"type": "attachment", **i}))
+            if embeds := event.get("embeds"):
+                for i in embeds:
+                    elements.append(await self.deserialize_element({"type": "embed", **i}))
+            if ark := event.get("ark"):
+                elements.append(await self.deserialize_element({"type": "ark", **ark}))
 
         return MessageChain(elements)
 
@@ -81,7 +83,8 @@ class QQAPICapability((m := ApplicationCollector())._):
         return res
 
     async def handle_event(self, etype: str, event: dict):
-        maybe_event = await self.event_callback(etype, event)
+        with span("event_callback"):
+            maybe_event = await self.event_callback(etype, event)
 
         if maybe_event is not None:
-            self.avilla.broadcast.postEvent(maybe_event)
+            self.avilla.event_pipeline.dispatch(maybe_event, self.avilla.broadcast.postEvent)
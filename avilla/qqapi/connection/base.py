@@ -9,7 +9,9 @@ from loguru import logger
 from typing_extensions import Self
 from aiohttp import ClientSession, FormData
 
+from avilla.core.codec import loads
 from avilla.core.ryanvk.staff import Staff
+from avilla.core.tracing import traced
 from avilla.qqapi.audit import MessageAudited, audit_result
 from avilla.qqapi.capability import QQAPICapability
 
@@ -33,6 +35,7 @@ class QQAPINetworking:
     def __init__(self, protocol: QQAPIProtocol, config: QQAPIConfig, app_id: str, secret: str):
         super().__init__()
         self.protocol = protocol
+        self._staff = None
         self.config = config
         self.app_id = app_id
         self.secret = secret
@@ -47,7 +50,10 @@ class QQAPINetworking:
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     def message_receive(self, shard: tuple[int, int]) -> AsyncIterator[tuple[Self, dict]]:
         ...
@@ -79,12 +85,16 @@ class QQAPINetworking:
                     if event is not None:
                         if isinstance(event, MessageAudited):
                             audit_result.add_result(event)
-                        await self.protocol.post_event(event)  # type: ignore
+                        self.protocol.post_event(event)  # type: ignore
                     return
                 logger.warning(f"received unsupported event {event_type.lower()}: {_data.data}")
                 return
 
-            asyncio.create_task(event_parse_task(payload))
+            if (capture := self.protocol.avilla.event_capture) is not None:
+                capture.write("qqapi", (payload.type or "").lower(), payload.data, account=self.app_id)
+            await self.protocol.avilla.event_pipeline.put(
+                event_parse_task, payload, kind=payload.type, source="qqapi"
+            )
 
     async def connection_closed(self):
         self.close_signal.set()
@@ -151,6 +161,7 @@ class QQAPINetworking:
 
         raise ValueError(f"unknown method {method}")
 
+    @traced("call_http", "method", "action")
     async def call_http(self, method: CallMethod, action: str, params: dict | None = None) -> dict:
         headers = await self.get_authorization_header()
         try:
@@ -181,7 +192,7 @@ class QQAPINetworking:
                     raise NetworkError(
                         f"Get authorization failed with status code {resp.status}." " Please check your config."
                     )
-                data = await resp.json()
+                data = loads(await resp.read())
             self._access_token = cast(str, data["access_token"])
             self._expires_in = datetime.now(timezone.utc) + timedelta(seconds=int(data["expires_in"]))
         return self._access_token
@@ -15,6 +15,8 @@ from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 from avilla.core.account import AccountInfo
+from avilla.core.codec import dumps, loads
+from avilla.core.metrics import count_reconnect
 from avilla.core.selector import Selector
 from avilla.qqapi.account import QQAPIAccount
 from avilla.qqapi.const import PLATFORM
@@ -80,7 +82,9 @@ class QQAPIWebhookNetworking(Service):
 
     async def handle_request(self, req: web.Request):
         header = req.headers
-        data = await req.json()
+        body = await req.read()
+        with self.protocol.avilla.tracer.receive("qqapi"):
+            data = loads(body)
         payload = Payload(**data)
         bot_id = header["X-Bot-Appid"]
         secret = self.config.secrets[bot_id]
@@ -104,7 +108,7 @@ class QQAPIWebhookNetworking(Service):
             except Exception as e:
                 logger.exception(f"Failed to sign message: {e}")
                 return web.Response(status=500)
-            return web.json_response({"plain_token": plain_token, "signature": signature_hex})
+            return web.json_response({"plain_token": plain_token, "signature": signature_hex}, dumps=dumps)
 
         if self.config.verify_payload:
             ed25519 = header["X-Signature-Ed25519"]
@@ -167,12 +171,14 @@ class QQAPIWebhookNetworking(Service):
                 if event is not None:
                     if isinstance(event, MessageAudited):
                         audit_result.add_result(event)
-                    await self.protocol.post_event(event)  # type: ignore
+                    self.protocol.post_event(event)  # type: ignore
                 return
             logger.warning(f"received unsupported event {event_type.lower()}: {_data.data}")
             return
 
-        asyncio.create_task(event_parse_task(payload))
+        if (capture := self.protocol.avilla.event_capture) is not None:
+            capture.write("qqapi", (payload.type or "").lower(), payload.data, account=bot_id)
+        await self.protocol.avilla.event_pipeline.put(event_parse_task, payload, kind=payload.type, source="qqapi")
         return web.Response()
 
     async def daemon(self, manager: Launart, site: web.TCPSite):
@@ -207,12 +213,13 @@ class QQAPIWebhookNetworking(Service):
                     with suppress(KeyError):
                         del self.protocol.service.accounts[bot_id]
                 await asyncio.sleep(5)
+                count_reconnect(self.protocol.avilla.metrics, "qqapi")
                 logger.info(f"{self} Reconnecting...")
                 continue
 
     async def launch(self, manager: Launart):
         async with self.stage("preparing"):
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(json_serialize=dumps)
             logger.info(f"starting server on {self.config.host}:{self.config.port}")
             self.wsgi = web.Application(logger=logger)  # type: ignore
             self.wsgi.router.freeze = lambda: None  # monkey patch
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import sys
 from contextlib import suppress
 from dataclasses import asdict
@@ -14,6 +13,8 @@ from launart.utilles import any_completed
 from loguru import logger
 
 from avilla.core.account import AccountInfo
+from avilla.core.codec import dumps, loads
+from avilla.core.metrics import count_reconnect
 from avilla.core.selector import Selector
 from avilla.qqapi.account import QQAPIAccount
 from avilla.qqapi.const import PLATFORM
@@ -74,8 +75,9 @@ class QQAPIWsClientNetworking(QQAPINetworking, Service):
             if msg.type in {aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED}:
                 self.close_signal.set()
                 break
-            elif msg.type == aiohttp.WSMsgType.TEXT:
-                data: dict = json.loads(cast(str, msg.data))
+            elif msg.type in {aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY}:
+                with self.protocol.avilla.tracer.receive("qqapi"):
+                    data: dict = loads(msg.data)
                 if data["op"] == Opcode.RECONNECT:
                     logger.warning("Received reconnect event from server, will reconnect in 5 seconds...")
                     break
@@ -99,7 +101,7 @@ class QQAPIWsClientNetworking(QQAPINetworking, Service):
         if (connection := self.connections.get(shard)) is None:
             raise RuntimeError("connection is not established")
 
-        await connection.send_json(payload)
+        await connection.send_str(dumps(payload))
 
     async def wait_for_available(self):
         await self.status.wait_for_available()
@@ -122,7 +124,7 @@ class QQAPIWsClientNetworking(QQAPINetworking, Service):
         if not (connection := self.connections.get(shard)):
             raise RuntimeError("connection is not established")
         try:
-            payload = Payload(**await connection.receive_json())
+            payload = Payload(**await connection.receive_json(loads=loads))
             assert payload.opcode == Opcode.HELLO, f"Received unexpected payload: {payload!r}"
             return payload.data["heartbeat_interval"]
         except Exception as e:
@@ -168,7 +170,7 @@ class QQAPIWsClientNetworking(QQAPINetworking, Service):
         if not self.session_id:
             # https://bot.q.qq.com/wiki/develop/api/gateway/reference.html#_2-%E9%89%B4%E6%9D%83%E8%BF%9E%E6%8E%A5
             # 鉴权成功之后，后台会下发一个 Ready Event
-            payload = Payload(**await connection.receive_json())
+            payload = Payload(**await connection.receive_json(loads=loads))
             if payload.opcode == Opcode.INVALID_SESSION:
                 logger.warning("Received invalid session event from server, will try to resume")
                 return False
@@ -265,16 +267,18 @@ class QQAPIWsClientNetworking(QQAPINetworking, Service):
                             del self.protocol.service.accounts[self.config.id]
                             # del self.protocol.avilla.accounts[account_route]
                         await asyncio.sleep(5)
+                        count_reconnect(self.protocol.avilla.metrics, "qqapi")
                         logger.info(f"{self} Reconnecting...")
                         continue
             except Exception as e:
                 logger.error(f"{self} Error while connecting: {e}")
                 await asyncio.sleep(5)
+                count_reconnect(self.protocol.avilla.metrics, "qqapi")
                 logger.info(f"{self} Reconnecting...")
 
     async def launch(self, manager: Launart):
         async with self.stage("preparing"):
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(json_serialize=dumps)
             gateway_info = await self.call_http("get", "gateway/bot")
             ws_url = gateway_info["url"]
             remain = gateway_info.get("session_start_limit", {}).get("remaining")
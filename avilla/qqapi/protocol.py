@@ -3,13 +3,15 @@ from __future__ import annotations
 import os
 import ssl
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from loguru import logger
 from yarl import URL
 
 from avilla.core.application import Avilla
 from avilla.core.protocol import BaseProtocol, ProtocolConfig
-from graia.ryanvk import merge, ref
+from avilla.core.ryanvk.lazy import lazy_merge
+from graia.ryanvk import ref
 
 from .connection.ws_client import QQAPIWsClientNetworking
 from .connection.webhook import QQAPIWebhookNetworking
@@ -129,6 +131,9 @@ class QQAPIWebhookConfig(ProtocolConfig, QQAPIConfig):
             self.ssl_context = None
 
 
+MANIFEST = Path(__file__).with_name("perform_manifest.json")
+
+
 def _import_performs():  # noqa: F401
     # isort: off
 
@@ -167,27 +172,26 @@ class QQAPIProtocol(BaseProtocol):
     def __init__(self):
         self.service = QQAPIService(self)
 
-    _import_performs()
-    artifacts = {
-        **merge(
-            ref("avilla.protocol/qqapi::context"),
-            ref("avilla.protocol/qqapi::query"),
-            ref("avilla.protocol/qqapi::resource_fetch"),
-            ref("avilla.protocol/qqapi::action", "message"),
-            ref("avilla.protocol/qqapi::action", "channel"),
-            ref("avilla.protocol/qqapi::action", "guild"),
-            ref("avilla.protocol/qqapi::action", "guild_member"),
-            ref("avilla.protocol/qqapi::action", "role"),
-            ref("avilla.protocol/qqapi::action", "user"),
-            ref("avilla.protocol/qqapi::message", "deserialize"),
-            ref("avilla.protocol/qqapi::message", "serialize"),
-            ref("avilla.protocol/qqapi::event", "message"),
-            ref("avilla.protocol/qqapi::event", "activity"),
-            ref("avilla.protocol/qqapi::event", "relationship"),
-            ref("avilla.protocol/qqapi::event", "metadata"),
-            ref("avilla.protocol/qqapi::event", "audit"),
-        ),
-    }
+    artifacts = lazy_merge(
+        MANIFEST,
+        _import_performs,
+        ref("avilla.protocol/qqapi::context"),
+        ref("avilla.protocol/qqapi::query"),
+        ref("avilla.protocol/qqapi::resource_fetch"),
+        ref("avilla.protocol/qqapi::action", "message"),
+        ref("avilla.protocol/qqapi::action", "channel"),
+        ref("avilla.protocol/qqapi::action", "guild"),
+        ref("avilla.protocol/qqapi::action", "guild_member"),
+        ref("avilla.protocol/qqapi::action", "role"),
+        ref("avilla.protocol/qqapi::action", "user"),
+        ref("avilla.protocol/qqapi::message", "deserialize"),
+        ref("avilla.protocol/qqapi::message", "serialize"),
+        ref("avilla.protocol/qqapi::event", "message"),
+        ref("avilla.protocol/qqapi::event", "activity"),
+        ref("avilla.protocol/qqapi::event", "relationship"),
+        ref("avilla.protocol/qqapi::event", "metadata"),
+        ref("avilla.protocol/qqapi::event", "audit"),
+    )
 
     def ensure(self, avilla: Avilla):
         self.avilla = avilla
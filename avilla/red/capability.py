@@ -8,6 +8,7 @@ from avilla.core.event import AvillaEvent
 from avilla.core.ryanvk.collector.application import ApplicationCollector
 from avilla.core.ryanvk.overload.target import TargetOverload
 from avilla.core.selector import Selector
+from avilla.core.tracing import span
 from avilla.standard.core.application.event import AvillaLifecycleEvent
 from avilla.standard.qq.elements import Forward
 from graia.ryanvk import Fn, PredicateOverload, SimpleOverload, TypeOverload
@@ -37,8 +38,9 @@ class RedCapability((m := ApplicationCollector())._):
     async def deserialize(self, elements: list[dict]):
         _elements = []
 
-        for raw_element in elements:
-            _elements.append(await self.deserialize_element(raw_element))
+        with span("deserialize_chain"):
+            for raw_element in elements:
+                _elements.append(await self.deserialize_element(raw_element))
 
         return MessageChain(_elements)
 
@@ -51,8 +53,9 @@ class RedCapability((m := ApplicationCollector())._):
         return chain
 
     async def handle_event(self, event_type: str, payload: dict):
-        maybe_event = await self.event_callback(event_type, payload)
+        with span("event_callback"):
+            maybe_event = await self.event_callback(event_type, payload)
 
         if maybe_event is not None:
             self.avilla.event_record(maybe_event)
-            self.avilla.broadcast.postEvent(maybe_event)
+            self.avilla.event_pipeline.dispatch(maybe_event, self.avilla.broadcast.postEvent)
@@ -8,6 +8,7 @@ from loguru import logger
 from typing_extensions import Self
 
 from avilla.core.ryanvk.staff import Staff
+from avilla.core.tracing import traced
 from avilla.red.account import RedAccount
 from avilla.red.capability import RedCapability
 from avilla.red.utils import MsgType, get_msg_types
@@ -24,6 +25,7 @@ class RedNetworking:
     def __init__(self, protocol: RedProtocol):
         super().__init__()
         self.protocol = protocol
+        self._staff = None
         self.account = None
         self.close_signal = asyncio.Event()
 
@@ -35,7 +37,10 @@ class RedNetworking:
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     def message_receive(self) -> AsyncIterator[tuple[Self, dict]]:
         ...
@@ -63,7 +68,12 @@ class RedNetworking:
                     return
                 logger.warning(f"received unsupported event {t}: {payload}")
 
-            def handle_message(message: dict):
+            async def dispatch(t: str, payload: dict):
+                if (capture := self.protocol.avilla.event_capture) is not None:
+                    capture.write("red", t, payload, account=self.account and self.account.route["account"])
+                await self.protocol.avilla.event_pipeline.put(event_parse_task, t, payload, kind=t, source="red")
+
+            async def handle_message(message: dict):
                 types = get_msg_types(message)
                 if types.msg == MsgType.system and types.send == "system":
                     if (
@@ -72,21 +82,21 @@ class RedNetworking:
                         and message["elements"][0]["grayTipElement"]["subElementType"] == 4
                         and message["elements"][0]["grayTipElement"]["groupElement"]["type"] == 1
                     ):
-                        asyncio.create_task(event_parse_task("group::member::add", message))
+                        await dispatch("group::member::add", message)
                     elif (
                         message["subMsgType"] == 8
                         and message["elements"][0]["elementType"] == 8
                         and message["elements"][0]["grayTipElement"]["subElementType"] == 4
                         and message["elements"][0]["grayTipElement"]["groupElement"]["type"] == 8
                     ):
-                        asyncio.create_task(event_parse_task("group::member::mute", message))
+                        await dispatch("group::member::mute", message)
                     elif (
                         message["subMsgType"] == 8
                         and message["elements"][0]["elementType"] == 8
                         and message["elements"][0]["grayTipElement"]["subElementType"] == 4
                         and message["elements"][0]["grayTipElement"]["groupElement"]["type"] == 5
                     ):
-                        asyncio.create_task(event_parse_task("group::name_update", message))
+                        await dispatch("group::name_update", message)
                     elif (
                         message["subMsgType"] == 12
                         and message["elements"][0]["elementType"] == 8
@@ -94,22 +104,23 @@ class RedNetworking:
                         and message["elements"][0]["grayTipElement"]["xmlElement"]["busiType"] == "1"
                         and message["elements"][0]["grayTipElement"]["xmlElement"]["busiId"] == "10145"
                     ):
-                        asyncio.create_task(event_parse_task("group::member::legacy::add::invited", message))
+                        await dispatch("group::member::legacy::add::invited", message)
                     else:
                         logger.warning(f"received unsupported event: {message}")
                         return
                 else:
-                    asyncio.create_task(event_parse_task("message::recv", message))
+                    await dispatch("message::recv", message)
 
             if event_type == "message::recv":
                 for msg in data["payload"]:
-                    handle_message(msg)
+                    await handle_message(msg)
             else:
-                asyncio.create_task(event_parse_task(event_type, data["payload"]))
+                await dispatch(event_type, data["payload"])
 
     async def connection_closed(self):
         self.close_signal.set()
 
+    @traced("call", "action")
     async def call(self, action: str, params: dict | None = None) -> None:
         if not self.alive:
             raise RuntimeError("connection is not established")
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from typing import TYPE_CHECKING, Literal, cast
 
 import aiohttp
@@ -10,6 +9,9 @@ from launart.manager import Launart
 from launart.utilles import any_completed
 from loguru import logger
 
+from avilla.core.codec import dumps, loads, loads_body
+from avilla.core.metrics import count_reconnect
+from avilla.core.tracing import traced
 from avilla.red.account import RedAccount
 from avilla.red.net.base import RedNetworking
 from avilla.standard.core.account import AccountUnavailable, AccountUnregistered
@@ -42,8 +44,9 @@ class RedWsClientNetworking(RedNetworking, Service):
             if msg.type in {aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED}:
                 self.close_signal.set()
                 break
-            elif msg.type == aiohttp.WSMsgType.TEXT:
-                data: dict = json.loads(cast(str, msg.data))
+            elif msg.type in {aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY}:
+                with self.protocol.avilla.tracer.receive("red"):
+                    data: dict = loads(msg.data)
                 yield self, data
         else:
             await self.connection_closed()
@@ -52,8 +55,9 @@ class RedWsClientNetworking(RedNetworking, Service):
         if self.connection is None:
             raise RuntimeError("connection is not established")
 
-        await self.connection.send_json(payload)
+        await self.connection.send_str(dumps(payload))
 
+    @traced("call_http", "method", "action")
     async def call_http(
         self, method: Literal["get", "post", "multipart"], action: str, params: dict | None = None, raw: bool = False
     ):
@@ -63,14 +67,14 @@ class RedWsClientNetworking(RedNetworking, Service):
                 (self.config.http_endpoint / action).with_query(params or {}),
                 headers={"Authorization": f"Bearer {self.config.access_token}"},
             ) as resp:
-                return (await resp.content.read()) if raw else await resp.json(content_type=None)
+                return (await resp.content.read()) if raw else loads_body(await resp.read())
         if method == "post":
             async with self.session.post(
                 (self.config.http_endpoint / action),
                 json=params or {},
                 headers={"Authorization": f"Bearer {self.config.access_token}"},
             ) as resp:
-                return (await resp.content.read()) if raw else await resp.json(content_type=None)
+                return (await resp.content.read()) if raw else loads_body(await resp.read())
         if method == "multipart":
             data = aiohttp.FormData(quote_fields=False)
             if params is None:
@@ -86,7 +90,7 @@ class RedWsClientNetworking(RedNetworking, Service):
                 data=data,
                 headers={"Authorization": f"Bearer {self.config.access_token}"},
             ) as resp:
-                return (await resp.content.read()) if raw else await resp.json(content_type=None)
+                return (await resp.content.read()) if raw else loads_body(await resp.read())
         raise ValueError(f"Unknown method {method}")
 
     async def wait_for_available(self):
@@ -150,16 +154,18 @@ class RedWsClientNetworking(RedNetworking, Service):
                             await avilla.broadcast.postEvent(AccountUnavailable(avilla, avilla.accounts[n].account))
                         self.account = None
                         await asyncio.sleep(5)
+                        count_reconnect(self.protocol.avilla.metrics, "red")
                         logger.info(f"{self} Reconnecting...")
                         continue
             except Exception as e:
                 logger.error(f"{self} Error while connecting: {e}")
                 await asyncio.sleep(5)
+                count_reconnect(self.protocol.avilla.metrics, "red")
                 logger.info(f"{self} Reconnecting...")
 
     async def launch(self, manager: Launart):
         async with self.stage("preparing"):
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(json_serialize=dumps)
 
         async with self.stage("blocking"):
             await self.connection_daemon(manager, self.session)
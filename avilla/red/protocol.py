@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import InitVar, dataclass, field
+from pathlib import Path
 
 from yarl import URL
 
 from avilla.core.application import Avilla
 from avilla.core.protocol import BaseProtocol, ProtocolConfig
-from graia.ryanvk import merge, ref
+from avilla.core.ryanvk.lazy import lazy_merge
+from graia.ryanvk import ref
 
 from .net.ws_client import RedWsClientNetworking
 from .service import RedService
@@ -28,6 +30,9 @@ class RedConfig(ProtocolConfig):
         self.http_endpoint = URL.build(scheme="http", host=_http_host or self.host, port=self.port)
 
 
+MANIFEST = Path(__file__).with_name("perform_manifest.json")
+
+
 def _import_performs():  # noqa: F401
     # isort: off
 
@@ -61,25 +66,24 @@ def _import_performs():  # noqa: F401
 class RedProtocol(BaseProtocol):
     service: RedService
 
-    _import_performs()
-    artifacts = {
-        **merge(
-            ref("avilla.protocol/red::context"),
-            ref("avilla.protocol/red::query"),
-            ref("avilla.protocol/red::resource_fetch"),
-            ref("avilla.protocol/red::action", "message"),
-            ref("avilla.protocol/red::action", "friend"),
-            ref("avilla.protocol/red::action", "group"),
-            ref("avilla.protocol/red::action", "member"),
-            ref("avilla.protocol/red::message", "deserialize"),
-            ref("avilla.protocol/red::message", "serialize"),
-            ref("avilla.protocol/red::event", "message"),
-            ref("avilla.protocol/red::event", "lifespan"),
-            ref("avilla.protocol/red::event", "relationship"),
-            ref("avilla.protocol/red::event", "group"),
-            ref("avilla.protocol/red::event", "member"),
-        ),
-    }
+    artifacts = lazy_merge(
+        MANIFEST,
+        _import_performs,
+        ref("avilla.protocol/red::context"),
+        ref("avilla.protocol/red::query"),
+        ref("avilla.protocol/red::resource_fetch"),
+        ref("avilla.protocol/red::action", "message"),
+        ref("avilla.protocol/red::action", "friend"),
+        ref("avilla.protocol/red::action", "group"),
+        ref("avilla.protocol/red::action", "member"),
+        ref("avilla.protocol/red::message", "deserialize"),
+        ref("avilla.protocol/red::message", "serialize"),
+        ref("avilla.protocol/red::event", "message"),
+        ref("avilla.protocol/red::event", "lifespan"),
+        ref("avilla.protocol/red::event", "relationship"),
+        ref("avilla.protocol/red::event", "group"),
+        ref("avilla.protocol/red::event", "member"),
+    )
 
     def __init__(self):
         self.service = RedService(self)
@@ -9,6 +9,7 @@ from satori.model import Event
 
 from avilla.core.event import AvillaEvent
 from avilla.core.ryanvk.collector.application import ApplicationCollector
+from avilla.core.tracing import span
 from avilla.standard.core.application.event import AvillaLifecycleEvent
 from graia.ryanvk import Fn, PredicateOverload, TypeOverload
 
@@ -29,8 +30,9 @@ class SatoriCapability((m := ApplicationCollector())._):
     async def deserialize(self, content: str):
         elements = []
 
-        for raw_element in transform(parse(content)):
-            elements.append(await self.deserialize_element(raw_element))
+        with span("deserialize_chain"):
+            for raw_element in transform(parse(content)):
+                elements.append(await self.deserialize_element(raw_element))
 
         return MessageChain(elements)
 
@@ -43,13 +45,14 @@ class SatoriCapability((m := ApplicationCollector())._):
         return "".join(chain)
 
     async def handle_event(self, event: Event):
-        maybe_event = await self.event_callback(event)
+        with span("event_callback"):
+            maybe_event = await self.event_callback(event)
 
         if maybe_event is not None:
             if isinstance(maybe_event, list):
                 for _event in maybe_event:
                     self.avilla.event_record(_event)
-                    self.avilla.broadcast.postEvent(_event)
+                    self.avilla.event_pipeline.dispatch(_event, self.avilla.broadcast.postEvent)
             else:
                 self.avilla.event_record(maybe_event)
-                self.avilla.broadcast.postEvent(maybe_event)
+                self.avilla.event_pipeline.dispatch(maybe_event, self.avilla.broadcast.postEvent)
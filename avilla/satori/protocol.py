@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from satori.config import WebsocketsInfo
 from satori.client.network.websocket import WsNetwork
 
 from avilla.core.application import Avilla
 from avilla.core.protocol import BaseProtocol, ProtocolConfig
-from graia.ryanvk import merge, ref
+from avilla.core.ryanvk.lazy import lazy_merge
+from graia.ryanvk import ref
 
 from .service import SatoriService
 
@@ -17,6 +20,9 @@ class SatoriConfig(ProtocolConfig, WebsocketsInfo):
 SatoriService.register_config(SatoriConfig, WsNetwork)
 
 
+MANIFEST = Path(__file__).with_name("perform_manifest.json")
+
+
 def _import_performs():
     import avilla.satori.perform.action.message  # noqa: F401
     import avilla.satori.perform.action.request  # noqa: F401
@@ -34,23 +40,22 @@ def _import_performs():
 
 class SatoriProtocol(BaseProtocol):
     service: SatoriService
-    _import_performs()
-    artifacts = {
-        **merge(
-            ref("avilla.protocol/satori::action", "message"),
-            ref("avilla.protocol/satori::action", "request"),
-            ref("avilla.protocol/satori::context"),
-            ref("avilla.protocol/satori::resource_fetch"),
-            ref("avilla.protocol/satori::message", "deserialize"),
-            ref("avilla.protocol/satori::message", "serialize"),
-            ref("avilla.protocol/satori::event", "message"),
-            ref("avilla.protocol/satori::event", "lifespan"),
-            ref("avilla.protocol/satori::event", "activity"),
-            ref("avilla.protocol/satori::event", "metadata"),
-            ref("avilla.protocol/satori::event", "relationship"),
-            ref("avilla.protocol/satori::event", "request"),
-        ),
-    }
+    artifacts = lazy_merge(
+        MANIFEST,
+        _import_performs,
+        ref("avilla.protocol/satori::action", "message"),
+        ref("avilla.protocol/satori::action", "request"),
+        ref("avilla.protocol/satori::context"),
+        ref("avilla.protocol/satori::resource_fetch"),
+        ref("avilla.protocol/satori::message", "deserialize"),
+        ref("avilla.protocol/satori::message", "serialize"),
+        ref("avilla.protocol/satori::event", "message"),
+        ref("avilla.protocol/satori::event", "lifespan"),
+        ref("avilla.protocol/satori::event", "activity"),
+        ref("avilla.protocol/satori::event", "metadata"),
+        ref("avilla.protocol/satori::event", "relationship"),
+        ref("avilla.protocol/satori::event", "request"),
+    )
 
     def __init__(self):
         self.service = SatoriService(self)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 from contextlib import suppress
 from typing import TYPE_CHECKING
 
@@ -35,6 +34,7 @@ class SatoriService(App):
 
     def __init__(self, protocol: SatoriProtocol):
         self.protocol = protocol
+        self._staff = None
         self._accounts = {}
         super().__init__()
         self.register(self.handle_event)
@@ -48,7 +48,10 @@ class SatoriService(App):
 
     @property
     def staff(self):
-        return Staff(self.get_staff_artifacts(), self.get_staff_components())
+        artifacts = self.get_staff_artifacts()
+        if self._staff is None or not self._staff.is_built_on(artifacts):
+            self._staff = Staff(artifacts, self.get_staff_components())
+        return self._staff
 
     async def handle_event(self, account: Account, event: Event):
         async def event_parse_task(connection: Account, raw: Event):
@@ -58,7 +61,13 @@ class SatoriService(App):
 
             logger.warning(f"received unsupported event {raw.type}: {raw}")
 
-        asyncio.create_task(event_parse_task(account, event))
+        # satori-python 已完成解码, 因此 trace 中没有 decode span.
+        self.protocol.avilla.tracer.start("satori")
+        if (capture := self.protocol.avilla.event_capture) is not None:
+            capture.write("satori", event.dump(), account=account.identity)
+        await self.protocol.avilla.event_pipeline.put(
+            event_parse_task, account, event, kind=event.type, source="satori"
+        )
 
     async def handle_lifecycle(self, account: Account, state: LoginStatus):
         if state == LoginStatus.ONLINE:
@@ -0,0 +1,95 @@
+"""运行 `benchmarks.suite` 中的所有用例.
+
+    python -m benchmarks [--filter chain] [--json result.json] [--compare baseline.json] [--threshold 0.1]
+
+指定 --compare 时, 比基准慢超过 threshold 的用例会被列出, 并以退出码 1 结束.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .suite import Case, Skipped, collect
+
+
+def run_case(case: Case, repeat: int) -> dict[str, Any]:
+    case.func()
+    timings = timeit.repeat(case.func, number=case.number, repeat=repeat)
+    best = min(timings) / case.number * 1e9
+    mean = sum(timings) / len(timings) / case.number * 1e9
+    return {"ns_per_call": best, "mean_ns_per_call": mean, "number": case.number, "repeat": repeat}
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return
+    return result.stdout.strip()
+
+
+def compare(results: dict[str, dict[str, Any]], baseline_path: Path, threshold: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    regressions = []
+    print(f"== compared with {baseline_path}")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["ns_per_call"] / baseline[key]["ns_per_call"]
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  REGRESSION"
+            regressions.append(key)
+        print(f"  {key:<56} x{ratio:.2f}{mark}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="run the core hot path benchmarks")
+    parser.add_argument("--filter", default="", help="only run cases whose key contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write results as json")
+    parser.add_argument("--compare", type=Path, help="baseline json to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown before reporting a regression")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    results: dict[str, dict[str, Any]] = {}
+    skipped: dict[str, str] = {}
+    for case in collect():
+        if isinstance(case, Skipped):
+            skipped[case.group] = case.reason
+            print(f"-- {case.group} skipped: {case.reason}")
+            continue
+        if args.filter not in case.key:
+            continue
+        results[case.key] = result = run_case(case, args.repeat)
+        print(f"  {case.key:<56} {result['ns_per_call']:>12.1f} ns/call")
+
+    if args.json is not None:
+        report = {
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "revision": git_revision(),
+            "results": results,
+            "skipped": skipped,
+        }
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare is not None and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
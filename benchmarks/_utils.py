@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable
+
+
+def measure(func: Callable[[], object], *, number: int = 20000, repeat: int = 5) -> float:
+    """返回单次调用的最优耗时 (纳秒)."""
+    func()
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def report(title: str, results: dict[str, float], *, relative: bool = True) -> None:
+    """打印结果; relative 时以第一项为基准给出加速比."""
+    print(f"== {title}")
+    baseline = next(iter(results.values()))
+    width = max(map(len, results))
+    for name, cost in results.items():
+        suffix = f"  x{baseline / cost:.2f}" if relative else ""
+        print(f"  {name:<{width}}  {cost:>10.1f} ns/call{suffix}")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable
+
+from avilla.core.codec import BACKENDS, JSONCodec
+
+from ._utils import measure, report
+
+# 取自 OneBot 11 与 QQ 开放平台的真实推送, 仅替换了 id.
+PAYLOADS: dict[str, dict] = {
+    "onebot group message": {
+        "time": 1700000000,
+        "self_id": 123456789,
+        "post_type": "message",
+        "message_type": "group",
+        "sub_type": "normal",
+        "message_id": -2147483000,
+        "group_id": 987654321,
+        "user_id": 111222333,
+        "anonymous": None,
+        "message": [
+            {"type": "reply", "data": {"id": "-2147482999"}},
+            {"type": "at", "data": {"qq": "123456789"}},
+            {"type": "text", "data": {"text": " 今天的天气怎么样? "}},
+            {"type": "image", "data": {"file": "0a1b2c3d4e5f.image", "url": "https://example.com/0a1b2c3d4e5f"}},
+        ],
+        "raw_message": "[CQ:reply,id=-2147482999][CQ:at,qq=123456789] 今天的天气怎么样? [CQ:image,file=0a1b2c3d4e5f.image]",
+        "font": 0,
+        "sender": {
+            "user_id": 111222333,
+            "nickname": "示例用户",
+            "card": "",
+            "sex": "unknown",
+            "age": 0,
+            "area": "",
+            "level": "1",
+            "role": "member",
+            "title": "",
+        },
+    },
+    "onebot heartbeat": {
+        "time": 1700000000,
+        "self_id": 123456789,
+        "post_type": "meta_event",
+        "meta_event_type": "heartbeat",
+        "status": {"online": True, "good": True},
+        "interval": 5000,
+    },
+    "onebot member list": {
+        "status": "ok",
+        "retcode": 0,
+        "echo": "42",
+        "data": [
+            {
+                "group_id": 987654321,
+                "user_id": 100000000 + i,
+                "nickname": f"成员{i}",
+                "card": "",
+                "role": "member",
+                "join_time": 1600000000 + i,
+                "last_sent_time": 1700000000 - i,
+                "level": "1",
+            }
+            for i in range(200)
+        ],
+    },
+    "qqapi group at message": {
+        "op": 0,
+        "s": 42,
+        "t": "GROUP_AT_MESSAGE_CREATE",
+        "id": "GROUP_AT_MESSAGE_CREATE:0a1b2c3d4e5f",
+        "d": {
+            "author": {"id": "A1B2C3D4E5F6", "member_openid": "A1B2C3D4E5F6"},
+            "content": " /help",
+            "group_id": "G1H2I3J4K5L6",
+            "group_openid": "G1H2I3J4K5L6",
+            "id": "ROBOT1.0_0a1b2c3d4e5f",
+            "timestamp": "2024-01-01T00:00:00+08:00",
+        },
+    },
+}
+
+
+def load_recorded(path: Path) -> dict[str, bytes]:
+    """读取每行一个 JSON 的文件, 作为额外的一组负载."""
+    lines = [line for line in path.read_bytes().splitlines() if line.strip()]
+    return {f"{path.name} ({len(lines)} lines)": b"\n".join(lines)}
+
+
+def available_codecs() -> dict[str, JSONCodec]:
+    codecs = {}
+    for name, factory in BACKENDS.items():
+        try:
+            codecs[name] = factory()
+        except ImportError:
+            print(f"-- {name} is not installed, skipped")
+    # 以标准库为基准.
+    return {name: codecs[name] for name in sorted(codecs, key=lambda name: name != "json")}
+
+
+def compare(codecs: dict[str, JSONCodec], func: Callable[[JSONCodec], object]) -> dict[str, float]:
+    return {name: measure(lambda codec=codec: func(codec), number=2000) for name, codec in codecs.items()}
+
+
+def main(argv: list[str]):
+    codecs = available_codecs()
+    frames = {name: codecs["json"].dumpb(payload) for name, payload in PAYLOADS.items()}
+    for path in argv:
+        frames.update(load_recorded(Path(path)))
+
+    for name, frame in frames.items():
+        lines = frame.split(b"\n")
+        text = [line.decode("utf-8") for line in lines]
+        objects = [codecs["json"].loads(line) for line in lines]
+        title = f"{name} ({len(frame)} bytes)"
+        report(f"loads bytes: {title}", compare(codecs, lambda codec: [codec.loads(i) for i in lines]))
+        report(f"loads str: {title}", compare(codecs, lambda codec: [codec.loads(i) for i in text]))
+        report(f"dumps: {title}", compare(codecs, lambda codec: [codec.dumps(i) for i in objects]))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections import ChainMap
+
+from avilla.core.builtins.capability import CoreCapability
+from avilla.core.selector import Selector
+from avilla.elizabeth.protocol import ElizabethProtocol
+from avilla.onebot.v11.capability import OneBot11Capability
+from avilla.onebot.v11.protocol import OneBot11Protocol
+from avilla.standard.core.profile import Nick
+from graia.ryanvk import Fn, Staff
+from graia.ryanvk.sign import FnImplement
+from graia.ryanvk.snapshot import get_artifact_snapshot
+
+from ._utils import measure, report
+
+STAFF = Staff([OneBot11Protocol.artifacts], {})
+ELIZABETH_STAFF = Staff([ElizabethProtocol.artifacts], {})
+RAW_ELEMENT = {"type": "text", "data": {"text": "hello"}}
+TARGET = Selector().land("qq").group("123456789").member("987654321")
+GROUP = TARGET.into("::group")
+
+
+def resolve(fn: Fn, *args, **kwargs):
+    return fn.behavior.harvest_overload(STAFF, fn, *args, **kwargs)
+
+
+def resolve_with(staff: Staff, fn: Fn, *args, **kwargs):
+    return fn.behavior.harvest_overload(staff, fn, *args, **kwargs)
+
+
+def uncached(fn: Fn, *args, **kwargs):
+    fn.resolution_cache.clear()
+    return resolve(fn, *args, **kwargs)
+
+
+def drive(coro):
+    """同步驱动一个不会真正挂起的协程."""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("coroutine suspended")
+
+
+def with_bind(fn: Fn, func):
+    def wrapper():
+        extractor, fn.argument_extractor = fn.argument_extractor, None
+        try:
+            return func()
+        finally:
+            fn.argument_extractor = extractor
+
+    return wrapper
+
+
+def main():
+    deserialize = lambda: drive(STAFF.call_fn(OneBot11Capability.deserialize_element, RAW_ELEMENT))  # noqa: E731
+    pull = lambda: resolve_with(ELIZABETH_STAFF, CoreCapability.pull, GROUP, Nick)  # noqa: E731
+    report(
+        "Staff.call_fn(OneBot11Capability.deserialize_element)",
+        {
+            "Signature.bind": measure(with_bind(OneBot11Capability.deserialize_element, deserialize)),
+            "argument extractor": measure(deserialize),
+        },
+    )
+    report(
+        "CoreCapability.pull resolution (elizabeth, land.group + Nick)",
+        {
+            "Signature.bind": measure(with_bind(CoreCapability.pull, pull)),
+            "argument extractor": measure(pull),
+        },
+    )
+    layers = [{}, OneBot11Protocol.artifacts, {}]
+    implement = FnImplement(CoreCapability.get_context)
+    chain = ChainMap(*layers)
+    staff = Staff(layers, {})
+    report(
+        "artifact map build (3 layers)",
+        {
+            "ChainMap": measure(lambda: ChainMap(*layers)),
+            "flat snapshot": measure(lambda: get_artifact_snapshot(layers)),
+        },
+    )
+    report(
+        "artifact lookup (3 layers)",
+        {
+            "ChainMap": measure(lambda: chain.get(implement)),
+            "flat snapshot": measure(lambda: staff.artifact_map.get(implement)),
+        },
+    )
+    report(
+        "OneBot11Capability.deserialize_element resolution",
+        {
+            "uncached": measure(lambda: uncached(OneBot11Capability.deserialize_element, RAW_ELEMENT)),
+            "cached": measure(lambda: resolve(OneBot11Capability.deserialize_element, RAW_ELEMENT)),
+        },
+    )
+    report(
+        "CoreCapability.get_context resolution (land.group.member)",
+        {
+            "uncached": measure(lambda: uncached(CoreCapability.get_context, TARGET)),
+            "cached": measure(lambda: resolve(CoreCapability.get_context, TARGET)),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
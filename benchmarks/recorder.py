@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from loguru import logger
+
+from avilla.core.account import AccountInfo
+from avilla.core.application import Avilla
+from avilla.core.context import Context
+from avilla.core.elements import Text
+from avilla.core.message import Message
+from avilla.core.platform import Abstract, Land, Platform
+from avilla.core.recorder import EventRecorder
+from avilla.core.selector import Selector
+from avilla.onebot.v11.account import OneBot11Account
+from avilla.onebot.v11.protocol import OneBot11Protocol
+from avilla.standard.core.message import MessageReceived
+from graia.amnesia.message import MessageChain
+
+from ._utils import measure, report
+
+
+def build_event(**options) -> MessageReceived:
+    avilla = Avilla(**options)
+    protocol = OneBot11Protocol()
+    avilla.apply_protocols(protocol)
+    route = Selector().land("qq").account("123456789")
+    account = OneBot11Account(route, protocol)
+    avilla.accounts[route] = AccountInfo(route, account, protocol, Platform(Land("qq"), Abstract("onebot/v11")))
+    group = Selector().land("qq").group("987654321")
+    member = group.member("111222333")
+    context = Context(account, member, group, group, group.member(route["account"]))
+    message = Message("42", group, member, MessageChain([Text("今天的天气怎么样? " * 4)]), datetime.now())
+    return MessageReceived(context, message)
+
+
+def legacy_record(event: MessageReceived):
+    """改动前 Avilla.event_record 中 MessageReceived 所走的路径."""
+    from avilla.core.event import MetadataModified
+    from avilla.standard.core.account.event import AccountStatusChanged
+    from avilla.standard.core.activity import ActivityEvent
+    from avilla.standard.core.application import AvillaLifecycleEvent
+    from avilla.standard.core.message import MessageEdited, MessageSent
+    from avilla.standard.core.request import RequestEvent
+
+    if isinstance(event, AccountStatusChanged):
+        return
+    if isinstance(event, AvillaLifecycleEvent):
+        return
+    context = event.context
+    context.client.display
+    scene = context.scene.display
+    context.endpoint.display
+    if isinstance(event, MessageSent):
+        return
+    if isinstance(event, (RequestEvent, ActivityEvent, MetadataModified)):
+        return
+    assert not isinstance(event, MessageEdited)
+    logger.info(
+        f"[{context.account.info.protocol.__class__.__name__.replace('Protocol', '')} "
+        f"{context.account.route['account']}]: "
+        f"{scene} -> {str(event.message.content)!r}"
+    )
+
+
+def main():
+    event = build_event()
+    recorder = EventRecorder()
+    disabled = EventRecorder(enabled=False)
+    logger.remove()
+    for level in ("INFO", "WARNING"):
+        handler = logger.add(lambda _: None, level=level)
+        report(
+            f"record MessageReceived (sink level {level})",
+            {
+                "isinstance chain": measure(lambda: legacy_record(event)),
+                "EventRecorder": measure(lambda: recorder.record(event)),
+                "EventRecorder(enabled=False)": measure(lambda: disabled.record(event)),
+            },
+        )
+        logger.remove(handler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""回放 `avilla.core.capture.EventCapture` 录制的原始事件.
+
+事件经过与线上相同的 perform (event_callback), EventRecorder 与 broadcast, 但连接是不访问网络的假连接,
+perform 中发起的 API 调用一律返回 None. 回放时会移除 loguru 的所有 sink.
+
+    python -m benchmarks.replay capture.jsonl.gz [--speed 1] [--repeat 3] [--allocations] [--json result.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from avilla.core.account import AccountInfo
+from avilla.core.application import Avilla
+from avilla.core.capture import CapturedEvent, read_capture
+from avilla.core.codec import dumpb, loads
+from avilla.core.platform import Abstract, Land, Platform
+from avilla.core.selector import Selector
+
+STAGES = ("decode", "parse", "record", "dispatch")
+
+
+class Replayer:
+    """把某个协议的录制事件交给对应的 event_callback."""
+
+    def __init__(self, avilla: Avilla) -> None:
+        self.avilla = avilla
+
+    async def parse(self, account: str | None, args: list[Any]) -> Any:
+        raise NotImplementedError
+
+
+class OneBot11Replayer(Replayer):
+    def __init__(self, avilla: Avilla) -> None:
+        from avilla.onebot.v11.net.base import OneBot11Networking
+        from avilla.onebot.v11.protocol import OneBot11Protocol
+
+        class ReplayConnection(OneBot11Networking):
+            alive = True
+
+            async def wait_for_available(self):
+                return
+
+            async def send(self, payload: dict):
+                return
+
+            async def call(self, action: str, params: dict | None = None):
+                return
+
+        super().__init__(avilla)
+        self.protocol = OneBot11Protocol()
+        avilla.apply_protocols(self.protocol)
+        self.connection = ReplayConnection(self.protocol)
+
+    def ensure_account(self, self_id: int):
+        from avilla.onebot.v11.account import OneBot11Account
+
+        if self_id in self.connection.accounts:
+            return
+        account = OneBot11Account(Selector().land("qq").account(str(self_id)), self.protocol)
+        account.connection = self.connection
+        self.connection.accounts[self_id] = account
+        self.avilla.accounts[account.route] = AccountInfo(
+            account.route, account, self.protocol, Platform(Land("qq"), Abstract("onebot/v11"))
+        )
+
+    async def parse(self, account: str | None, args: list[Any]):
+        from avilla.onebot.v11.capability import OneBot11Capability
+
+        raw = args[0]
+        if "self_id" in raw:
+            self.ensure_account(raw["self_id"])
+        return await OneBot11Capability(self.connection.staff).event_callback(raw)
+
+
+class ElizabethReplayer(Replayer):
+    def __init__(self, avilla: Avilla) -> None:
+        from avilla.elizabeth.connection.base import ElizabethNetworking
+        from avilla.elizabeth.protocol import ElizabethProtocol
+
+        class ReplayConnection(ElizabethNetworking):
+            alive = True
+
+            async def wait_for_available(self):
+                return
+
+            async def send(self, payload: dict):
+                return
+
+            async def call(self, method, action: str, params: dict | None = None, *, session: bool = True):
+                return
+
+        super().__init__(avilla)
+        self.connection_type = ReplayConnection
+        self.protocol = ElizabethProtocol()
+        avilla.apply_protocols(self.protocol)
+
+    def get_connection(self, account_id: str):
+        from avilla.elizabeth.account import ElizabethAccount
+        from avilla.elizabeth.const import PLATFORM
+
+        if (connection := self.protocol.service.account_map.get(int(account_id))) is None:
+            connection = self.protocol.service.account_map[int(account_id)] = self.connection_type(self.protocol)
+            connection.account_id = int(account_id)
+            route = Selector().land("qq").account(account_id)
+            account = ElizabethAccount(route, self.protocol)
+            self.avilla.accounts[route] = AccountInfo(route, account, self.protocol, PLATFORM)
+        return connection
+
+    async def parse(self, account: str | None, args: list[Any]):
+        from avilla.elizabeth.capability import ElizabethCapability
+
+        return await ElizabethCapability(self.get_connection(account or "0").staff).event_callback(args[0])
+
+
+class RedReplayer(Replayer):
+    def __init__(self, avilla: Avilla) -> None:
+        from avilla.red.net.base import RedNetworking
+        from avilla.red.protocol import RedProtocol
+
+        class ReplayConnection(RedNetworking):
+            alive = True
+
+            async def wait_for_available(self):
+                return
+
+            async def send(self, payload: dict):
+                return
+
+            async def call(self, action: str, params: dict | None = None):
+                return
+
+            async def call_http(self, method, action: str, params: dict | None = None, raw: bool = False):
+                return
+
+        super().__init__(avilla)
+        self.protocol = RedProtocol()
+        avilla.apply_protocols(self.protocol)
+        self.connection = ReplayConnection(self.protocol)
+
+    def ensure_account(self, account_id: str):
+        from avilla.red.account import RedAccount
+
+        if self.connection.account is not None:
+            return
+        route = Selector().land("qq").account(account_id)
+        account = RedAccount(route, self.protocol)
+        account.websocket_client = self.connection
+        self.connection.account = account
+        self.avilla.accounts[route] = AccountInfo(route, account, self.protocol, Platform(Land("qq"), Abstract("red")))
+
+    async def parse(self, account: str | None, args: list[Any]):
+        from avilla.red.capability import RedCapability
+
+        if account is not None:
+            self.ensure_account(account)
+        return await RedCapability(self.connection.staff).event_callback(*args)
+
+
+class QQAPIReplayer(Replayer):
+    def __init__(self, avilla: Avilla) -> None:
+        from avilla.qqapi.connection.base import QQAPINetworking
+        from avilla.qqapi.protocol import QQAPIProtocol
+
+        class ReplayConnection(QQAPINetworking):
+            alive = True
+
+            async def wait_for_available(self):
+                return
+
+            async def send(self, payload: dict, shard: tuple[int, int]):
+                return
+
+            async def call_http(self, method, action: str, params: dict | None = None):
+                return {}
+
+        super().__init__(avilla)
+        self.connection_type = ReplayConnection
+        self.protocol = QQAPIProtocol()
+        avilla.apply_protocols(self.protocol)
+
+    def get_connection(self, app_id: str):
+        from avilla.qqapi.account import QQAPIAccount
+        from avilla.qqapi.const import PLATFORM
+
+        if (account := self.protocol.service.accounts.get(app_id)) is None:
+            route = Selector().land("qqapi").account(app_id)
+            account = self.protocol.service.accounts[app_id] = QQAPIAccount(route, self.protocol)
+            account.connection = self.connection_type(self.protocol, None, app_id, "")  # type: ignore
+            self.avilla.accounts[route] = AccountInfo(route, account, self.protocol, PLATFORM)
+        return account.connection
+
+    async def parse(self, account: str | None, args: list[Any]):
+        from avilla.qqapi.capability import QQAPICapability
+
+        return await QQAPICapability(self.get_connection(account or "0").staff).event_callback(*args)
+
+
+REPLAYERS: dict[str, type[Replayer]] = {
+    "onebot/v11": OneBot11Replayer,
+    "elizabeth": ElizabethReplayer,
+    "red": RedReplayer,
+    "qqapi": QQAPIReplayer,
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+@dataclass
+class ReplayResult:
+    events: int = 0
+    elapsed: float = 0.0
+    outcomes: Counter[str] = field(default_factory=Counter)
+    latencies: dict[str, list[float]] = field(default_factory=lambda: {stage: [] for stage in STAGES})
+    retained_blocks: int = 0
+    traced_peak: int | None = None
+    top_allocations: list[str] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "elapsed": self.elapsed,
+            "events_per_second": self.events_per_second,
+            "outcomes": dict(self.outcomes),
+            "stages": {
+                stage: {
+                    "count": len(values),
+                    "p50_us": percentile(values, 0.5) * 1e6,
+                    "p90_us": percentile(values, 0.9) * 1e6,
+                    "p99_us": percentile(values, 0.99) * 1e6,
+                    "max_us": max(values, default=0.0) * 1e6,
+                }
+                for stage, values in self.latencies.items()
+            },
+            "retained_blocks_per_event": self.retained_blocks / self.events if self.events else 0.0,
+            "traced_peak_bytes": self.traced_peak,
+            "top_allocations": self.top_allocations,
+        }
+
+
+async def replay(
+    records: list[CapturedEvent],
+    *,
+    speed: float = 0.0,
+    repeat: int = 1,
+    warmup: int = 100,
+    dispatch: bool = True,
+    allocations: bool = False,
+) -> ReplayResult:
+    """speed 为 0 时尽快回放, 否则按录制时的间隔除以 speed 回放; 前 warmup 个事件先不计时地回放一次."""
+    avilla = Avilla()
+    replayers: dict[str, Replayer] = {}
+    for protocol in {record.protocol for record in records}:
+        if protocol in REPLAYERS:
+            replayers[protocol] = REPLAYERS[protocol](avilla)
+
+    frames = [(record, dumpb(record.args)) for record in records]
+    result = ReplayResult()
+    lat = result.latencies
+
+    async def feed(record: CapturedEvent, frame: bytes, measured: bool):
+        if (replayer := replayers.get(record.protocol)) is None:
+            if measured:
+                result.outcomes["skipped"] += 1
+            return
+
+        t0 = time.perf_counter()
+        args = loads(frame)
+        t1 = time.perf_counter()
+        try:
+            event = await replayer.parse(record.account, args)
+        except NotImplementedError:
+            event, outcome = None, "unsupported"
+        except Exception as e:
+            event, outcome = None, f"failed: {type(e).__name__}"
+        else:
+            outcome = "ignored" if event is None else "parsed"
+        t2 = time.perf_counter()
+        if measured:
+            result.events += 1
+            result.outcomes[outcome] += 1
+            lat["decode"].append(t1 - t0)
+            lat["parse"].append(t2 - t1)
+
+        for item in event if isinstance(event, list) else [] if event is None else [event]:
+            t3 = time.perf_counter()
+            avilla.event_record(item)
+            t4 = time.perf_counter()
+            if dispatch:
+                with suppress(Exception):
+                    await avilla.broadcast.postEvent(item)
+            if measured:
+                lat["record"].append(t4 - t3)
+                if dispatch:
+                    lat["dispatch"].append(time.perf_counter() - t4)
+
+    for record, frame in frames[:warmup]:
+        await feed(record, frame, False)
+
+    gc.collect()
+    if allocations:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+    blocks = sys.getallocatedblocks()
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        origin = records[0].time if records else 0.0
+        loop_started = time.perf_counter()
+        for record, frame in frames:
+            if speed > 0:
+                delay = (record.time - origin) / speed - (time.perf_counter() - loop_started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await feed(record, frame, True)
+
+    result.elapsed = time.perf_counter() - started
+    result.retained_blocks = sys.getallocatedblocks() - blocks
+    if allocations:
+        result.traced_peak = tracemalloc.get_traced_memory()[1]
+        stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+        result.top_allocations = [str(stat) for stat in stats[:10]]
+        tracemalloc.stop()
+    return result
+
+
+def print_result(result: ReplayResult):
+    summary = result.summary()
+    print(f"== replayed {result.events} events in {result.elapsed:.3f}s ({result.events_per_second:,.0f} events/s)")
+    for outcome, count in sorted(result.outcomes.items()):
+        print(f"  {outcome:<24} {count}")
+    print(f"  {'stage':<10} {'count':>8} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}  (us)")
+    for stage, stats in summary["stages"].items():
+        print(
+            f"  {stage:<10} {stats['count']:>8} {stats['p50_us']:>10.1f} {stats['p90_us']:>10.1f} "
+            f"{stats['p99_us']:>10.1f} {stats['max_us']:>10.1f}"
+        )
+    print(f"  retained blocks/event: {summary['retained_blocks_per_event']:.1f}")
+    if result.traced_peak is not None:
+        print(f"  traced peak: {result.traced_peak / 1024:.1f} KiB")
+        for line in result.top_allocations:
+            print(f"    {line}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description="replay a raw event capture")
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--speed", type=float, default=0.0, help="0 replays as fast as possible")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=100, help="events replayed before measuring")
+    parser.add_argument("--no-dispatch", action="store_true", help="skip broadcast dispatch")
+    parser.add_argument("--allocations", action="store_true", help="trace allocations (slow)")
+    parser.add_argument("--json", type=Path, help="write the summary as json")
+    args = parser.parse_args(argv)
+
+    records = list(read_capture(args.capture))
+    logger.remove()
+    result = asyncio.run(
+        replay(
+            records,
+            speed=args.speed,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            dispatch=not args.no_dispatch,
+            allocations=args.allocations,
+        )
+    )
+    print_result(result)
+    if args.json is not None:
+        args.json.write_text(json.dumps(result.summary(), indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
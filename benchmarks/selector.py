@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import tracemalloc
+
+from avilla.core.selector import FollowsPattern, Selector, SelectorPatternSet, _parse_follows
+
+from ._utils import measure, report
+
+PATTERN = "land(qq).group.member"
+SELECTOR = Selector().land("qq").group("123456789").member("987654321")
+
+
+def legacy_follows(selector: Selector, pattern: str) -> bool:
+    items = _parse_follows(pattern)
+    index = 0
+    for index, (item, name, value) in enumerate(zip(items, selector.pattern.keys(), selector.pattern.values())):
+        if item.name == "*":
+            return True
+        if item.name != name:
+            return False
+        if item.literal is not None and value != item.literal:
+            return False
+    return index + 1 == len(selector.pattern)
+
+
+def build() -> Selector:
+    return Selector().land("qq").group("123456789").member("987654321")
+
+
+def allocated_per_selector(count: int = 10000) -> float:
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    selectors = [build() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del selectors
+    return size / count
+
+
+def main():
+    compiled = FollowsPattern.compile(PATTERN)
+    report(
+        f"Selector.follows({PATTERN!r})",
+        {
+            "parse per call": measure(lambda: legacy_follows(SELECTOR, PATTERN)),
+            "cached string": measure(lambda: SELECTOR.follows(PATTERN)),
+            "precompiled": measure(lambda: compiled.matches(SELECTOR)),
+        },
+    )
+    report(
+        "Selector construction / derived properties",
+        {
+            "build land.group.member": measure(build),
+            "path": measure(lambda: SELECTOR.path),
+            "display": measure(lambda: SELECTOR.display),
+            "hash": measure(lambda: hash(SELECTOR)),
+        },
+        relative=False,
+    )
+    print(f"  retained memory: {allocated_per_selector():.0f} bytes/selector")
+    rules = [f"land(qq).group({i}).member" for i in range(1000)] + ["land(qq).group(123456789).member"]
+    compiled_rules = [FollowsPattern.compile(rule) for rule in rules]
+    pattern_set = SelectorPatternSet(rules)
+    report(
+        f"match one selector against {len(rules)} rules",
+        {
+            "per-pattern follows": measure(lambda: [rule for rule in compiled_rules if rule.matches(SELECTOR)], number=200),
+            "SelectorPatternSet": measure(lambda: pattern_set.matches(SELECTOR), number=200),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+from avilla.core.builtins.capability import CoreCapability
+from avilla.core.context import Context
+from avilla.core.elements import Notice, Text
+from avilla.core.message import Message
+from avilla.core.ryanvk.staff import Staff
+from avilla.core.selector import FollowsPattern, Selector
+from avilla.core.utilles.message_cache import MessageCache
+from avilla.standard.core.profile import Nick
+from graia.amnesia.message import MessageChain
+from launart import Launart
+
+from .dispatch import RAW_ELEMENT, STAFF, TARGET, drive, resolve
+from .recorder import build_event
+
+event = lru_cache(maxsize=None)(build_event)
+
+RED_RAW_CHAIN = [
+    {"type": "text", "content": "hello ", "atType": 0},
+    {"type": "text", "content": "@42", "atType": 2, "atNtUin": "42"},
+    {"type": "text", "content": " world", "atType": 0},
+]
+
+
+@dataclass
+class Case:
+    group: str
+    name: str
+    func: Callable[[], object]
+    number: int = 20000
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}/{self.name}"
+
+
+@dataclass
+class Skipped:
+    group: str
+    reason: str
+
+
+def selector_cases() -> Iterator[Case]:
+    selector = Selector().land("qq").group("123456789").member("987654321")
+    compiled = FollowsPattern.compile("land(qq).group.member")
+    yield Case("selector", "build", lambda: Selector().land("qq").group("123456789").member("987654321"))
+    yield Case("selector", "follows", lambda: selector.follows("land(qq).group.member"))
+    yield Case("selector", "follows precompiled", lambda: compiled.matches(selector))
+    yield Case("selector", "into", lambda: selector.into("::group"))
+
+
+def staff_cases() -> Iterator[Case]:
+    from avilla.onebot.v11.capability import OneBot11Capability
+
+    text = Text("hello")
+    yield Case("staff", "TargetOverload get_context", lambda: resolve(CoreCapability.get_context, TARGET))
+    yield Case("staff", "TypeOverload serialize_element", lambda: resolve(OneBot11Capability.serialize_element, text))
+    yield Case(
+        "staff",
+        "PredicateOverload deserialize_element",
+        lambda: resolve(OneBot11Capability.deserialize_element, RAW_ELEMENT),
+    )
+    yield Case(
+        "staff",
+        "call_fn deserialize_element",
+        lambda: drive(STAFF.call_fn(OneBot11Capability.deserialize_element, RAW_ELEMENT)),
+    )
+
+
+def context_cases() -> Iterator[Case]:
+    context = event().context
+    account, client, endpoint, scene, selft = (
+        context.account,
+        context.client,
+        context.endpoint,
+        context.scene,
+        context.self,
+    )
+    yield Case("context", "construct", lambda: Context(account, client, endpoint, scene, selft))
+
+
+def chain_cases() -> Iterator[Case | Skipped]:
+    context = event().context
+    avilla = context.account.avilla
+    chain = MessageChain([Text("hello "), Notice(context.scene.member("42")), Text(" world")])
+    protocols = [
+        (
+            "onebot11",
+            "avilla.onebot.v11",
+            "OneBot11Protocol",
+            "OneBot11Capability",
+            "serialize_chain",
+            "deserialize_chain",
+        ),
+        (
+            "elizabeth",
+            "avilla.elizabeth",
+            "ElizabethProtocol",
+            "ElizabethCapability",
+            "serialize_chain",
+            "deserialize_chain",
+        ),
+        ("red", "avilla.red", "RedProtocol", "RedCapability", "serialize", "deserialize"),
+        ("qqapi", "avilla.qqapi", "QQAPIProtocol", "QQAPICapability", "serialize", "deserialize"),
+        ("satori", "avilla.satori", "SatoriProtocol", "SatoriCapability", "serialize", "deserialize"),
+    ]
+    for name, package, protocol_name, capability_name, serialize, deserialize in protocols:
+        try:
+            protocol = getattr(__import__(f"{package}.protocol", fromlist=[protocol_name]), protocol_name)
+            capability_type = getattr(__import__(f"{package}.capability", fromlist=[capability_name]), capability_name)
+        except ImportError as e:
+            yield Skipped(f"chain {name}", repr(e))
+            continue
+        staff = Staff([protocol.artifacts, avilla.global_artifacts], {"context": context, "avilla": avilla})
+        capability = capability_type(staff)
+        raw = RED_RAW_CHAIN if name == "red" else drive(getattr(capability, serialize)(chain))
+        yield Case(
+            "chain",
+            f"{name} serialize",
+            lambda c=capability, f=serialize: drive(getattr(c, f)(chain)),
+            number=5000,
+        )
+        yield Case(
+            "chain",
+            f"{name} deserialize",
+            lambda c=capability, f=deserialize, r=raw: drive(getattr(c, f)(r)),
+            number=5000,
+        )
+
+
+def twilight_cases() -> Iterator[Case | Skipped]:
+    try:
+        from avilla.twilight.twilight import FullMatch, ParamMatch, Twilight, WildcardMatch
+    except ImportError as e:
+        yield Skipped("twilight", repr(e))
+        return
+    twilight = Twilight(FullMatch(".weather"), ParamMatch() @ "city", WildcardMatch(optional=True) @ "rest")
+    chain = MessageChain([Text(".weather 北京 明天 后天")])
+    yield Case("twilight", "generate", lambda: twilight.generate(chain), number=5000)
+
+
+def commands_cases() -> Iterator[Case | Skipped]:
+    try:
+        from arclet.alconna import config
+
+        from avilla.core.builtins.command import AvillaCommands
+    except ImportError as e:
+        yield Skipped("commands", repr(e))
+        return
+    config.command_max_count = max(config.command_max_count, 1000)
+    commands = AvillaCommands()
+
+    async def handler(arg: str):
+        ...
+
+    for i in range(500):
+        commands.on(f"cmd{i} {{arg}}")(handler)
+    text = "cmd250 hello"
+
+    def dispatch():
+        # 与 AvillaCommands 的 listener 相同: 先按前缀查找, 再逐个解析.
+        return [match.value[0].parse(text) for match in commands.trie.prefixes(text)]
+
+    yield Case("commands", "prefix lookup (500 commands)", lambda: list(commands.trie.prefixes(text)))
+    yield Case("commands", "lookup + parse (500 commands)", dispatch, number=5000)
+
+
+def message_cache_cases() -> Iterator[Case]:
+    received = event()
+    account = received.context.account.route
+    scene = received.context.scene
+    sender, content, time = received.message.sender, received.message.content, received.message.time
+    messages = [Message(str(i), scene, sender, content, time) for i in range(1000)]
+    selectors = [message.to_selector() for message in messages]
+    cache = MessageCache(300, 64 * 1024 * 1024)
+    for message in messages:
+        cache.push(account, message)
+    counter = iter(range(10**9))
+    writes = MessageCache(300, 64 * 1024 * 1024)
+
+    yield Case("message_cache", "push", lambda: writes.push(account, messages[next(counter) % 1000]))
+    # scene_size 为 300, 最早的消息已经被淘汰.
+    yield Case("message_cache", "get (hit)", lambda: cache.get(account, selectors[-1]))
+    yield Case("message_cache", "get (miss)", lambda: cache.get(account, selectors[0]))
+    yield Case("message_cache", "recent 20", lambda: cache.recent(account, scene, 20))
+
+
+def metadata_cache_cases() -> Iterator[Case]:
+    # 元数据缓存默认关闭, 这里单独开启.
+    context = build_event(launch_manager=Launart(), metadata_cache_size=4096).context
+    account, client, endpoint, scene, selft = (
+        context.account,
+        context.client,
+        context.endpoint,
+        context.scene,
+        context.self,
+    )
+    # 事件的 prelude 以普通 Selector 收集 metadata, 之后的事件通过 cx.client 读取.
+    context._collect_metadatas(Selector(client.pattern), Nick("nick", "nick", None))
+    later = Context(account, client, endpoint, scene, selft)
+    if drive(later.pull(Nick, later.client)) is None:
+        raise AssertionError("warmed metadata is not served to cx.client")
+
+    yield Case("metadata_cache", "pull via cx.client (hit)", lambda: drive(later.pull(Nick, later.client)))
+
+
+SUITES: list[Callable[[], Iterator[Case | Skipped]]] = [
+    selector_cases,
+    staff_cases,
+    context_cases,
+    chain_cases,
+    twilight_cases,
+    commands_cases,
+    message_cache_cases,
+    metadata_cache_cases,
+]
+
+
+def collect() -> Iterator[Case | Skipped]:
+    for suite in SUITES:
+        yield from suite()
@@ -4,10 +4,31 @@ from collections import ChainMap
 from itertools import chain
 from typing import Any
 
-from graia.ryanvk.typing import SupportsMerge
+from graia.ryanvk.typing import CallObserver, SupportsMerge
 
 GLOBAL_GALLERY = {}  # layout: {namespace: {identify: {...}}}, cover-mode.
 
+_artifact_version = 0
+
+call_observer: CallObserver | None = None
+
+
+def artifact_version() -> int:
+    return _artifact_version
+
+
+def bump_artifact_version() -> None:
+    """artifact 的内容发生变化 (collect / merge / inject 等) 时调用, 使依赖 artifact 的缓存失效."""
+    global _artifact_version
+    _artifact_version += 1
+
+
+def set_call_observer(observer: CallObserver | None) -> CallObserver | None:
+    """设置接收每次 `Staff.call_fn` 耗时与异常的观察者, 返回此前的观察者; 为 None 时不做任何计时."""
+    global call_observer
+    previous, call_observer = call_observer, observer
+    return previous
+
 
 def ref(namespace: str, identify: str | None = None) -> dict[Any, Any]:
     ns = GLOBAL_GALLERY.setdefault(namespace, {})
@@ -16,6 +37,8 @@ def ref(namespace: str, identify: str | None = None) -> dict[Any, Any]:
 
 
 def merge(*artifacts: dict[Any, Any]):
+    # 部分 overload 的 merge_scopes 会原地修改已有的 scope.
+    bump_artifact_version()
     chainmap = ChainMap(*artifacts)
     total_signatures = list(dict.fromkeys(chain(*[i.keys() for i in artifacts])))
     result = {}
@@ -4,11 +4,13 @@ from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 from typing_extensions import Concatenate, ParamSpec
 
+from ._runtime import artifact_version
 from .sign import FnImplement, FnRecord
 
 if TYPE_CHECKING:
     from .collector import BaseCollector
     from .fn import Fn
+    from .overload import FnOverload
     from .perform import BasePerform
     from .staff import Staff
 
@@ -18,9 +20,42 @@ R = TypeVar("R", covariant=True)
 P = ParamSpec("P")
 
 
+class ResolutionCache:
+    """Fn 的 overload 解析结果缓存, 在 artifact 版本变化时整体失效."""
+
+    __slots__ = ("maxsize", "version", "entries")
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.version = artifact_version()
+        self.entries: dict[Any, tuple[FnRecord, Any]] = {}
+
+    def get(self, key: Any, record: FnRecord) -> Any | None:
+        """key 不可哈希时抛出 TypeError, 即使缓存刚刚失效."""
+        hash(key)
+        if self.version != artifact_version():
+            self.version = artifact_version()
+            self.entries.clear()
+            return
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] is record:
+            return entry[1]
+
+    def set(self, key: Any, record: FnRecord, result: Any) -> None:
+        if len(self.entries) >= self.maxsize:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = (record, result)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
 class OverloadBehavior:
     def harvest_record(self, staff: Staff, fn: Fn) -> FnRecord:
-        result = staff.artifact_map.get(FnImplement(fn))
+        sign = FnImplement(fn)
+        result = staff.artifact_map.get(sign)
+        if result is None and staff.load_missing(sign):
+            result = staff.artifact_map.get(sign)
         if result is None:
             raise NotImplementedError
         return result
@@ -31,23 +66,47 @@ class OverloadBehavior:
         artifact_record = self.harvest_record(staff, fn)
 
         if fn.has_overload_capability:
-            bound_args = fn.shape_signature.bind(*args, **kwargs)
-            bound_args.apply_defaults()
+            arguments = fn.get_overload_arguments(args, kwargs)
+            overload_scopes = artifact_record["overload_scopes"]
+            overload_args = [
+                (overload_item, overload_scopes[overload_item.identity], {i: arguments[i] for i in required})
+                for overload_item, required in fn.overload_param_map.items()
+            ]
+
+            cache_key = self.get_cache_key(artifact_record, overload_args)
+            if cache_key is not None:
+                try:
+                    cached = fn.resolution_cache.get(cache_key, artifact_record)
+                except TypeError:  # unhashable arguments
+                    cache_key = cached = None
+                if cached is not None:
+                    return cached
+
             collections = None
 
-            for overload_item, required_args in fn.overload_param_map.items():
-                scope = artifact_record["overload_scopes"][overload_item.identity]
-                entities = overload_item.get_entities(scope, {i: bound_args.arguments[i] for i in required_args})
+            for overload_item, scope, overload_arg in overload_args:
+                entities = overload_item.get_entities(scope, overload_arg)
                 collections = entities if collections is None else collections.intersection(entities)
 
             if not collections:
                 raise NotImplementedError
 
-            return collections.pop()  # type: ignore
+            result = collections.pop()
+            if cache_key is not None:
+                fn.resolution_cache.set(cache_key, artifact_record, result)
+            return result  # type: ignore
 
         else:
             return artifact_record["record_tuple"]  # type: ignore
 
+    def get_cache_key(self, record: FnRecord, overload_args: list[tuple[FnOverload, dict, dict[str, Any]]]) -> Any:
+        keys = []
+        for overload_item, scope, overload_arg in overload_args:
+            key = overload_item.get_cache_key(scope, overload_arg)
+            if key is None:
+                return
+            keys.append(key)
+        return (id(record), *keys)
 
 
 DEFAULT_BEHAVIOR = OverloadBehavior()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from contextlib import AbstractContextManager
 from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
-from ._runtime import GLOBAL_GALLERY
+from ._runtime import GLOBAL_GALLERY, bump_artifact_version
 from .perform import BasePerform
 
 if TYPE_CHECKING:
@@ -30,6 +30,7 @@ class BaseCollector:
             ns: dict = GLOBAL_GALLERY.setdefault(self.namespace, {})
             locate: dict = ns.setdefault(self.identify or "_", {})
             locate.update(self.artifacts)
+            bump_artifact_version()
 
     @property
     def _(self):
@@ -44,6 +45,7 @@ class BaseCollector:
 
     def collect(self, signature: Any, artifact: Any):
         self.artifacts[signature] = artifact
+        bump_artifact_version()
 
     def on_collected(self, func: Callable[[type], Any]):
         self.collected_callbacks.append(func)
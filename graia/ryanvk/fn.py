@@ -7,7 +7,8 @@ from typing_extensions import Concatenate, ParamSpec, Self, TypeVar
 
 from graia.ryanvk.sign import FnImplement
 
-from .behavior import DEFAULT_BEHAVIOR, OverloadBehavior
+from ._runtime import bump_artifact_version
+from .behavior import DEFAULT_BEHAVIOR, OverloadBehavior, ResolutionCache
 from .override import OverridePerformEntity
 from .perform import BasePerform
 
@@ -32,6 +33,64 @@ N = TypeVar("N", bound="BasePerform")
 
 VnCallable = TypeVar("VnCallable", bound=Callable, covariant=True)
 
+ArgumentExtractor = Callable[[tuple, dict], "dict[str, Any] | None"]
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_VARIADIC = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+
+def build_argument_extractor(signature: inspect.Signature, names: list[str]) -> ArgumentExtractor | None:
+    """按位置 / 关键字直接取出 names 对应的实参 (含默认值), 代替 `Signature.bind`.
+
+    提取器在调用形式不常规 (多余参数, 未知关键字, 缺少参数等) 时返回 None, 此时应回退到 `Signature.bind`.
+    """
+    params = list(signature.parameters.values())
+    if any(param.kind in _VARIADIC for param in params):
+        return
+
+    positional = [param.name for param in params if param.kind in _POSITIONAL]
+    keywords = frozenset(param.name for param in params if param.kind is not inspect.Parameter.POSITIONAL_ONLY)
+    required = [
+        (positional.index(param.name) if param.name in positional else None, param.name)
+        for param in params
+        if param.default is inspect.Parameter.empty
+    ]
+    specs = [
+        (
+            name,
+            positional.index(name) if name in positional else None,
+            name in keywords,
+            signature.parameters[name].default,
+        )
+        for name in names
+    ]
+    max_positional = len(positional)
+    empty = inspect.Parameter.empty
+
+    def extract(args: tuple, kwargs: dict) -> dict[str, Any] | None:
+        argc = len(args)
+        if argc > max_positional or (kwargs and not kwargs.keys() <= keywords):
+            return
+        for index, name in required:
+            if not ((index is not None and index < argc) or name in kwargs):
+                return
+
+        result = {}
+        for name, index, keyword, default in specs:
+            if index is not None and index < argc:
+                if name in kwargs:
+                    return
+                result[name] = args[index]
+            elif keyword and name in kwargs:
+                result[name] = kwargs[name]
+            elif default is not empty:
+                result[name] = default
+            else:
+                return
+        return result
+
+    return extract
+
 
 class Fn(Generic[P, R]):
     owner: type[BasePerform | Capability]  # TODO: review here
@@ -45,6 +104,8 @@ class Fn(Generic[P, R]):
     overload_params: dict[str, FnOverload]
     overload_param_map: dict[FnOverload, list[str]]
     overload_map: dict[str, FnOverload]
+    resolution_cache: ResolutionCache
+    argument_extractor: ArgumentExtractor | None
 
     def __init__(
         self: Fn[P, R],
@@ -59,6 +120,8 @@ class Fn(Generic[P, R]):
         self.overload_param_map = overload_param_map or {}
         self.overload_params = {i: k for k, v in self.overload_param_map.items() for i in v}
         self.overload_map = {i.identity: i for i in self.overload_param_map}
+        self.resolution_cache = ResolutionCache()
+        self.argument_extractor = build_argument_extractor(self.shape_signature, list(self.overload_params))
 
     def __set_name__(self, owner: type[BasePerform], name: str):
         self.owner = owner
@@ -92,6 +155,14 @@ class Fn(Generic[P, R]):
     def has_overload_capability(self) -> bool:
         return bool(self.overload_param_map)
 
+    def get_overload_arguments(self, args: tuple, kwargs: dict) -> dict[str, Any]:
+        if self.argument_extractor is not None and (result := self.argument_extractor(args, kwargs)) is not None:
+            return result
+
+        bound_args = self.shape_signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        return bound_args.arguments
+
     def collect(
         self,
         collector: BaseCollector,
@@ -118,6 +189,7 @@ class Fn(Generic[P, R]):
             else:
                 artifact["record_tuple"] = (collector, entity)
 
+            bump_artifact_version()
             return entity
 
         return wrapper
@@ -22,6 +22,10 @@ class FnOverload:
     def get_entities(self, scope: dict[Any, Any], args: dict[str, Any]) -> set[tuple[BaseCollector, Callable]]:
         return scope["_"]
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Any]) -> Any:
+        """返回决定 get_entities 结果的最小信息, 用于缓存 overload 解析结果; 返回 None 表示不可缓存."""
+        return None
+
     def merge_scopes(self, *scopes: dict[Any, Any]) -> dict:
         return scopes[-1]
 
@@ -58,6 +62,9 @@ class SimpleOverload(FnOverload):
 
         return result_sets.pop().intersection(*result_sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Any]) -> Any:
+        return tuple(args.values())
+
     def merge_scopes(self, *scopes: dict[Any, Any]):
         # layout: {arg: {value: set}}
 
@@ -102,6 +109,9 @@ class TypeOverload(FnOverload):
 
         return result_sets.pop().intersection(*result_sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Any]) -> Any:
+        return tuple(map(type, args.values()))
+
     def merge_scopes(self, *scopes: dict[Any, Any]):
         # layout: {arg: {value: set}}
 
@@ -169,6 +179,19 @@ class NoneOverload(FnOverload):
 
         return sets.pop().intersection(*sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Any]) -> Any:
+        keys = []
+        for arg_name, arg_value in args.items():
+            if arg_value is None:
+                keys.append(None)
+                continue
+            key = self.bypassing.get_cache_key(scope["bypassing"].get(arg_name, {}), {arg_name: arg_value})
+            if key is None:
+                return
+            keys.append((key,))
+        return tuple(keys)
+
+
 class PredicateOverload(FnOverload):
     predicate: Callable[[str, Any], Any]
 
@@ -204,6 +227,9 @@ class PredicateOverload(FnOverload):
 
         return result_sets.pop().intersection(*result_sets)
 
+    def get_cache_key(self, scope: dict[Any, Any], args: dict[str, Any]) -> Any:
+        return tuple(self.predicate(arg_name, arg_value) for arg_name, arg_value in args.items())
+
     def merge_scopes(self, *scopes: dict[Any, Any]):
         # layout: {arg: {value: set}}
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from contextlib import AsyncExitStack, asynccontextmanager
 from typing import TYPE_CHECKING, Any, ClassVar
 
+from ._runtime import bump_artifact_version
 from .endpoint import Endpoint
 
 if TYPE_CHECKING:
@@ -32,6 +33,7 @@ class BasePerform:
     @classmethod
     def apply_to(cls, map: dict[Any, Any]):
         map.update(cls.__collector__.artifacts)
+        bump_artifact_version()
 
     @classmethod
     def endpoints(cls):
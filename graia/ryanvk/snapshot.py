@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any
+
+from ._runtime import artifact_version
+
+SNAPSHOT_CACHE_SIZE = 256
+
+
+class ArtifactSnapshot:
+    """若干层 artifact 按 ChainMap 语义 (靠前者优先) 合并后的扁平字典.
+
+    对各层的修改需经由 collect / apply_to / inject 等会推进 artifact 版本的途径, 否则快照不会察觉.
+    """
+
+    __slots__ = ("layers", "version", "artifact_map")
+
+    layers: tuple[dict[Any, Any], ...]
+    version: int
+    artifact_map: dict[Any, Any]
+
+    def __init__(self, layers: tuple[dict[Any, Any], ...]) -> None:
+        self.layers = layers
+        self.version = artifact_version()
+        self.artifact_map = {}
+        for layer in reversed(layers):
+            self.artifact_map.update(layer)
+
+
+# 快照持有各层的强引用, 因此以 id 组成的键不会被复用.
+_snapshots: dict[tuple[int, ...], ArtifactSnapshot] = {}
+
+
+def get_artifact_snapshot(layers: list[dict[Any, Any]] | tuple[dict[Any, Any], ...]) -> ArtifactSnapshot:
+    """取得 layers 对应的共享快照; artifact 版本变化后重新构建."""
+    key = tuple(map(id, layers))
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and snapshot.version == artifact_version():
+        return snapshot
+
+    if snapshot is None and len(_snapshots) >= SNAPSHOT_CACHE_SIZE:
+        del _snapshots[next(iter(_snapshots))]
+    snapshot = _snapshots[key] = ArtifactSnapshot(tuple(layers))
+    return snapshot
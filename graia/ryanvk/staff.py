@@ -1,38 +1,105 @@
 from __future__ import annotations
 
+import asyncio
 from collections import ChainMap
 from contextlib import AsyncExitStack, asynccontextmanager
 from copy import copy
-from typing import TYPE_CHECKING, Any, Callable, Protocol, TypeVar, overload
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, MutableMapping, Protocol, TypeVar, overload
 
 from typing_extensions import ParamSpec
 
+from . import _runtime
+from ._runtime import artifact_version, bump_artifact_version
+from .snapshot import ArtifactSnapshot, get_artifact_snapshot
+
 if TYPE_CHECKING:
+    from .collector import BaseCollector
     from .fn import Fn
     from .perform import BasePerform
+    from .typing import CallObserver
 
 P = ParamSpec("P")
 R = TypeVar("R", covariant=True)
 VnCallable = TypeVar("VnCallable", bound=Callable)
 
+
 class Staff:
     artifact_collections: list[dict[Any, Any]]
-    artifact_map: ChainMap[Any, Any]
-    components: dict[str, Any]
+    components: MutableMapping[str, Any]
     exit_stack: AsyncExitStack
     instances: dict[type, Any]
 
-    def __init__(self, artifacts_collections: list[dict[Any, Any]], components: dict[str, Any]) -> None:
+    def __init__(self, artifacts_collections: list[dict[Any, Any]], components: MutableMapping[str, Any]) -> None:
         self.artifact_collections = artifacts_collections
-        self.artifact_map = ChainMap(*artifacts_collections)
+        self._snapshot = get_artifact_snapshot(artifacts_collections)
         self.components = components
         self.exit_stack = AsyncExitStack()
         self.instances = {}
 
+    @property
+    def artifact_map(self) -> dict[Any, Any]:
+        snapshot: ArtifactSnapshot = self._snapshot
+        if snapshot.version != artifact_version() or len(snapshot.layers) != len(self.artifact_collections):
+            snapshot = self._snapshot = get_artifact_snapshot(self.artifact_collections)
+        return snapshot.artifact_map
+
+    def load_missing(self, signature: Any) -> bool:
+        """查找 signature 未果时调用; 若能补充加载对应的 artifact 则返回 True, 调用方会重新查找."""
+        return False
+
     def call_fn(self, fn: Fn[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        observer = _runtime.call_observer
+        if observer is not None:
+            return self._observed_call_fn(observer, fn, args, kwargs)
         collector, entity = fn.behavior.harvest_overload(self, fn, *args, **kwargs)
         return fn.execute(self, collector, entity, *args, **kwargs)
 
+    def _observed_call_fn(self, observer: CallObserver, fn: Fn[P, R], args: tuple, kwargs: dict) -> R:
+        start = perf_counter()
+        try:
+            collector, entity = fn.behavior.harvest_overload(self, fn, *args, **kwargs)
+        except BaseException as e:
+            observer.observe_call(self, fn, None, perf_counter() - start, 0.0, e)
+            raise
+        resolved = perf_counter()
+        resolve_time = resolved - start
+        try:
+            result = fn.execute(self, collector, entity, *args, **kwargs)
+        except BaseException as e:
+            observer.observe_call(self, fn, collector, resolve_time, perf_counter() - resolved, e)
+            raise
+
+        if asyncio.iscoroutine(result):
+            # 执行耗时包括等待协程完成的时间.
+            return self._observe_coroutine(observer, fn, collector, resolve_time, result)  # type: ignore
+        if isinstance(result, asyncio.Future):
+            result.add_done_callback(
+                lambda fut: observer.observe_call(
+                    self,
+                    fn,
+                    collector,
+                    resolve_time,
+                    perf_counter() - resolved,
+                    asyncio.CancelledError() if fut.cancelled() else fut.exception(),
+                )
+            )
+            return result
+        observer.observe_call(self, fn, collector, resolve_time, perf_counter() - resolved, None)
+        return result
+
+    async def _observe_coroutine(
+        self, observer: CallObserver, fn: Fn, collector: BaseCollector, resolve_time: float, coro: Awaitable[Any]
+    ):
+        start = perf_counter()
+        try:
+            result = await coro
+        except BaseException as e:
+            observer.observe_call(self, fn, collector, resolve_time, perf_counter() - start, e)
+            raise
+        observer.observe_call(self, fn, collector, resolve_time, perf_counter() - start, None)
+        return result
+
     class PostInitShape(Protocol[P]):
         def __post_init__(self, *args: P.args, **kwargs: P.kwargs) -> Any:
             ...
@@ -49,6 +116,7 @@ class Staff:
         perform = perform_type(self)
         perform.__post_init__(*args, **kwargs)
         self.artifact_collections.insert(0, perform.__collector__.artifacts)
+        bump_artifact_version()
 
     async def maintain(self, perform: BasePerform):
         await self.exit_stack.enter_async_context(perform.lifespan())
@@ -58,9 +126,19 @@ class Staff:
         async with self.exit_stack:
             yield self
 
+    def is_built_on(self, artifacts_collections: list[dict[Any, Any]]) -> bool:
+        """判断该 Staff 是否建立在给定的 artifact 层之上, 供长期持有 Staff 的对象决定能否复用."""
+        current = self.artifact_collections
+        return len(current) == len(artifacts_collections) and all(
+            a is b for a, b in zip(current, artifacts_collections)
+        )
+
     def ext(self, components: dict[str, Any]):
+        """派生一个附加了 components 的子 Staff, 不修改当前 Staff."""
         instance = copy(self)
-        instance.components.update(components)
+        instance.components = ChainMap(dict(components), self.components)
+        # perform 实例通过 Access 读取创建它的 Staff 的 components, 与父 Staff 共用会读不到新附加的组件.
+        instance.instances = {}
         return instance
 
     def get_fn_call(self, fn: Fn[P, R]) -> Callable[P, R]:
@@ -7,6 +7,8 @@ from typing_extensions import ParamSpec, TypeVar
 
 if TYPE_CHECKING:
     from .collector import BaseCollector  # noqa
+    from .fn import Fn
+    from .staff import Staff
 
 P = ParamSpec("P")
 P1 = ParamSpec("P1")
@@ -44,6 +46,19 @@ class SupportsMerge(Protocol):
         ...
 
 
+class CallObserver(Protocol):
+    def observe_call(
+        self,
+        staff: Staff,
+        fn: Fn,
+        collector: BaseCollector | None,
+        resolve_time: float,
+        execute_time: float,
+        error: BaseException | None,
+    ) -> Any:
+        ...
+
+
 class LayoutProtocolProperty(Protocol):
     @property
     def get_artifact_layout(self) -> dict: